@@ -19,200 +19,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# --- DARK MODE PREMIUM DESIGN ---
-st.markdown("""
-<style>
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Hide the page navigation list */
-    [data-testid="stSidebarNav"] {
-        display: none !important;
-    }
-    
-    /* DARK MODE Color Palette */
-    :root {
-        --primary: #6B8E23;
-        --primary-dark: #556B2F;
-        --secondary: #1CB0F6;
-        --accent: #FF9600;
-        --background: #1a1a1a;
-        --surface: #2a2a2a;
-        --card: #2d2d2d;
-        --text: #FFFFFF;
-        --text-light: #B3B3B3;
-        --border: #404040;
-        --success: #58CC02;
-        --warning: #FFC800;
-        --error: #FF4B4B;
-    }
-    
-    /* Dark background */
-    [data-testid="stAppViewContainer"] {
-        background: var(--background) !important;
-        color: var(--text) !important;
-    }
-    
-    /* All text white */
-    body, p, span, div, h1, h2, h3, h4, h5, h6, label {
-        color: var(--text) !important;
-    }
-    
-    /* Beautiful buttons - OLIVE GREEN */
-    .stButton>button, .stFormSubmitButton>button {
-        background: #6B8E23 !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 16px !important;
-        padding: 12px 24px !important;
-        font-weight: 700 !important;
-        font-size: 15px !important;
-        transition: all 0.2s ease !important;
-        box-shadow: 0 4px 0 #556B2F !important;
-        text-transform: none !important;
-    }
-    
-    .stButton>button:hover, .stFormSubmitButton>button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 6px 0 #556B2F !important;
-        background: #7BA428 !important;
-    }
-    
-    .stButton>button:active, .stFormSubmitButton>button:active {
-        transform: translateY(2px) !important;
-        box-shadow: 0 2px 0 #556B2F !important;
-    }
-    
-    /* Secondary buttons */
-    .stButton>button[kind="secondary"] {
-        background: var(--surface) !important;
-        color: var(--text) !important;
-        box-shadow: 0 4px 0 var(--border) !important;
-    }
-    
-    /* Input fields - DARK MODE */
-    .stTextInput>div>div>input, .stSelectbox>div>div>select, .stTextArea>div>div>textarea {
-        background: var(--surface) !important;
-        border: 3px solid var(--border) !important;
-        border-radius: 16px !important;
-        padding: 12px 16px !important;
-        font-size: 15px !important;
-        color: var(--text) !important;
-        transition: all 0.2s ease !important;
-    }
-    
-    .stTextInput>div>div>input:focus, .stSelectbox>div>div>select:focus, .stTextArea>div>div>textarea:focus {
-        border-color: var(--primary) !important;
-        background: var(--card) !important;
-        box-shadow: 0 0 0 3px rgba(88, 204, 2, 0.2) !important;
-    }
-    
-    /* Placeholder text */
-    .stTextInput>div>div>input::placeholder {
-        color: var(--text-light) !important;
-    }
-    
-    /* Progress bars */
-    .stProgress > div > div > div {
-        background: linear-gradient(90deg, var(--primary) 0%, var(--secondary) 100%) !important;
-        border-radius: 10px !important;
-    }
-    
-    /* Cards - DARK */
-    [data-testid="stVerticalBlock"] > [data-testid="stContainer"] {
-        background: var(--card) !important;
-        border-radius: 20px;
-        padding: 24px;
-        border: 3px solid var(--border);
-        transition: all 0.2s ease;
-    }
-    
-    /* Container borders dark */
-    div[data-testid="column"] > div {
-        background: var(--card) !important;
-        color: var(--text) !important;
-    }
-    
-    /* Metrics */
-    [data-testid="stMetricValue"] {
-        font-size: 2.5rem !important;
-        font-weight: 800 !important;
-        color: var(--text) !important;
-    }
-    
-    /* Radio buttons - DARK */
-    .stRadio > label {
-        font-weight: 700 !important;
-        color: var(--text) !important;
-    }
-    
-    .stRadio > div {
-        background: var(--surface) !important;
-        padding: 8px;
-        border-radius: 12px;
-    }
-    
-    /* Select boxes dark */
-    .stSelectbox > div > div {
-        background: var(--surface) !important;
-    }
-    
-    /* All form labels */
-    label {
-        color: var(--text) !important;
-        font-weight: 600 !important;
-    }
-    
-    /* Sidebar styling - DARK (only when logged in) */
-    [data-testid="stSidebar"] {
-        background: var(--surface) !important;
-        border-right: 3px solid var(--border) !important;
-    }
-    
-    [data-testid="stSidebar"] * {
-        color: var(--text) !important;
-    }
-    
-    /* Hide sidebar button when not logged in */
-    section[data-testid="stSidebar"] > div {
-        background: var(--surface) !important;
-    }
-    
-    [data-testid="stSidebar"] .stButton>button {
-        width: 100%;
-        text-align: left;
-        justify-content: flex-start;
-        padding: 14px 20px !important;
-        margin-bottom: 8px;
-    }
-    
-    /* Success/Error messages */
-    .stSuccess, .stError, .stWarning, .stInfo {
-        border-radius: 16px !important;
-        padding: 16px 20px !important;
-        font-weight: 600 !important;
-    }
-    
-    /* Animations */
-    @keyframes slideIn {
-        from {
-            opacity: 0;
-            transform: translateY(20px);
-        }
-        to {
-            opacity: 1;
-            transform: translateY(0);
-        }
-    }
-    
-    .animated {
-        animation: slideIn 0.3s ease-out;
-    }
-</style>
-""", unsafe_allow_html=True)
-
 
 # --- Session State Initialization ---
 def init_session_state():
@@ -228,7 +34,6 @@ def init_session_state():
         # Quiz states
         "quiz_completed": False,
         "quiz_score": 0,
-        "quiz_responses": [],
         "weak_topics": [],
         "strong_topics": [],
         
@@ -308,10 +113,26 @@ def route_to_page():
 def main():
     init_session_state()
     
-    from components.sidebar import render_sidebar
-    render_sidebar()
+    # Write buffered practice attempts when the student moves to another page or they are due
+    if st.session_state.logged_in:
+        page_changed = st.session_state.get("last_page") != st.session_state.current_page
+        DataManager.flush_attempts(st.session_state.username, only_if_due=not page_changed)
+        st.session_state.last_page = st.session_state.current_page
+    
+    # App-wide and sidebar styles as one versioned sheet; pages add their own on top
+    from components.styles import apply_styles
+    from components.styles.app import APP_STYLES
+    from components.sidebar import SIDEBAR_STYLES, render_sidebar
+    apply_styles("app", APP_STYLES, SIDEBAR_STYLES)
+    
+    # Load each user's progress at most once per rerun
+    with DataManager.rerun_scope() as progress_loads:
+        render_sidebar()
+        
+        route_to_page()
     
-    route_to_page()
+    # This rerun's {"loads", "snapshot_hits"}, for debugging
+    st.session_state.progress_loads = progress_loads
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+"""
+Attempt Timer - Server-side deadlines for timed tests
+A timed attempt records its deadline once, when it starts. One background sweeper thread per
+process sleeps until the earliest deadline and submits every attempt whose time is up, so a
+test closes on time even if the student's page never reruns. Pages only read the result.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from quiz_attempt import QuizAttempt
+
+# Attempts submitted by the sweeper (rather than by the student)
+SWEEPER_STATS = {"swept": 0}
+
+# Heap of (deadline, sequence, TimedAttempt) still waiting for their deadline
+_deadlines: List[Tuple[float, int, "TimedAttempt"]] = []
+_sequence = itertools.count()
+_sweeper_wakeup = threading.Condition()
+_sweeper: Optional[threading.Thread] = None
+
+
+class TimedAttempt:
+    """A QuizAttempt with a deadline; submitted once, by the student or by the sweeper"""
+
+    __slots__ = ("attempt", "started_at", "time_limit", "deadline", "submitted_at", "score", "time_up", "_lock")
+
+    def __init__(self, attempt: QuizAttempt, time_limit: float):
+        self.attempt = attempt
+        self.started_at = time.time()
+        self.time_limit = time_limit
+        self.deadline = self.started_at + time_limit
+        self.submitted_at: Optional[float] = None
+        self.score: Optional[int] = None
+        self.time_up = False
+        self._lock = threading.Lock()
+
+    @property
+    def submitted(self) -> bool:
+        return self.submitted_at is not None
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (0 once it has passed)"""
+        return max(0.0, self.deadline - time.time())
+
+    def answer(self, index: int, choice: Optional[int]) -> bool:
+        """Record a response unless the attempt has been submitted; False if it was too late"""
+        with self._lock:
+            if self.submitted:
+                return False
+            self.attempt.answer(index, choice)
+            return True
+
+    def submit(self) -> bool:
+        """Score and close the attempt; False if it was already submitted"""
+        with self._lock:
+            if self.submitted:
+                return False
+            now = time.time()
+            self.time_up = now >= self.deadline
+            self.submitted_at = min(now, self.deadline)
+            self.score = self.attempt.score()
+            return True
+
+    def duration(self) -> Optional[float]:
+        """Seconds from start to submission (None while in progress)"""
+        return None if self.submitted_at is None else self.submitted_at - self.started_at
+
+
+def start_timed_attempt(attempt: QuizAttempt, time_limit: float) -> TimedAttempt:
+    """Start the clock on an attempt and hand its deadline to the sweeper"""
+    timed = TimedAttempt(attempt, time_limit)
+    with _sweeper_wakeup:
+        heapq.heappush(_deadlines, (timed.deadline, next(_sequence), timed))
+        _ensure_sweeper()
+        _sweeper_wakeup.notify()
+    return timed
+
+
+def _ensure_sweeper():
+    """Start the sweeper thread on first use (caller holds _sweeper_wakeup)"""
+    global _sweeper
+    if _sweeper is None or not _sweeper.is_alive():
+        _sweeper = threading.Thread(target=_sweep, name="attempt-timer-sweeper", daemon=True)
+        _sweeper.start()
+
+
+def _sweep():
+    """Submit attempts as their deadlines pass, sleeping until the next one"""
+    while True:
+        with _sweeper_wakeup:
+            while not _deadlines:
+                _sweeper_wakeup.wait()
+            delay = _deadlines[0][0] - time.time()
+            if delay > 0:
+                # Woken early when a sooner deadline is pushed
+                _sweeper_wakeup.wait(delay)
+                continue
+            _, _, timed = heapq.heappop(_deadlines)
+
+        if timed.submit():
+            SWEEPER_STATS["swept"] += 1
+            print(f"⏱️ Final test auto-submitted at its deadline (score {timed.score}/{len(timed.attempt)})")
@@ -0,0 +1,110 @@
+"""
+Class Analytics Scaling Benchmark
+Teacher analytics for classes of 30 to 50,000 students, computed the way teacher_analytics
+used to (one analysis dict per student, then Python sums over them) and with
+class_analytics (one frame, column-wise). Also times the vectorized part alone, on a frame
+whose raw columns are already extracted. No store is involved - the class is built in memory.
+
+Usage:
+    python benchmarks/analytics_scaling.py
+    python benchmarks/analytics_scaling.py --sizes 30 3000 50000 --repeats 3
+"""
+import argparse
+import statistics
+import sys
+import time
+from collections import Counter
+
+import harness
+
+
+def analyze_student(progress):
+    """Per-student analysis as teacher_analytics computed it before class_analytics"""
+    quiz = progress.get('initial_quiz', {})
+    practice = progress.get('practice_problems', {})
+    quiz_score = quiz.get('score', 0) / max(quiz.get('total', 1), 1) * 100
+    overall_progress = progress.get('overall_progress', 0)
+    practice_correct = sum(1 for p in practice.values() if p.get('correct', 0) > 0)
+    practice_accuracy = practice_correct / max(len(practice), 1) * 100 if practice else 0
+
+    risk_level = "Low"
+    if quiz_score < 50 or overall_progress < 20:
+        risk_level = "High"
+    elif quiz_score < 70 or overall_progress < 40:
+        risk_level = "Medium"
+
+    return {
+        'quiz_score': quiz_score,
+        'overall_progress': overall_progress,
+        'weak_topics': quiz.get('weak_topics', []),
+        'strong_topics': quiz.get('strong_topics', []),
+        'total_time': progress.get('total_time_spent', 0),
+        'lessons_completed': sum(1 for l in progress.get('lessons', {}).values() if l.get('completed')),
+        'practice_accuracy': practice_accuracy,
+        'risk_level': risk_level,
+    }
+
+
+def per_student_loop(class_progress):
+    """The old dashboard path: analyses, then one pass per aggregate"""
+    analyses = {username: analyze_student(progress) for username, progress in class_progress.items()}
+    count = len(analyses)
+    weak, strong = [], []
+    for analysis in analyses.values():
+        weak.extend(analysis['weak_topics'])
+        strong.extend(analysis['strong_topics'])
+    return {
+        "avg_quiz": sum(a['quiz_score'] for a in analyses.values()) / count,
+        "avg_progress": sum(a['overall_progress'] for a in analyses.values()) / count,
+        "total_time": sum(a['total_time'] for a in analyses.values()),
+        "at_risk": sum(1 for a in analyses.values() if a['risk_level'] == "High"),
+        "weak_topics": dict(Counter(weak)),
+        "strong_topics": dict(Counter(strong)),
+    }
+
+
+def frame_summary(class_progress):
+    from class_analytics import build_class_frame, class_summary
+
+    return class_summary(build_class_frame(class_progress))
+
+
+def median_ms(run, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-student loop vs columnar class analytics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 3000, 50000], help="class sizes")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per measurement (median is reported)")
+    args = parser.parse_args()
+
+    harness.use_backend("json")
+    from class_analytics import FRAME_COLUMNS, add_derived_columns, build_class_frame, class_summary
+
+    failed = False
+    print("🧮 class analytics: per-student loop vs frame (vectorized part alone)")
+    for size in args.sizes:
+        class_progress = {f"student{i:06d}": harness.sample_progress(i) for i in range(size)}
+
+        old, new = per_student_loop(class_progress), frame_summary(class_progress)
+        same = all(new[key] == old[key] for key in ("avg_progress", "total_time", "at_risk", "weak_topics", "strong_topics")) \
+            and abs(new["avg_quiz"] - old["avg_quiz"]) < 1e-9
+        failed |= not same
+
+        raw = build_class_frame(class_progress)[FRAME_COLUMNS]
+        loop_ms = median_ms(lambda: per_student_loop(class_progress), args.repeats)
+        frame_ms = median_ms(lambda: frame_summary(class_progress), args.repeats)
+        vector_ms = median_ms(lambda: class_summary(add_derived_columns(raw.copy())), args.repeats)
+        print(f"   {size:>6} students  loop {loop_ms:9.1f} ms  frame {frame_ms:9.1f} ms  ({vector_ms:7.1f} ms)  "
+              f"{'✅ same summary' if same else '❌ summaries differ'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Practice Attempt Load Test
+500 students answering practice problems at once (one thread each), recorded the old way
+(read progress, update the problem, write progress back on every answer) and through the
+write-behind buffer (DataManager.record_attempt + flush_attempts). Reports throughput,
+p50/p99 latency per answer and checks that no attempt was lost.
+
+JSON runs on the sharded progress layout by default; with --layout single every write
+rewrites the whole class's file, so keep --attempts small there.
+
+Usage:
+    python benchmarks/attempt_load.py
+    python benchmarks/attempt_load.py --backend sqlite --students 500 --attempts 20
+    python benchmarks/attempt_load.py --backend json --layout single --attempts 2
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import harness
+
+MODES = ["per-answer write", "write-behind"]
+
+
+def record_directly(username: str, problem_id: str, correct: bool):
+    """How practice_problems tracked an answer before the attempt buffer"""
+    from data_manager import DataManager
+
+    progress = DataManager.get_user_progress(username)
+    practice = progress.get("practice_problems", {})
+    entry = DataManager._apply_attempt(practice, problem_id, correct)
+    DataManager.update_progress(username, "practice_problems", {problem_id: entry})
+
+
+def run(mode: str, usernames, attempts: int):
+    from data_manager import DataManager
+
+    latencies = []
+    latencies_lock = threading.Lock()
+
+    def student(username: str):
+        mine = []
+        for n in range(attempts):
+            problem_id, correct = f"load_{n % 7}", n % 3 == 0
+            start = time.perf_counter()
+            if mode == "write-behind":
+                DataManager.record_attempt(username, problem_id, correct)
+            else:
+                record_directly(username, problem_id, correct)
+            mine.append((time.perf_counter() - start) * 1000)
+        with latencies_lock:
+            latencies.extend(mine)
+
+    with harness.quiet():
+        start = time.perf_counter()
+        threads = [threading.Thread(target=student, args=(username,)) for username in usernames]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        DataManager.flush_attempts()
+        elapsed = time.perf_counter() - start
+
+        recorded = sum(
+            entry.get("attempts", 0)
+            for progress in DataManager.get_many_progress(usernames).values()
+            for problem_id, entry in progress["practice_problems"].items() if problem_id.startswith("load_")
+        )
+    return elapsed, latencies, recorded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent practice attempts, per-answer writes vs write-behind")
+    parser.add_argument("--backend", choices=harness.BACKENDS, help="one backend (default: json and sqlite)")
+    parser.add_argument("--students", type=int, default=500, help="concurrent students")
+    parser.add_argument("--attempts", type=int, default=10, help="answers per student")
+    parser.add_argument("--layout", choices=["single", "sharded"], default="sharded", help="JSON progress layout")
+    args = parser.parse_args()
+
+    if args.backend is None:
+        extra = ["--students", str(args.students), "--attempts", str(args.attempts), "--layout", args.layout]
+        sys.exit(harness.run_per_backend(__file__, ["json", "sqlite"], extra))
+
+    os.environ["PROGRESS_LAYOUT"] = args.layout
+    harness.use_backend(args.backend)
+    layout = f" ({args.layout})" if args.backend == "json" else ""
+    print(f"🧮 {args.backend}{layout}: {args.students} students × {args.attempts} answers")
+    failed = False
+    for mode in MODES:
+        # A separate class per mode so the lost-update check starts from zero
+        usernames = harness.seed_class(args.students, teacher_code=f"LOAD-{mode}", prefix=f"{mode[:5]}_")
+        elapsed, latencies, recorded = run(mode, usernames, args.attempts)
+        expected = args.students * args.attempts
+        status = "✅" if recorded == expected else "❌"
+        failed |= recorded != expected
+        print(f"   {mode:<16} {expected / elapsed:8.0f} answers/s  p50 {harness.percentile(latencies, 50):7.2f} ms  "
+              f"p99 {harness.percentile(latencies, 99):8.2f} ms  {status} {recorded}/{expected} recorded")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
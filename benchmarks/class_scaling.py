@@ -0,0 +1,65 @@
+"""
+Class-Size Scaling Benchmark
+Loads a teacher's whole class the way the dashboards used to (one get_user_progress call
+per student) and with DataManager.get_many_progress (one query / one file parse), for
+classes of 10, 100 and 1,000 students on each backend. The Supabase run goes through the
+local stand-in with --latency-ms per request, so round trips are counted and charged.
+
+Usage:
+    python benchmarks/class_scaling.py
+    python benchmarks/class_scaling.py --backend sqlite --sizes 10 100 1000 10000
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import harness
+
+
+def time_load(load, repeats: int) -> float:
+    """Median ms of a class load"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with harness.quiet():
+            load()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-student vs bulk class progress loads")
+    parser.add_argument("--backend", choices=harness.BACKENDS, help="one backend (default: all, each in its own process)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="class sizes")
+    parser.add_argument("--repeats", type=int, default=5, help="loads per measurement (median is reported)")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Supabase stand-in delay per request")
+    args = parser.parse_args()
+
+    if args.backend is None:
+        extra = ["--sizes", *map(str, args.sizes), "--repeats", str(args.repeats), "--latency-ms", str(args.latency_ms)]
+        sys.exit(harness.run_per_backend(__file__, harness.BACKENDS, extra))
+
+    harness.use_backend(args.backend, latency_ms=args.latency_ms)
+    from data_manager import DataManager
+
+    print(f"🏫 {args.backend}: class progress load, median of {args.repeats}")
+    for size in args.sizes:
+        roster = harness.seed_class(size, teacher_code=f"TEACH-{size}", prefix=f"c{size}_")
+
+        requests = harness.standin_requests()
+        per_student = time_load(lambda: [DataManager.get_user_progress(u) for u in roster], args.repeats)
+        per_student_requests = (harness.standin_requests() - requests) // args.repeats
+
+        requests = harness.standin_requests()
+        bulk = time_load(lambda: DataManager.get_many_progress(roster), args.repeats)
+        bulk_requests = (harness.standin_requests() - requests) // args.repeats
+
+        line = f"   {size:6d} students  per-student {per_student:9.1f} ms  bulk {bulk:8.1f} ms  ({per_student / bulk:5.1f}×)"
+        if args.backend == "supabase":
+            line += f"  requests {per_student_requests} → {bulk_requests}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark Harness - Shared setup for the scripts in benchmarks/
+Points DataManager at a throwaway data directory on the chosen backend (json, sqlite, or
+supabase via the local stand-in), and runs a script once per backend in fresh interpreters,
+since the backend is fixed when data_manager is imported.
+"""
+import atexit
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+BACKENDS = ["json", "sqlite", "supabase"]
+
+TEACHER_CODE = "TEACH-BENCH"
+TOPICS = ["Limit Definition", "Basic Rules", "Product Rule", "Chain Rule", "Implicit Diff.", "Applications"]
+
+# Kept alive for the life of the benchmark process
+_standin = None
+
+
+def use_backend(backend: str, latency_ms: float = 0.0, event_log: bool = False) -> Path:
+    """
+    Configure DataManager for a backend with empty stores under a temp directory (call before
+    importing data_manager). Returns the temp directory.
+    """
+    global _standin
+    data_dir = Path(tempfile.mkdtemp(prefix="brainyyack-bench-"))
+    atexit.register(shutil.rmtree, data_dir, ignore_errors=True)
+    os.environ["DATA_BACKEND"] = backend
+    os.environ["SQLITE_PATH"] = str(data_dir / "bench.db")
+    os.environ["EVENT_LOG"] = "on" if event_log else "off"
+
+    if backend == "supabase":
+        from database.supabase_standin import SupabaseStandIn
+        _standin = SupabaseStandIn(latency=latency_ms / 1000).start()
+        os.environ["SUPABASE_URL"] = _standin.url
+        os.environ["SUPABASE_KEY"] = _standin.key
+
+    with quiet():
+        import data_manager
+        from database import event_store
+    data_manager.USERS_FILE = data_dir / "users.json"
+    data_manager.PROGRESS_FILE = data_dir / "progress.json"
+    data_manager.PROGRESS_SHARD_DIR = data_dir / "progress"
+    data_manager.ATTEMPT_JOURNAL_DIR = data_dir / "attempts"
+    event_store.EVENTS_DIR = data_dir / "events"
+    return data_dir
+
+
+def sample_progress(i: int) -> Dict:
+    """A deterministic, varied progress record for the i-th synthetic student"""
+    from progress_engine import ProgressEngine
+
+    progress = {
+        "initial_quiz": {"completed": i % 4 != 0, "score": i % 19, "total": 18, "date": None,
+                         "weak_topics": [TOPICS[i % 6], TOPICS[(i + 2) % 6]] if i % 3 else [],
+                         "strong_topics": [TOPICS[(i + 4) % 6]]},
+        "lessons": {f"lesson_{n + 1}": {"completed": n < i % 4, "time_spent": 300 + 7 * n}
+                    for n in range(i % 6)},
+        "lesson_quizzes": {},
+        "practice_problems": {f"p{n}": {"attempts": 1 + n % 3, "correct": n % 2, "incorrect": 1 - n % 2,
+                                        "needs_review": False} for n in range(i % 12)},
+        "final_test": {"completed": False, "score": 0, "date": None},
+        "badges": [],
+        "certificates": [],
+        "total_time_spent": 300 * (i % 6),
+        "last_active": "2026-10-01T12:00:00",
+        "current_level": 1,
+    }
+    progress["overall_progress"] = ProgressEngine.overall_progress(progress)
+    return progress
+
+
+def seed_class(count: int, teacher_code: str = TEACHER_CODE, prefix: str = "student") -> List[str]:
+    """
+    A teacher and `count` enrolled students with sample progress, written in bulk
+    straight into the configured store. Returns the student usernames.
+    """
+    import data_manager
+    from data_manager import DataManager
+
+    usernames = [f"{prefix}{i:06d}" for i in range(count)]
+    users = {f"{prefix}_teacher": {"password": "", "email": "teacher@example.com", "role": "Teacher",
+                                   "teacher_code": teacher_code, "parent_codes": [], "teacher_codes": []}}
+    for i, username in enumerate(usernames):
+        users[username] = {"password": "", "email": f"{username}@example.com", "role": "Student",
+                           "share_code": f"SHARE-{username}", "teacher_code": "",
+                           "parent_codes": [], "teacher_codes": [teacher_code]}
+    progress = {username: sample_progress(i) for i, username in enumerate(usernames)}
+
+    with quiet():
+        if data_manager.USE_SQLITE:
+            from database.sqlite_manager import SQLiteDataManager, _transaction
+            with _transaction() as conn:
+                for username, user in users.items():
+                    conn.execute(
+                        "INSERT INTO users (username, password, email, role, share_code, teacher_code, teacher_codes) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (username, user["password"], user["email"], user["role"], user.get("share_code", ""),
+                         user["teacher_code"], json.dumps(user["teacher_codes"])))
+                    conn.executemany("INSERT INTO class_enrollments (teacher_code, username) VALUES (?, ?)",
+                                     [(code, username) for code in user["teacher_codes"]])
+                for username, record in progress.items():
+                    SQLiteDataManager._write_progress(conn, username, record)
+        elif data_manager.USE_SUPABASE:
+            _standin.handle("POST", "/rest/v1/users", [], [{"username": u, **user} for u, user in users.items()])
+            _standin.handle("POST", "/rest/v1/progress", [], [{"username": u, **p} for u, p in progress.items()])
+        else:
+            stored = DataManager._load_json(data_manager.USERS_FILE)
+            stored.update(users)
+            DataManager._save_json(data_manager.USERS_FILE, stored)
+            if data_manager.PROGRESS_LAYOUT == "sharded":
+                # Plain writes - seeding doesn't need _save_json's fsync per file
+                for username, record in progress.items():
+                    path = DataManager._progress_path(username)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(path, 'w') as f:
+                        json.dump(record, f, separators=(',', ':'))
+            else:
+                stored = DataManager._load_json(data_manager.PROGRESS_FILE)
+                stored.update(progress)
+                DataManager._save_json(data_manager.PROGRESS_FILE, stored)
+    return usernames
+
+
+def standin_requests() -> int:
+    """Requests served by the Supabase stand-in so far (0 on other backends)"""
+    return _standin.stats["requests"] if _standin is not None else 0
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the app's per-operation log lines"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))]
+
+
+def run_per_backend(script: str, backends: List[str], extra_args: Optional[List[str]] = None) -> int:
+    """Re-run a benchmark script with --backend for each backend; returns the worst exit code"""
+    worst = 0
+    for backend in backends:
+        result = subprocess.run([sys.executable, script, "--backend", backend] + (extra_args or []), cwd=APP_DIR)
+        worst = max(worst, result.returncode)
+    return worst
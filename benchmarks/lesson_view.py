@@ -0,0 +1,75 @@
+"""
+Lesson View Benchmark
+Server CPU per rerun of the lesson view (Streamlit AppTest, a logged-in student viewing one
+lesson), with the lesson's real markdown/LaTeX body and with an empty body. The difference
+is everything a server-side cache of the rendered lesson body could save per rerun.
+
+Usage:
+    python benchmarks/lesson_view.py
+    python benchmarks/lesson_view.py --lesson lesson3 --runs 30
+"""
+import argparse
+import statistics
+import time
+
+import harness
+
+
+def cpu_ms(at) -> float:
+    start = time.process_time()
+    with harness.quiet():
+        at.run()
+    elapsed = (time.process_time() - start) * 1000
+    assert not at.exception, at.exception
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-rerun server time of the lesson view")
+    parser.add_argument("--lesson", default="lesson1", help="lesson ID from content/lessons.json")
+    parser.add_argument("--runs", type=int, default=30, help="reruns per measurement (median is reported)")
+    args = parser.parse_args()
+
+    harness.use_backend("json")
+    with harness.quiet():
+        from streamlit.testing.v1 import AppTest
+        from content_store import get_lessons
+        from data_manager import DataManager
+
+        DataManager.register_user("bench_student", "pw", "bench@example.com", "Student")
+        DataManager.save_quiz_results("bench_student", "initial", 12, 18, [], [])
+
+    at = AppTest.from_file(str(harness.APP_DIR / "streamlit_app.py"), default_timeout=60)
+    at.session_state.logged_in = True
+    at.session_state.username = "bench_student"
+    at.session_state.user_role = "Student"
+    at.session_state.current_page = "lessons"
+    at.session_state.viewing_lesson = args.lesson
+    with harness.quiet():
+        at.run()  # Imports and first-run caches
+    assert not at.exception, at.exception
+
+    from pages import lessons_enhanced
+
+    lesson = get_lessons()[args.lesson]
+    without_content = {args.lesson: dict(lesson, content="")}
+    # Interleaved, so drift between the two measurements cancels out
+    with_body, without_body = [], []
+    try:
+        for _ in range(args.runs):
+            lessons_enhanced.get_lessons = get_lessons
+            with_body.append(cpu_ms(at))
+            lessons_enhanced.get_lessons = lambda: without_content
+            without_body.append(cpu_ms(at))
+    finally:
+        lessons_enhanced.get_lessons = get_lessons
+    with_body, without_body = statistics.median(with_body), statistics.median(without_body)
+
+    print(f"🧮 lesson view rerun, {args.lesson} ({len(lesson['content'].encode()) / 1024:.1f} KB of markdown/LaTeX)")
+    print(f"   with body      {with_body:7.1f} ms")
+    print(f"   empty body     {without_body:7.1f} ms")
+    print(f"   body share     {with_body - without_body:7.1f} ms per rerun")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Quiz Session Memory Benchmark
+Memory one session holds for a final test (20 questions) plus the initial quiz, measured
+with tracemalloc over many sessions. "copies" is how the pages kept them before QuizAttempt
+(a shuffled copy of every question dict in session state); "attempts" is QuizAttempt
+(IDs, packed choice orders, response bytes and a reference to the shared bank).
+
+Usage:
+    python benchmarks/session_memory.py
+    python benchmarks/session_memory.py --sessions 5000
+"""
+import argparse
+import random
+import tracemalloc
+
+import harness
+
+FINAL_TEST_QUESTIONS = 20
+
+
+def copied_session(final, initial):
+    """Session state as the final test and initial quiz pages built it before QuizAttempt"""
+    final_questions = []
+    for question in random.sample(final, min(FINAL_TEST_QUESTIONS, len(final))):
+        copy = dict(question)
+        choices = list(copy["choices"])
+        correct = choices[copy["answer"]]
+        random.shuffle(choices)
+        copy["choices"], copy["answer"] = choices, choices.index(correct)
+        final_questions.append(copy)
+
+    shuffled_questions = []
+    for question in random.sample(initial, len(initial)):
+        copy = dict(question)
+        indexed = list(enumerate(question["choices"]))
+        random.shuffle(indexed)
+        copy["choices"] = [choice for _, choice in indexed]
+        copy["answer_map"] = [index for index, _ in indexed]
+        copy["original_answer"] = question["answer"]
+        copy["shuffled_answer"] = copy["answer_map"].index(question["answer"])
+        shuffled_questions.append(copy)
+
+    return {"final_questions": final_questions, "final_responses": [None] * len(final_questions),
+            "shuffled_questions": shuffled_questions, "quiz_responses": [None] * len(initial)}
+
+
+def attempt_session(final, initial):
+    from quiz_attempt import QuizAttempt
+
+    return {"final_attempt": QuizAttempt.start(random.sample(final, min(FINAL_TEST_QUESTIONS, len(final)))),
+            "quiz_attempt": QuizAttempt.start(random.sample(initial, len(initial)))}
+
+
+def bytes_per_session(build, sessions: int, final, initial) -> float:
+    tracemalloc.start()
+    kept = [build(final, initial) for _ in range(sessions)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-session memory of quiz state: question copies vs QuizAttempt")
+    parser.add_argument("--sessions", type=int, default=1000, help="sessions held at once")
+    args = parser.parse_args()
+
+    with harness.quiet():
+        from question_bank import get_question_bank
+        bank = get_question_bank()
+        attempt_session(bank.questions("final_test"), bank.questions("initial_quiz"))  # warm imports and caches
+    final, initial = bank.questions("final_test"), bank.questions("initial_quiz")
+
+    print(f"🧮 {args.sessions} sessions, each with a {FINAL_TEST_QUESTIONS}-question final test and the "
+          f"{len(initial)}-question initial quiz")
+    copies = bytes_per_session(copied_session, args.sessions, final, initial)
+    attempts = bytes_per_session(attempt_session, args.sessions, final, initial)
+    print(f"   copies    {copies / 1024:7.1f} KB/session")
+    print(f"   attempts  {attempts / 1024:7.1f} KB/session  ({copies / attempts:.0f}x less)")
+
+
+if __name__ == "__main__":
+    main()
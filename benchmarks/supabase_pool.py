@@ -0,0 +1,142 @@
+"""
+Supabase Connection Pool Benchmark
+Renders the teacher dashboard's data path (class roster + class summary) from several
+concurrent sessions against a local Supabase stand-in (database/supabase_standin.py),
+once with a fresh client per query (how get_supabase_client used to work) and once with the
+shared pooled client. Reports connections opened, requests and p50/p95 render latency.
+The stand-in adds --latency-ms per request and --connect-ms per new connection, standing
+in for the network round trip and TLS handshake to the real project.
+
+Usage:
+    python benchmarks/supabase_pool.py
+    python benchmarks/supabase_pool.py --students 100 --sessions 16 --renders 20 --connect-ms 40
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+os.environ["DATA_BACKEND"] = "supabase"
+os.environ["EVENT_LOG"] = "off"
+
+from database.supabase_standin import SupabaseStandIn
+
+TEACHER_CODE = "TEACH-BENCH"
+
+
+def seed(server: SupabaseStandIn, students: int):
+    """One teacher and a class of students with some progress, written straight into the tables"""
+    users = [{"username": "bench_teacher", "password": "", "email": "t@example.com", "role": "Teacher",
+              "teacher_code": TEACHER_CODE, "parent_codes": [], "teacher_codes": [], "children": []}]
+    progress = []
+    for i in range(students):
+        username = f"student{i:04d}"
+        users.append({"username": username, "password": "", "email": f"{username}@example.com", "role": "Student",
+                      "share_code": f"SHARE-{i}", "parent_codes": [], "teacher_codes": [TEACHER_CODE], "children": []})
+        progress.append({
+            "username": username,
+            "initial_quiz": {"completed": True, "score": i % 18, "total": 18,
+                             "weak_topics": ["fractions"] if i % 3 else [], "strong_topics": ["decimals"]},
+            "lessons": {f"lesson_{n}": {"completed": True, "time_spent": 300} for n in range(i % 5)},
+            "overall_progress": (i * 7) % 100,
+            "total_time_spent": 300 * (i % 5),
+        })
+    server.tables["users"] = []
+    server.tables["progress"] = []
+    server._insert("users", users)
+    server._insert("progress", progress)
+
+
+def render_dashboard():
+    """What pages/dashboard/teacher.py loads on every render"""
+    from class_analytics import ClassSummaryStore
+    from data_manager import DataManager
+
+    students = DataManager.get_students_by_teacher_code(TEACHER_CODE)
+    ClassSummaryStore.invalidate(TEACHER_CODE)
+    ClassSummaryStore.get(TEACHER_CODE, [s["username"] for s in students])
+
+
+def run(server: SupabaseStandIn, mode: str, sessions: int, renders: int) -> Dict:
+    """Render from concurrent sessions; returns connection/request counts and latencies"""
+    from supabase import create_client
+    import database.supabase_manager as supabase_manager
+
+    pooled = supabase_manager.get_supabase_client
+    if mode == "before":
+        # A new client (and HTTP connection) for every query
+        supabase_manager.get_supabase_client = lambda: create_client(server.url, server.key)
+    supabase_manager.reset_supabase_client()
+    supabase_manager._client_config = None
+
+    render_dashboard()  # Warm-up: imports, first client
+    server.stats.update(connections=0, requests=0)
+
+    latencies: List[float] = []
+    latencies_lock = threading.Lock()
+
+    def session():
+        for _ in range(renders):
+            start = time.perf_counter()
+            render_dashboard()
+            elapsed = (time.perf_counter() - start) * 1000
+            with latencies_lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        supabase_manager.get_supabase_client = pooled
+
+    latencies.sort()
+    return {
+        "connections": server.stats["connections"],
+        "requests": server.stats["requests"],
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "renders": len(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teacher dashboard latency with and without the pooled Supabase client")
+    parser.add_argument("--students", type=int, default=30, help="students in the class")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent dashboard sessions")
+    parser.add_argument("--renders", type=int, default=10, help="renders per session")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="stand-in delay per request")
+    parser.add_argument("--connect-ms", type=float, default=20.0, help="stand-in delay per new connection")
+    parser.add_argument("--health-check-interval", type=float, default=0.0,
+                        help="SUPABASE_HEALTH_CHECK_INTERVAL for the pooled run (0 checks on every checkout)")
+    args = parser.parse_args()
+
+    os.environ["SUPABASE_HEALTH_CHECK_INTERVAL"] = str(args.health_check_interval)
+    with SupabaseStandIn(latency=args.latency_ms / 1000, connect_latency=args.connect_ms / 1000) as server:
+        os.environ["SUPABASE_URL"] = server.url
+        os.environ["SUPABASE_KEY"] = server.key
+        seed(server, args.students)
+
+        print(f"🏫 Teacher dashboard, {args.students} students, {args.sessions} sessions × {args.renders} renders "
+              f"({args.latency_ms:g} ms/request, {args.connect_ms:g} ms/connection)")
+        results = {mode: run(server, mode, args.sessions, args.renders) for mode in ("before", "after")}
+
+    for mode, label in (("before", "client per query"), ("after", "pooled client")):
+        r = results[mode]
+        print(f"   {label:<17} {r['connections']:5d} connections  {r['requests']:5d} requests  "
+              f"p50 {r['p50']:7.1f} ms  p95 {r['p95']:7.1f} ms")
+    before, after = results["before"], results["after"]
+    print(f"📊 p50 {before['p50'] / after['p50']:.1f}× faster, p95 {before['p95'] / after['p95']:.1f}× faster, "
+          f"{before['connections'] - after['connections']} fewer connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Topic Index Microbenchmark
+Looks up a student's practice entries for the six ML topics by scanning every entry's
+'topic' field (the lookup calculate_topic_confidence used before the topic index) and
+through ProgressEngine's topic index, for practice sections of growing size. Also times
+keeping the index current on a new attempt (ProgressEngine.merge) against rebuilding it.
+
+Usage:
+    python benchmarks/topic_index.py
+    python benchmarks/topic_index.py --extra 0 1000 10000 100000
+"""
+import argparse
+import random
+import time
+
+import harness
+
+
+def make_progress(extra: int):
+    """Every bank problem attempted a few times, plus `extra` entries from outside the bank"""
+    from data_manager import DataManager
+    from practice_bank import practice_problems
+    from progress_engine import ProgressEngine
+
+    rng = random.Random(0)
+    progress = DataManager._new_progress()
+    practice = progress["practice_problems"]
+    for problems in practice_problems().values():
+        for problem in problems:
+            for _ in range(rng.randint(1, 4)):
+                DataManager._apply_attempt(practice, problem["id"], rng.random() < 0.6)
+    for n in range(extra):
+        practice[f"extra_{n}"] = {"attempts": 2, "correct": 1, "incorrect": 1, "needs_review": False,
+                                  "topic": harness.TOPICS[n % len(harness.TOPICS)]}
+    ProgressEngine.topic_index(progress)
+    return progress
+
+
+def scan(progress, topic: str):
+    """Substring match on every entry's 'topic' field"""
+    return [entry for entry in progress["practice_problems"].values() if topic.lower() in entry.get("topic", "").lower()]
+
+
+def per_call_us(run, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        run()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Practice entry lookups by topic: full scan vs topic index")
+    parser.add_argument("--extra", type=int, nargs="+", default=[0, 1000, 10000],
+                        help="entries added on top of the problem bank")
+    parser.add_argument("--repeats", type=int, default=500, help="calls per measurement")
+    args = parser.parse_args()
+
+    harness.use_backend("json")
+    with harness.quiet():
+        from ml_features import ML_TOPICS, _topic_attempts
+        from progress_engine import ProgressEngine
+
+    print("🧮 six-topic lookup, scan vs index | one new attempt, rebuild vs merge")
+    for extra in args.extra:
+        with harness.quiet():
+            progress = make_progress(extra)
+        practice = progress["practice_problems"]
+        size = len(practice)
+        repeats = max(args.repeats * 1000 // (len(practice) + 1000), 5)
+
+        scan_us = per_call_us(lambda: [scan(progress, topic) for topic in ML_TOPICS], repeats)
+        index_us = per_call_us(lambda: [_topic_attempts(progress, topic) for topic in ML_TOPICS], repeats)
+
+        counter = iter(range(10 ** 9))
+        new_entry = {"attempts": 1, "correct": 1, "incorrect": 0, "needs_review": False, "topic": "Chain Rule"}
+        # Rebuild first - each merge adds an entry
+        rebuild_us = per_call_us(lambda: ProgressEngine.build_topic_index(practice), repeats)
+        merge_us = per_call_us(lambda: ProgressEngine.merge(progress, "practice_problems",
+                                                            {f"new_{next(counter)}": dict(new_entry)}), repeats)
+        print(f"   {size:>7} entries  scan {scan_us:10.1f} us  index {index_us:7.1f} us  |  "
+              f"rebuild {rebuild_us:10.1f} us  merge {merge_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+User-Growth Write Benchmark
+Cost of one student's progress write on the JSON backend as the number of users grows,
+with every user in data/progress.json (PROGRESS_LAYOUT=single) and with one file per user
+(PROGRESS_LAYOUT=sharded). A single-file write rewrites everyone's progress; a sharded
+write rewrites one record, so it should stay flat from 100 to 100,000 users.
+
+Usage:
+    python benchmarks/user_growth.py
+    python benchmarks/user_growth.py --users 100 1000 10000 --writes 50
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import harness
+
+LAYOUTS = ["single", "sharded"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-user progress write cost vs total users")
+    parser.add_argument("--users", type=int, nargs="+", default=[100, 1000, 10000, 100000], help="user counts")
+    parser.add_argument("--writes", type=int, default=10, help="timed writes per measurement (median is reported)")
+    args = parser.parse_args()
+
+    data_dir = harness.use_backend("json")
+    import data_manager
+    from data_manager import DataManager
+
+    rng = random.Random(6)
+    print(f"✍️ json: one update_progress() call, median of {args.writes} writes to random users")
+    results = {}
+    for count in args.users:
+        for layout in LAYOUTS:
+            run_dir = Path(tempfile.mkdtemp(dir=data_dir, prefix=f"{layout}-{count}-"))
+            data_manager.PROGRESS_LAYOUT = layout
+            data_manager.USERS_FILE = run_dir / "users.json"
+            data_manager.PROGRESS_FILE = run_dir / "progress.json"
+            data_manager.PROGRESS_SHARD_DIR = run_dir / "progress"
+            data_manager._json_cache.clear()
+            usernames = harness.seed_class(count, prefix=f"u{count}_")
+
+            times = []
+            for n in range(args.writes):
+                username = rng.choice(usernames)
+                start = time.perf_counter()
+                with harness.quiet():
+                    DataManager.update_progress(username, "lessons", {f"bench_{n}": {"completed": True, "time_spent": 60}})
+                times.append((time.perf_counter() - start) * 1000)
+            results[layout, count] = statistics.median(times)
+            data_manager._json_cache.clear()
+
+        single, sharded = results["single", count], results["sharded", count]
+        print(f"   {count:7d} users  single file {single:9.2f} ms  sharded {sharded:7.2f} ms  ({single / sharded:6.1f}×)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Class Analytics Engine - Columnar per-class statistics for teacher dashboards
+Loads every student's progress into one pandas frame, then computes risk levels,
+practice accuracy, topic frequencies and percentiles as vectorized column operations.
+pandas/numpy are imported on first use, so pages that only read ClassSummaryStore don't pay for them.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import Counter
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from data_manager import DataManager
+from progress_engine import ProgressEngine
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Risk thresholds (quiz score %, overall progress %)
+HIGH_RISK_QUIZ = 50
+HIGH_RISK_PROGRESS = 20
+MEDIUM_RISK_QUIZ = 70
+MEDIUM_RISK_PROGRESS = 40
+
+# Recommendation thresholds
+LOW_PRACTICE_ACCURACY = 60
+LOW_STUDY_MINUTES = 60
+
+# Materialized class summaries (ClassSummaryStore): patched per student as their progress
+# changes, and rebuilt from scratch once a summary is older than this many seconds
+CLASS_SUMMARY_MAX_AGE = float(os.getenv("CLASS_SUMMARY_MAX_AGE", "300"))
+
+# teacher_code -> summary row; the guard covers the dicts, each class's lock covers its refresh
+_class_summaries: Dict[str, Dict] = {}
+_class_summaries_lock = threading.Lock()
+_class_locks: Dict[str, threading.Lock] = {}
+
+FRAME_COLUMNS = ["quiz_raw", "quiz_total", "overall_progress", "total_time", "lessons_completed",
+                 "practice_total", "practice_correct", "weak_topics", "strong_topics"]
+
+
+def build_class_frame(class_progress: Dict[str, Dict]) -> pd.DataFrame:
+    """One row per student with the raw metrics pulled out of each progress record"""
+    import pandas as pd
+
+    rows = []
+    append = rows.append
+    for progress in class_progress.values():
+        # Section counts come from the progress counters, so no per-entry scans here
+        quiz = progress.get('initial_quiz', {})
+        counters = ProgressEngine.counters(progress)
+        append((
+            quiz.get('score', 0),
+            quiz.get('total', 1),
+            progress.get('overall_progress', 0),
+            progress.get('total_time_spent', 0) or 0,
+            counters['lessons_completed'],
+            counters['practice_done'],
+            counters['practice_correct'],
+            quiz.get('weak_topics', []),
+            quiz.get('strong_topics', []),
+        ))
+
+    frame = pd.DataFrame.from_records(rows, columns=FRAME_COLUMNS, index=pd.Index(list(class_progress), name="username"))
+    return add_derived_columns(frame)
+
+
+def add_derived_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Scores, risk level and percentiles, computed column-wise"""
+    import numpy as np
+
+    frame["quiz_score"] = frame["quiz_raw"] / frame["quiz_total"].clip(lower=1) * 100
+
+    practice_total = frame["practice_total"].to_numpy()
+    frame["practice_accuracy"] = np.where(
+        practice_total > 0, frame["practice_correct"] / np.maximum(practice_total, 1) * 100, 0.0
+    )
+
+    # Same rules as risk_level(), column-wise
+    quiz_score = frame["quiz_score"].to_numpy()
+    overall = frame["overall_progress"].to_numpy()
+    frame["risk_level"] = np.select(
+        [(quiz_score < HIGH_RISK_QUIZ) | (overall < HIGH_RISK_PROGRESS),
+         (quiz_score < MEDIUM_RISK_QUIZ) | (overall < MEDIUM_RISK_PROGRESS)],
+        ["High", "Medium"],
+        default="Low"
+    )
+
+    frame["progress_percentile"] = frame["overall_progress"].rank(pct=True) * 100
+    frame["quiz_percentile"] = frame["quiz_score"].rank(pct=True) * 100
+    return frame
+
+
+def topic_counts(frame: pd.DataFrame, column: str) -> Dict[str, int]:
+    """How often each topic appears in a list column across the class, most common first"""
+    # Counting over the flattened lists is cheaper than Series.explode for object columns
+    return dict(Counter(chain.from_iterable(frame[column])).most_common())
+
+
+def class_summary(frame: pd.DataFrame) -> Dict:
+    """Class-level aggregates shown on the teacher dashboards"""
+    if frame.empty:
+        return {
+            "student_count": 0,
+            "avg_quiz": 0.0,
+            "avg_progress": 0.0,
+            "total_time": 0,
+            "at_risk": 0,
+            "weak_topics": {},
+            "strong_topics": {},
+            "progress_quartiles": [0.0, 0.0, 0.0],
+        }
+
+    return {
+        "student_count": int(len(frame)),
+        "avg_quiz": float(frame["quiz_score"].mean()),
+        "avg_progress": float(frame["overall_progress"].mean()),
+        "total_time": int(frame["total_time"].sum()),
+        "at_risk": int((frame["risk_level"] == "High").sum()),
+        "weak_topics": topic_counts(frame, "weak_topics"),
+        "strong_topics": topic_counts(frame, "strong_topics"),
+        "progress_quartiles": [float(q) for q in frame["overall_progress"].quantile([0.25, 0.5, 0.75])],
+    }
+
+
+def recommendations(row: pd.Series) -> List[str]:
+    """Suggestions for one student from their frame row"""
+    recs = []
+    if row["weak_topics"]:
+        recs.append(f"Focus on: {', '.join(row['weak_topics'])}")
+    if row["practice_accuracy"] < LOW_PRACTICE_ACCURACY:
+        recs.append("Needs more practice problems")
+    if row["total_time"] < LOW_STUDY_MINUTES:
+        recs.append("Low engagement - encourage regular study")
+    if row["lessons_completed"] == 0:
+        recs.append("Has not completed any lessons yet")
+    return recs
+
+
+def student_analytics(row: pd.Series) -> Dict:
+    """Per-student analytics dict (the shape teacher_analytics renders)"""
+    return {
+        'quiz_score': float(row["quiz_score"]),
+        'overall_progress': row["overall_progress"],
+        'weak_topics': row["weak_topics"],
+        'strong_topics': row["strong_topics"],
+        'total_time': row["total_time"],
+        'lessons_completed': int(row["lessons_completed"]),
+        'practice_accuracy': float(row["practice_accuracy"]),
+        'risk_level': row["risk_level"],
+        'recommendations': recommendations(row)
+    }
+
+
+def risk_level(quiz_score: float, overall_progress: float) -> str:
+    """Risk level for one student"""
+    if quiz_score < HIGH_RISK_QUIZ or overall_progress < HIGH_RISK_PROGRESS:
+        return "High"
+    if quiz_score < MEDIUM_RISK_QUIZ or overall_progress < MEDIUM_RISK_PROGRESS:
+        return "Medium"
+    return "Low"
+
+
+def student_contribution(progress: Dict) -> Dict:
+    """What one student adds to their class summary"""
+    quiz = progress.get('initial_quiz', {})
+    quiz_score = quiz.get('score', 0) / max(quiz.get('total', 1), 1) * 100
+    overall_progress = progress.get('overall_progress', 0)
+    return {
+        "quiz_score": quiz_score,
+        "overall_progress": overall_progress,
+        "total_time": progress.get('total_time_spent', 0) or 0,
+        "risk_level": risk_level(quiz_score, overall_progress),
+        "quiz_completed": bool(quiz.get('completed', False)),
+        "weak_topics": list(quiz.get('weak_topics', [])),
+        "strong_topics": list(quiz.get('strong_topics', [])),
+    }
+
+
+class ClassSummaryStore:
+    """Per-class summary rows kept up to date one student at a time"""
+
+    @staticmethod
+    def _empty_row() -> Dict:
+        return {
+            "built_at": time.monotonic(),
+            "students": {},
+            "versions": {},
+            "totals": {"quiz_score": 0.0, "overall_progress": 0, "total_time": 0, "at_risk": 0},
+            "weak_topics": Counter(),
+            "strong_topics": Counter(),
+        }
+
+    @staticmethod
+    def _apply(row: Dict, username: str, contribution: Dict, sign: int):
+        """Add (sign=1) or remove (sign=-1) one student's contribution"""
+        totals = row["totals"]
+        totals["quiz_score"] += sign * contribution["quiz_score"]
+        totals["overall_progress"] += sign * contribution["overall_progress"]
+        totals["total_time"] += sign * contribution["total_time"]
+        totals["at_risk"] += sign * (contribution["risk_level"] == "High")
+        for column in ("weak_topics", "strong_topics"):
+            for topic in contribution[column]:
+                row[column][topic] += sign
+            if sign < 0:
+                row[column] += Counter()  # Drop topics that reached zero
+
+        if sign > 0:
+            row["students"][username] = contribution
+        else:
+            row["students"].pop(username, None)
+
+    @staticmethod
+    def get(teacher_code: str, usernames: List[str]) -> Dict:
+        """
+        Summary for a class roster. Only students whose progress changed since the row
+        was last touched (or who joined) are reloaded; the row is rebuilt when stale.
+        """
+        with _class_summaries_lock:
+            class_lock = _class_locks.setdefault(teacher_code, threading.Lock())
+
+        # Only readers of the same class wait for this one's progress loads
+        with class_lock:
+            with _class_summaries_lock:
+                row = _class_summaries.get(teacher_code)
+            if row is None or time.monotonic() - row["built_at"] > CLASS_SUMMARY_MAX_AGE:
+                row = ClassSummaryStore._empty_row()
+
+            roster = set(usernames)
+            for username in [u for u in row["students"] if u not in roster]:
+                ClassSummaryStore._apply(row, username, row["students"][username], -1)
+                row["versions"].pop(username, None)
+
+            # Read versions before loading so a write that lands meanwhile is picked up next time
+            versions = {u: DataManager.progress_version(u) for u in usernames}
+            changed = [u for u in usernames if u not in row["students"] or row["versions"].get(u) != versions[u]]
+
+            if changed:
+                for username, progress in DataManager.get_many_progress(changed).items():
+                    if username in row["students"]:
+                        ClassSummaryStore._apply(row, username, row["students"][username], -1)
+                    ClassSummaryStore._apply(row, username, student_contribution(progress), 1)
+                    row["versions"][username] = versions[username]
+                print(f"📊 Class summary {teacher_code}: refreshed {len(changed)} of {len(usernames)} students")
+
+            with _class_summaries_lock:
+                _class_summaries[teacher_code] = row
+            return ClassSummaryStore._summary(row, usernames)
+
+    @staticmethod
+    def _summary(row: Dict, usernames: List[str]) -> Dict:
+        """The read-only view of a row that dashboards use (same keys as class_summary)"""
+        count = len(row["students"])
+        totals = row["totals"]
+        return {
+            "student_count": count,
+            "avg_quiz": totals["quiz_score"] / count if count else 0.0,
+            "avg_progress": totals["overall_progress"] / count if count else 0.0,
+            "total_time": totals["total_time"],
+            "at_risk": totals["at_risk"],
+            "weak_topics": dict(row["weak_topics"].most_common()),
+            "strong_topics": dict(row["strong_topics"].most_common()),
+            "students": {u: dict(row["students"][u]) for u in usernames if u in row["students"]},
+        }
+
+    @staticmethod
+    def invalidate(teacher_code: Optional[str] = None):
+        """Force a full rebuild on next read (all classes if no code)"""
+        with _class_summaries_lock:
+            rows = list(_class_summaries.values()) if teacher_code is None else [_class_summaries.get(teacher_code)]
+            if teacher_code is None:
+                _class_summaries.clear()
+            else:
+                _class_summaries.pop(teacher_code, None)
+        for row in rows:
+            if row is not None:
+                row["built_at"] = float("-inf")  # A refresh in progress stores it back, stale
@@ -0,0 +1,29 @@
+"""
+Fragments - partial reruns for interactive page regions
+A widget inside a fragment reruns only that fragment, not the whole app (sidebar, CSS
+injections, progress loads). On Streamlit versions without fragments the decorated
+function runs as a normal part of the page and every interaction reruns the app.
+"""
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+# st.fragment (Streamlit >= 1.37), st.experimental_fragment (1.33 - 1.36)
+_st_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def fragment(func=None, *, run_every=None):
+    """Decorator: run `func` as a fragment where supported (optionally re-run every `run_every` seconds)"""
+    if _st_fragment is None:
+        return func if func is not None else (lambda f: f)
+    if func is None:
+        return _st_fragment(run_every=run_every)
+    return _st_fragment(func, run_every=run_every)
+
+
+def rerun_fragment():
+    """Rerun only the running fragment - or the whole app where that isn't possible"""
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        # No rerun scope before Streamlit 1.37, or not inside a fragment rerun
+        st.rerun()
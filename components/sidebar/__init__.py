@@ -1,79 +1,92 @@
 """
 Clean sidebar component - always consistent
 """
+import io
+from pathlib import Path
+
 import streamlit as st
 from data_manager import DataManager
 
+# The logo file is 1024px; st.image would decode and downscale it on every rerun
+LOGO_FILE = Path(__file__).resolve().parents[2] / "assets" / "logo.png"
+LOGO_WIDTH = 120
+_logo_cache = {"mtime": None, "png": None}
+
+# Sidebar styling - and FORCE hide the ugly Streamlit default navigation.
+# Applied with the app-wide sheet in app_main, not by render_sidebar.
+SIDEBAR_STYLES = """
+<style>
+    /* FORCE HIDE DEFAULT STREAMLIT NAVIGATION */
+    [data-testid="stSidebarNav"] {
+        display: none !important;
+        visibility: hidden !important;
+        height: 0 !important;
+        overflow: hidden !important;
+    }
+
+    /* Custom sidebar styling */
+    [data-testid="stSidebar"] {
+        background-color: #2a2a2a !important;
+    }
+
+    /* Sidebar buttons - olive green */
+    [data-testid="stSidebar"] .stButton>button {
+        background: #6B8E23 !important;
+        color: white !important;
+        border-radius: 16px !important;
+        padding: 12px 24px !important;
+        font-weight: 700 !important;
+        border: none !important;
+        box-shadow: 0 4px 0 #556B2F !important;
+        transition: all 0.2s ease !important;
+        width: 100% !important;
+    }
+
+    [data-testid="stSidebar"] .stButton>button:hover {
+        transform: translateY(-2px) !important;
+        box-shadow: 0 6px 0 #556B2F !important;
+        background: #7BA428 !important;
+    }
+
+    [data-testid="stSidebar"] .stButton>button:active {
+        transform: translateY(2px) !important;
+        box-shadow: 0 2px 0 #556B2F !important;
+    }
+
+    /* Progress bar - olive green */
+    [data-testid="stSidebar"] .stProgress > div > div {
+        background-color: #6B8E23 !important;
+    }
+</style>
+"""
+
+
+def sidebar_logo() -> bytes:
+    """The logo as PNG bytes at sidebar width, downscaled once per version of the file"""
+    mtime = LOGO_FILE.stat().st_mtime_ns
+    if _logo_cache["mtime"] != mtime:
+        from PIL import Image
+        with Image.open(LOGO_FILE) as image:
+            height = round(image.height * LOGO_WIDTH / image.width)
+            buffer = io.BytesIO()
+            image.resize((LOGO_WIDTH, height), Image.BILINEAR).save(buffer, format="PNG")
+        _logo_cache["png"] = buffer.getvalue()
+        _logo_cache["mtime"] = mtime
+    return _logo_cache["png"]
+
 
 def render_sidebar():
     """Render the beautiful sidebar - ALWAYS consistent"""
     
-    # FORCE hide the ugly Streamlit default navigation
-    st.markdown("""
-    <style>
-        /* FORCE HIDE DEFAULT STREAMLIT NAVIGATION */
-        [data-testid="stSidebarNav"] {
-            display: none !important;
-            visibility: hidden !important;
-            height: 0 !important;
-            overflow: hidden !important;
-        }
-        
-        /* Custom sidebar styling */
-        [data-testid="stSidebar"] {
-            background-color: #2a2a2a !important;
-        }
-        
-        /* Sidebar buttons - olive green */
-        [data-testid="stSidebar"] .stButton>button {
-            background: #6B8E23 !important;
-            color: white !important;
-            border-radius: 16px !important;
-            padding: 12px 24px !important;
-            font-weight: 700 !important;
-            border: none !important;
-            box-shadow: 0 4px 0 #556B2F !important;
-            transition: all 0.2s ease !important;
-            width: 100% !important;
-        }
-        
-        [data-testid="stSidebar"] .stButton>button:hover {
-            transform: translateY(-2px) !important;
-            box-shadow: 0 6px 0 #556B2F !important;
-            background: #7BA428 !important;
-        }
-        
-        [data-testid="stSidebar"] .stButton>button:active {
-            transform: translateY(2px) !important;
-            box-shadow: 0 2px 0 #556B2F !important;
-        }
-        
-        /* Progress bar - olive green */
-        [data-testid="stSidebar"] .stProgress > div > div {
-            background-color: #6B8E23 !important;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Don't show sidebar if not logged in
+    # Don't show sidebar if not logged in (the auth page styles hide it)
     if not st.session_state.get('logged_in', False):
-        st.markdown("""
-        <style>
-            [data-testid="stSidebar"] {
-                display: none !important;
-            }
-            button[kind="header"] {
-                display: none !important;
-            }
-        </style>
-        """, unsafe_allow_html=True)
         return
     
     # Show beautiful sidebar
     with st.sidebar:
         # Logo
         try:
-            st.image("assets/logo.png", width=120)
+            st.image(sidebar_logo(), width=LOGO_WIDTH)
         except:
             st.title("🧠 BrainyYack")
         
@@ -116,6 +129,7 @@ def render_sidebar():
         
         # Logout
         if st.button("🚪 Logout", key="sidebar_logout", use_container_width=True):
+            DataManager.flush_attempts(st.session_state.username)
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.rerun()
@@ -0,0 +1,114 @@
+"""
+Styles - Minified, versioned stylesheets
+Every rerun has to re-send the page's styles (Streamlit drops elements a rerun doesn't
+emit), so each sheet - the app-wide base plus one delta per page - is minified and hashed
+once per process and written to static/css/<name>.<hash>.css. A rerun only sends a <link>
+to it and the browser fetches each version once. Where static files can't be served, the
+sheet is sent inline as a single hash-keyed <style> block instead.
+"""
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Tuple
+
+import streamlit as st
+
+# How sheets reach the browser:
+#   "static" - a <link> to a versioned file under static/ (default); needs server.enableStaticServing
+#              (.streamlit/config.toml) and a Streamlit version that serves .css files as text/css,
+#              otherwise falls back to inline
+#   "inline" - one minified <style> block per sheet on every rerun
+STYLE_DELIVERY = os.getenv("STYLE_DELIVERY", "static").lower()
+
+# Streamlit serves the static/ folder next to the main script at app/static/
+STATIC_CSS_DIR = Path(__file__).resolve().parents[2] / "static" / "css"
+STATIC_CSS_URL = "app/static/css"
+
+# (name, *sources) -> (version, minified css)
+_sheets: Dict[tuple, Tuple[str, str]] = {}
+_written = set()
+_static_unavailable_reported = False
+
+
+def minify_css(css: str) -> str:
+    """Strip <style> tags, comments and whitespace that doesn't change the meaning"""
+    css = re.sub(r"</?style>", "", css)
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    # Inside declaration blocks only - in selectors "a :hover" and "a:hover" differ
+    css = re.sub(r"\{[^{}]*\}", lambda block: re.sub(r"\s*:\s*", ":", block.group()), css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def stylesheet(name: str, *sources: str) -> Tuple[str, str]:
+    """(version, minified css) of a sheet built from CSS sources, computed once per process"""
+    key = (name,) + sources
+    sheet = _sheets.get(key)
+    if sheet is None:
+        css = "".join(minify_css(source) for source in sources)
+        version = hashlib.sha1(css.encode()).hexdigest()[:10]
+        sheet = _sheets.setdefault(key, (version, css))
+    return sheet
+
+
+def _static_url(name: str, version: str, css: str) -> str:
+    """URL of the sheet's versioned file, writing the file on first use"""
+    filename = f"{name}.{version}.css"
+    if filename not in _written:
+        path = STATIC_CSS_DIR / filename
+        if not path.exists():
+            STATIC_CSS_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=STATIC_CSS_DIR, prefix=f".{filename}.", suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                f.write(css)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        _written.add(filename)
+    return f"{STATIC_CSS_URL}/{filename}"
+
+
+def _css_served_as_css() -> bool:
+    """Older Streamlit servers send static files outside a fixed extension list (without .css) as text/plain"""
+    try:
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        return True  # Servers without that list send each file's own content type
+    return ".css" in SAFE_APP_STATIC_FILE_EXTENSIONS
+
+
+def _static_unavailable(reason: str):
+    """Fall back to inline styles for the rest of the process"""
+    global _static_unavailable_reported
+    if not _static_unavailable_reported:
+        _static_unavailable_reported = True
+        print(f"⚠️ Static stylesheets unavailable ({reason}) - injecting styles inline")
+
+
+def _serve_static() -> bool:
+    """Whether sheets are delivered as static files"""
+    if STYLE_DELIVERY != "static" or _static_unavailable_reported:
+        return False
+    if not st.get_option("server.enableStaticServing"):
+        _static_unavailable("server.enableStaticServing is off")
+        return False
+    if not _css_served_as_css():
+        _static_unavailable("this Streamlit version serves .css as text/plain")
+        return False
+    return True
+
+
+def apply_styles(name: str, *sources: str):
+    """Apply a stylesheet built from one or more CSS sources (e.g. a page's *_STYLES constant)"""
+    version, css = stylesheet(name, *sources)
+    if _serve_static():
+        try:
+            url = _static_url(name, version, css)
+        except OSError as e:
+            _static_unavailable(f"can't write {STATIC_CSS_DIR}: {e}")
+        else:
+            st.markdown(f'<link rel="stylesheet" href="{url}">', unsafe_allow_html=True)
+            return
+    st.markdown(f'<style id="{name}-{version}">{css}</style>', unsafe_allow_html=True)
@@ -0,0 +1,148 @@
+"""
+Content Store - Lesson and question content kept in data files under content/
+Each file is validated and compiled into one read-only structure per process, shared by
+all sessions, and recompiled when the file's mtime changes (no Streamlit restart needed).
+An edit that fails validation is reported and the last good version keeps being served.
+
+Usage:
+    python content_store.py    # validate every content file (exit code 1 on errors)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional
+
+CONTENT_DIR = Path(__file__).parent / "content"
+LESSONS_CONTENT_FILE = CONTENT_DIR / "lessons.json"
+
+# How often (seconds) a content file's mtime is checked; CONTENT_RELOAD_INTERVAL=0 checks on every read
+CONTENT_RELOAD_INTERVAL = float(os.getenv("CONTENT_RELOAD_INTERVAL", "2"))
+
+LESSON_REQUIRED_FIELDS = {"id": str, "title": str, "level": int, "estimated_time": int,
+                          "prerequisites": list, "topics": list, "content": str, "quiz_questions": int}
+
+
+class ContentError(ValueError):
+    """A content file failed validation"""
+
+    def __init__(self, path: Optional[Path], errors: List[str]):
+        self.path = path
+        self.errors = errors
+        super().__init__(f"{path.name if path else 'content'}: " + "; ".join(errors))
+
+
+class ContentStore:
+    """Per-file compiled content, reloaded when the file changes"""
+
+    # path -> {"compiled", "mtime", "checked_at"}
+    _entries: Dict[Path, Dict] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def load(path: Path, compile_document: Callable[[Dict], object]):
+        """Read, validate and compile one content file (raises ContentError)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        except ValueError as e:
+            raise ContentError(path, [f"invalid JSON: {e}"])
+        try:
+            return compile_document(document)
+        except ContentError as e:
+            raise ContentError(path, e.errors)
+
+    @staticmethod
+    def get(path: Path, compile_document: Callable[[Dict], object]):
+        """Compiled content for a file, recompiling it if it changed since it was last loaded"""
+        entry = ContentStore._entries.get(path)
+        now = time.monotonic()
+        if entry is not None and now - entry["checked_at"] < CONTENT_RELOAD_INTERVAL:
+            return entry["compiled"]
+
+        with ContentStore._lock:
+            entry = ContentStore._entries.get(path)
+            mtime = path.stat().st_mtime_ns
+            if entry is not None and entry["mtime"] == mtime:
+                entry["checked_at"] = now
+                return entry["compiled"]
+
+            try:
+                compiled = ContentStore.load(path, compile_document)
+            except ContentError as e:
+                if entry is None:
+                    raise
+                # Keep serving the last good version; don't retry until the file changes again
+                print(f"⚠️ Content not reloaded - {e}")
+                entry["mtime"] = mtime
+                entry["checked_at"] = now
+                return entry["compiled"]
+
+            print(f"📚 {'Reloaded' if entry else 'Loaded'} content from {path.name}")
+            ContentStore._entries[path] = {"compiled": compiled, "mtime": mtime, "checked_at": now}
+            return compiled
+
+
+def compile_lessons(document: Dict) -> Mapping[str, Mapping]:
+    """Validate lesson content and freeze it as {lesson_id: lesson} in file order"""
+    errors = []
+    lessons = document.get("lessons")
+    if not isinstance(lessons, list):
+        raise ContentError(None, ["'lessons' must be a list"])
+
+    ids = [lesson.get("id") for lesson in lessons if isinstance(lesson, dict)]
+    for position, lesson in enumerate(lessons):
+        if not isinstance(lesson, dict):
+            errors.append(f"lesson #{position + 1} is not an object")
+            continue
+        name = lesson.get("id", f"#{position + 1}")
+        for field, field_type in LESSON_REQUIRED_FIELDS.items():
+            if not isinstance(lesson.get(field), field_type):
+                errors.append(f"{name}: '{field}' must be {field_type.__name__}")
+        for prerequisite in lesson.get("prerequisites") or []:
+            if prerequisite not in ids[:position]:
+                errors.append(f"{name}: prerequisite '{prerequisite}' is not an earlier lesson")
+    if len(set(ids)) != len(ids):
+        errors.append("duplicate lesson ids")
+    if errors:
+        raise ContentError(None, errors)
+
+    frozen = {}
+    for lesson in lessons:
+        lesson = dict(lesson)
+        lesson["prerequisites"] = tuple(lesson["prerequisites"])
+        lesson["topics"] = tuple(lesson["topics"])
+        frozen[lesson["id"]] = MappingProxyType(lesson)
+    return MappingProxyType(frozen)
+
+
+def get_lessons() -> Mapping[str, Mapping]:
+    """Lessons by id (see content/lessons.json)"""
+    return ContentStore.get(LESSONS_CONTENT_FILE, compile_lessons)
+
+
+def main():
+    """Validate every content file"""
+    from question_bank import QUESTION_BANK_FILE, compile_question_bank
+
+    failed = False
+    for path, compile_document in ((LESSONS_CONTENT_FILE, compile_lessons),
+                                   (QUESTION_BANK_FILE, compile_question_bank)):
+        try:
+            compiled = ContentStore.load(path, compile_document)
+        except ContentError as e:
+            failed = True
+            print(f"❌ {path.name}:")
+            for error in e.errors:
+                print(f"   - {error}")
+        else:
+            print(f"✅ {path.name}: {len(getattr(compiled, 'all', compiled))} entries")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
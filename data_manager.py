@@ -1,19 +1,49 @@
+import atexit
 import json
 import os
+import pickle
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
+from urllib.parse import quote, unquote
 import hashlib
+import importlib.util
 
-# Try to use Supabase, fall back to JSON for local dev
-# NOW ENABLED - Supabase manager now has complete progress calculation
-USE_SUPABASE = True
 try:
-    from database.supabase_manager import SupabaseDataManager
-    print("✅ Supabase enabled - Progress will persist on cloud!")
-except Exception as e:
-    USE_SUPABASE = False
-    print(f"⚠️ Supabase not configured ({e}), using JSON fallback")
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import spaced_repetition
+from database.event_store import EventStore
+from progress_engine import ProgressEngine
+
+# Storage backend - DATA_BACKEND=sqlite for the embedded database, DATA_BACKEND=json to
+# force the JSON files; otherwise try Supabase and fall back to JSON for local dev
+DATA_BACKEND = os.getenv("DATA_BACKEND", "supabase").lower()
+
+USE_SQLITE = DATA_BACKEND == "sqlite"
+if USE_SQLITE:
+    from database.sqlite_manager import SQLiteDataManager, get_db_path
+    print(f"✅ SQLite enabled - Progress will persist in {get_db_path()}")
+
+# NOW ENABLED - Supabase manager now has complete progress calculation
+USE_SUPABASE = DATA_BACKEND == "supabase"
+if USE_SUPABASE:
+    try:
+        # The client library itself is only imported when the first connection is made
+        if importlib.util.find_spec("supabase") is None:
+            raise ImportError("No module named 'supabase'")
+        from database.supabase_manager import SupabaseDataManager
+        print("✅ Supabase enabled - Progress will persist on cloud!")
+    except Exception as e:
+        USE_SUPABASE = False
+        print(f"⚠️ Supabase not configured ({e}), using JSON fallback")
 
 # JSON fallback configuration
 DATA_DIR = Path(__file__).parent / "data"
@@ -24,6 +54,73 @@ PROGRESS_FILE = DATA_DIR / "progress.json"
 QUIZZES_FILE = DATA_DIR / "quizzes.json"
 LESSONS_FILE = DATA_DIR / "lessons.json"
 
+# Progress storage layout for the JSON backend:
+#   "single"  - every user in data/progress.json (default)
+#   "sharded" - one file per user under data/progress/<hash prefix>/<username>.json,
+#               so a write only rewrites that user's record
+# Convert existing data with migrate_progress_layout.py
+PROGRESS_LAYOUT = os.getenv("PROGRESS_LAYOUT", "single")
+PROGRESS_SHARD_DIR = DATA_DIR / "progress"
+
+# Process-wide parsed-document cache for the JSON backend: path -> (file stamp, pickled data).
+# Each hit unpickles a fresh copy, so callers can never mutate the shared snapshot.
+_json_cache: Dict[Path, tuple] = {}
+_json_cache_lock = threading.Lock()
+
+JSON_CACHE_STATS = {
+    "hits": 0,
+    "misses": 0,
+    "parse_seconds": 0.0,
+}
+
+# Advisory locks serializing read-modify-write cycles on a data file.
+# A per-path RLock covers threads in this process; an OS lock on "<file>.lock"
+# covers other processes. Only the outermost acquisition takes the OS lock.
+_path_locks: Dict[Path, threading.RLock] = {}
+_path_locks_guard = threading.Lock()
+_held_file_locks: Dict[Path, list] = {}
+
+# Per-rerun progress snapshots (see DataManager.rerun_scope). Thread-local because
+# Streamlit runs each session's script on its own thread; outside a scope every
+# get_user_progress call goes to the store as before.
+_rerun_state = threading.local()
+
+# username -> number of progress writes made by this process (see DataManager.progress_version)
+_progress_versions: Dict[str, int] = {}
+_progress_versions_lock = threading.Lock()
+
+PROGRESS_LOAD_STATS = {
+    "reruns": 0,
+    "loads": 0,
+    "snapshot_hits": 0,
+}
+
+# PROGRESS_DEBUG=on logs every rerun's progress loads (app_main also keeps the last
+# rerun's counts in st.session_state.progress_loads)
+PROGRESS_DEBUG = os.getenv("PROGRESS_DEBUG", "off").lower() == "on"
+
+# Write-behind buffer for practice attempts (DataManager.record_attempt). Each attempt is
+# appended to data/attempts/<username>@<owner>.jsonl, then folded into progress with one write
+# every ATTEMPT_FLUSH_EVERY attempts or ATTEMPT_FLUSH_SECONDS, on page change and on logout.
+# A process holds an exclusive lock on its journals while they exist, so only a journal
+# left behind by a dead process (unlocked) is replayed by another one.
+ATTEMPT_FLUSH_EVERY = int(os.getenv("ATTEMPT_FLUSH_EVERY", "10"))
+ATTEMPT_FLUSH_SECONDS = float(os.getenv("ATTEMPT_FLUSH_SECONDS", "30"))
+ATTEMPT_JOURNAL_DIR = DATA_DIR / "attempts"
+
+# username -> {"events": [(problem_id, correct, date), ...], "since": monotonic time of oldest event}
+_pending_attempts: Dict[str, Dict] = {}
+_pending_attempts_lock = threading.Lock()
+_replayed_journals = set()
+
+# This process's journals: owner token in their file names, username -> open, locked handle
+_journal_owner = f"{os.getpid()}-{os.urandom(4).hex()}"
+_owned_journals: Dict[str, Any] = {}
+
+# teacher_code -> enrolled students, rebuilt only when users.json changes on disk
+_roster_index: Dict[str, List[Dict]] = {}
+_roster_index_stamp: Optional[tuple] = None
+
 
 class DataManager:
     """Handles all data persistence operations - routes to Supabase or JSON"""
@@ -35,59 +132,174 @@ class DataManager:
     
     @staticmethod
     def _load_json(filepath: Path) -> Dict:
-        """Load data from JSON file"""
-        if not filepath.exists():
+        """Load data from JSON file (served from the in-memory cache when unchanged)"""
+        stamp = DataManager._file_stamp(filepath)
+        if stamp is None:
             return {}
+        
+        with _json_cache_lock:
+            cached = _json_cache.get(filepath)
+            if cached is not None and cached[0] == stamp:
+                JSON_CACHE_STATS["hits"] += 1
+                return pickle.loads(cached[1])
+        
+        start = time.perf_counter()
         try:
             with open(filepath, 'r') as f:
-                return json.load(f)
-        except:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read {filepath.name}: {e}")
             return {}
+        
+        with _json_cache_lock:
+            JSON_CACHE_STATS["misses"] += 1
+            JSON_CACHE_STATS["parse_seconds"] += time.perf_counter() - start
+            _json_cache[filepath] = (stamp, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        return data
     
     @staticmethod
     def _save_json(filepath: Path, data: Dict):
-        """Save data to JSON file"""
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Save data to JSON file atomically (temp file + os.replace)"""
+        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp")
+        try:
+            # mkstemp creates 0600 files; keep the permissions of the file we replace
+            try:
+                os.chmod(tmp_path, filepath.stat().st_mode & 0o777)
+            except OSError:
+                os.chmod(tmp_path, 0o644)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+        # Refresh the cache with what we just wrote so the next read skips the parse
+        stamp = DataManager._file_stamp(filepath)
+        with _json_cache_lock:
+            if stamp is not None:
+                _json_cache[filepath] = (stamp, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+            else:
+                _json_cache.pop(filepath, None)
         print(f"💾 Saved to {filepath.name} - {len(data)} users")
     
+    @staticmethod
+    @contextmanager
+    def _locked(filepath: Path):
+        """Hold an exclusive lock on a data file for a read-modify-write sequence"""
+        with _path_locks_guard:
+            path_lock = _path_locks.setdefault(filepath, threading.RLock())
+        
+        with path_lock:
+            held = _held_file_locks.get(filepath)
+            if held is None:
+                handle = open(filepath.with_name(filepath.name + ".lock"), 'a+')
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                held = _held_file_locks[filepath] = [handle, 0]
+            held[1] += 1
+            try:
+                yield
+            finally:
+                held[1] -= 1
+                if held[1] == 0:
+                    del _held_file_locks[filepath]
+                    handle = held[0]
+                    if fcntl is not None:
+                        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                    else:
+                        handle.seek(0)
+                        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+                    handle.close()
+    
+    @staticmethod
+    def _file_stamp(filepath: Path) -> Optional[tuple]:
+        """Identify a file version by inode, mtime and size (None if missing)"""
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    @staticmethod
+    def _get_roster_index() -> Dict[str, List[Dict]]:
+        """Index of teacher_code -> students, so roster lookups skip the full user scan"""
+        global _roster_index, _roster_index_stamp
+        
+        stamp = DataManager._file_stamp(USERS_FILE)
+        if stamp is not None and stamp == _roster_index_stamp:
+            return _roster_index
+        
+        users = DataManager._load_json(USERS_FILE)
+        index: Dict[str, List[Dict]] = {}
+        for username, user_data in users.items():
+            if user_data.get("role") != "Student":
+                continue
+            for code in user_data.get("teacher_codes", []):
+                index.setdefault(code, []).append({
+                    "username": username,
+                    "email": user_data.get("email", "")
+                })
+        
+        _roster_index = index
+        _roster_index_stamp = stamp
+        return index
+    
     # --- User Management ---
     
     @staticmethod
     def register_user(username: str, password: str, email: str, role: str, **kwargs) -> tuple[bool, str]:
         """Register a new user"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.register_user(username, password, email, role, **kwargs)
+        
         # Use Supabase if available
         if USE_SUPABASE:
             return SupabaseDataManager.register_user(username, password, email, role, **kwargs)
         
         # JSON fallback
-        users = DataManager._load_json(USERS_FILE)
-        
-        if username in users:
-            return False, "Username already exists"
-        
-        users[username] = {
-            "password": DataManager._hash_password(password),
-            "email": email,
-            "role": role,
-            "created_at": datetime.now().isoformat(),
-            "age_level": kwargs.get("age_level", "High School"),
-            "grade": kwargs.get("grade", ""),
-            "share_code": kwargs.get("share_code", ""),
-            "parent_codes": kwargs.get("parent_codes", []),
-            "teacher_codes": kwargs.get("teacher_codes", [])
-        }
-        
-        DataManager._save_json(USERS_FILE, users)
-        
-        # Initialize progress for new user
-        DataManager.init_user_progress(username)
-        
-        return True, "Registration successful"
+        with DataManager._locked(USERS_FILE):
+            users = DataManager._load_json(USERS_FILE)
+            
+            if username in users:
+                return False, "Username already exists"
+            
+            users[username] = {
+                "password": DataManager._hash_password(password),
+                "email": email,
+                "role": role,
+                "created_at": datetime.now().isoformat(),
+                "age_level": kwargs.get("age_level", "High School"),
+                "grade": kwargs.get("grade", ""),
+                "share_code": kwargs.get("share_code", ""),
+                "teacher_code": kwargs.get("teacher_code", ""),
+                "parent_codes": kwargs.get("parent_codes", []),
+                "teacher_codes": kwargs.get("teacher_codes", [])
+            }
+            
+            DataManager._save_json(USERS_FILE, users)
+            
+            # Initialize progress for new user
+            DataManager.init_user_progress(username)
+            
+            return True, "Registration successful"
     
     @staticmethod
     def login_user(username: str, password: str) -> tuple[bool, Optional[Dict], str]:
         """Authenticate user login"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.login_user(username, password)
+        
         # Use Supabase if available
         if USE_SUPABASE:
             return SupabaseDataManager.login_user(username, password)
@@ -107,6 +319,10 @@ class DataManager:
     @staticmethod
     def get_user(username: str) -> Optional[Dict]:
         """Get user information"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.get_user(username)
+        
         # Use Supabase if available
         if USE_SUPABASE:
             return SupabaseDataManager.get_user(username)
@@ -118,65 +334,197 @@ class DataManager:
     @staticmethod
     def update_user(username: str, updates: Dict) -> bool:
         """Update user information"""
-        users = DataManager._load_json(USERS_FILE)
-        if username not in users:
-            return False
-        users[username].update(updates)
-        DataManager._save_json(USERS_FILE, users)
-        return True
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.update_user(username, updates)
+        
+        # Use Supabase if available
+        if USE_SUPABASE:
+            return SupabaseDataManager.update_user(username, updates)
+        
+        with DataManager._locked(USERS_FILE):
+            users = DataManager._load_json(USERS_FILE)
+            if username not in users:
+                return False
+            users[username].update(updates)
+            DataManager._save_json(USERS_FILE, users)
+            return True
     
     @staticmethod
     def reset_password(username: str, email: str, new_password: str) -> tuple[bool, str]:
         """Reset user password"""
-        users = DataManager._load_json(USERS_FILE)
-        
-        if username not in users:
-            return False, "User not found"
-        
-        if users[username]["email"] != email:
-            return False, "Email doesn't match"
-        
-        users[username]["password"] = DataManager._hash_password(new_password)
-        DataManager._save_json(USERS_FILE, users)
-        return True, "Password reset successful"
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.reset_password(username, email, new_password)
+        
+        with DataManager._locked(USERS_FILE):
+            users = DataManager._load_json(USERS_FILE)
+            
+            if username not in users:
+                return False, "User not found"
+            
+            if users[username]["email"] != email:
+                return False, "Email doesn't match"
+            
+            users[username]["password"] = DataManager._hash_password(new_password)
+            DataManager._save_json(USERS_FILE, users)
+            return True, "Password reset successful"
     
     # --- Progress Management ---
     
+    @staticmethod
+    def _new_progress() -> Dict:
+        """Default progress record for a new user"""
+        return {
+            "initial_quiz": {
+                "completed": False,
+                "score": 0,
+                "total": 18,
+                "weak_topics": [],
+                "strong_topics": [],
+                "date": None
+            },
+            "lessons": {},
+            "lesson_quizzes": {},
+            "practice_problems": {},
+            "final_test": {
+                "completed": False,
+                "score": 0,
+                "date": None
+            },
+            "badges": [],
+            "certificates": [],
+            "total_time_spent": 0,
+            "last_active": datetime.now().isoformat(),
+            "current_level": 1,
+            "overall_progress": 0
+        }
+    
+    @staticmethod
+    def _progress_path(username: str) -> Path:
+        """File holding a user's progress for the configured JSON layout"""
+        if PROGRESS_LAYOUT == "sharded":
+            shard = hashlib.sha1(username.encode()).hexdigest()[:2]
+            return PROGRESS_SHARD_DIR / shard / f"{quote(username, safe='')}.json"
+        return PROGRESS_FILE
+    
+    @staticmethod
+    def _read_many_progress(usernames: List[str]) -> Dict[str, Dict]:
+        """Progress records that exist for the given users (missing users are omitted)"""
+        if PROGRESS_LAYOUT == "sharded":
+            found = {}
+            for username in usernames:
+                user_progress = DataManager._load_json(DataManager._progress_path(username))
+                if user_progress:
+                    found[username] = user_progress
+            return found
+        
+        progress_data = DataManager._load_json(PROGRESS_FILE)
+        return {username: progress_data[username] for username in usernames if username in progress_data}
+    
+    @staticmethod
+    @contextmanager
+    def _progress_txn(username: str):
+        """Lock and load one user's progress (creating it if missing), save it back if modified"""
+        path = DataManager._progress_path(username)
+        if PROGRESS_LAYOUT == "sharded":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with DataManager._locked(path):
+            if PROGRESS_LAYOUT == "sharded":
+                document = None
+                user_progress = DataManager._load_json(path) or None
+            else:
+                document = DataManager._load_json(PROGRESS_FILE)
+                user_progress = document.get(username)
+            
+            before = None
+            if user_progress is None:
+                user_progress = DataManager._new_progress()
+            else:
+                before = pickle.dumps(user_progress, pickle.HIGHEST_PROTOCOL)
+            
+            yield user_progress
+            
+            # Only rewrite when something actually changed
+            if before is not None and pickle.dumps(user_progress, pickle.HIGHEST_PROTOCOL) == before:
+                return
+            if document is None:
+                DataManager._save_json(path, user_progress)
+            else:
+                document[username] = user_progress
+                DataManager._save_json(PROGRESS_FILE, document)
+    
     @staticmethod
     def init_user_progress(username: str):
         """Initialize progress tracking for a new user"""
-        progress = DataManager._load_json(PROGRESS_FILE)
-        
-        if username not in progress:
-            progress[username] = {
-                "initial_quiz": {
-                    "completed": False,
-                    "score": 0,
-                    "total": 18,
-                    "weak_topics": [],
-                    "strong_topics": [],
-                    "date": None
-                },
-                "lessons": {},
-                "lesson_quizzes": {},
-                "practice_problems": {},
-                "final_test": {
-                    "completed": False,
-                    "score": 0,
-                    "date": None
-                },
-                "badges": [],
-                "certificates": [],
-                "total_time_spent": 0,
-                "last_active": datetime.now().isoformat(),
-                "current_level": 1,
-                "overall_progress": 0
-            }
-            DataManager._save_json(PROGRESS_FILE, progress)
+        DataManager._progress_changing(username)
+        
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.init_user_progress(username)
+        
+        with DataManager._progress_txn(username):
+            pass
+    
+    @staticmethod
+    @contextmanager
+    def rerun_scope():
+        """
+        Share one progress snapshot per user across everything rendered in a rerun
+        (sidebar, page, ML features). Progress writes drop the writer's snapshot.
+        Yields the counters for this rerun.
+        """
+        counters = {"loads": 0, "snapshot_hits": 0}
+        _rerun_state.snapshots = {}
+        _rerun_state.counters = counters
+        try:
+            yield counters
+        finally:
+            _rerun_state.snapshots = None
+            _rerun_state.counters = None
+            PROGRESS_LOAD_STATS["reruns"] += 1
+            if PROGRESS_DEBUG and (counters["loads"] or counters["snapshot_hits"]):
+                print(f"📊 Rerun progress loads: {counters['loads']} from store, {counters['snapshot_hits']} from snapshot")
+    
+    @staticmethod
+    def _progress_changing(username: str):
+        """Drop a user's rerun snapshot and bump their change counter before their progress is written"""
+        snapshots = getattr(_rerun_state, "snapshots", None)
+        if snapshots:
+            snapshots.pop(username, None)
+        with _progress_versions_lock:
+            _progress_versions[username] = _progress_versions.get(username, 0) + 1
+    
+    @staticmethod
+    def progress_version(username: str) -> int:
+        """Counter bumped on every progress write made by this process"""
+        return _progress_versions.get(username, 0)
     
     @staticmethod
     def get_user_progress(username: str) -> Dict:
-        """Get user progress data"""
+        """Get user progress data (served from the rerun snapshot when one is active)"""
+        snapshots = getattr(_rerun_state, "snapshots", None)
+        if snapshots is not None and username in snapshots:
+            PROGRESS_LOAD_STATS["snapshot_hits"] += 1
+            _rerun_state.counters["snapshot_hits"] += 1
+            # Fresh copy per caller, like the JSON cache
+            return DataManager._with_pending_attempts(username, pickle.loads(snapshots[username]))
+        
+        user_progress = DataManager._load_user_progress(username)
+        PROGRESS_LOAD_STATS["loads"] += 1
+        if snapshots is not None:
+            _rerun_state.counters["loads"] += 1
+            snapshots[username] = pickle.dumps(user_progress, pickle.HIGHEST_PROTOCOL)
+        return DataManager._with_pending_attempts(username, user_progress)
+    
+    @staticmethod
+    def _load_user_progress(username: str) -> Dict:
+        """Load user progress from the configured store"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.get_user_progress(username)
+        
         # Use Supabase if available
         if USE_SUPABASE:
             try:
@@ -189,172 +537,474 @@ class DataManager:
                 raise
         
         # JSON fallback
-        progress_data = DataManager._load_json(PROGRESS_FILE)
-        if username not in progress_data:
-            DataManager.init_user_progress(username)
-            progress_data = DataManager._load_json(PROGRESS_FILE)
+        user_progress = DataManager._read_many_progress([username]).get(username)
+        if user_progress is None:
+            with DataManager._progress_txn(username) as user_progress:
+                pass
         
-        user_progress = progress_data.get(username, {})
         print(f"📖 Reading progress for {username}: Overall={user_progress.get('overall_progress', 0)}%, Quiz={user_progress.get('initial_quiz', {}).get('completed', False)}")
         return user_progress
     
     @staticmethod
-    def update_progress(username: str, category: str, data: Dict):
-        """Update specific category of user progress"""
-        progress = DataManager._load_json(PROGRESS_FILE)
-        if username not in progress:
-            DataManager.init_user_progress(username)
-            progress = DataManager._load_json(PROGRESS_FILE)
+    def get_many_progress(usernames: List[str]) -> Dict[str, Dict]:
+        """Get progress for several users at once (one query / one file parse)"""
+        progress_by_user = DataManager._load_many_progress(usernames)
+        for username, user_progress in progress_by_user.items():
+            DataManager._with_pending_attempts(username, user_progress)
+        return progress_by_user
+    
+    @staticmethod
+    def iter_progress(usernames: List[str], chunk_size: int = 500):
+        """Yield {username: progress} for consecutive chunks of users, for jobs that scan everyone"""
+        # The single JSON file is parsed once for the whole scan, not once per chunk
+        document = None
+        if not USE_SQLITE and not USE_SUPABASE and PROGRESS_LAYOUT == "single":
+            document = DataManager._load_json(PROGRESS_FILE)
+        
+        for start in range(0, len(usernames), chunk_size):
+            chunk = usernames[start:start + chunk_size]
+            if document is None:
+                yield DataManager.get_many_progress(chunk)
+                continue
+            yield {
+                username: DataManager._with_pending_attempts(username, document.get(username) or DataManager._new_progress())
+                for username in chunk
+            }
+    
+    @staticmethod
+    def _load_many_progress(usernames: List[str]) -> Dict[str, Dict]:
+        """Load several users' progress from the configured store"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.get_many_progress(usernames)
+        
+        # Use Supabase if available
+        if USE_SUPABASE:
+            try:
+                return SupabaseDataManager.get_many_progress(usernames)
+            except Exception as e:
+                print(f"❌ Supabase get_many_progress failed: {e}")
+                raise
+        
+        # JSON fallback
+        progress_data = DataManager._read_many_progress(usernames)
+        for username in usernames:
+            if username not in progress_data:
+                with DataManager._progress_txn(username) as user_progress:
+                    progress_data[username] = user_progress
+        
+        return {username: progress_data[username] for username in usernames}
+    
+    @staticmethod
+    def update_progress(username: str, category: str, data: Dict) -> bool:
+        """
+        Update specific category of user progress. Returns whether the store took the write
+        (False for an unregistered user on SQLite/Supabase); store errors are raised.
+        """
+        DataManager._progress_changing(username)
+        
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.update_progress(username, category, data)
+        
+        # Use Supabase if available
+        if USE_SUPABASE:
+            try:
+                return SupabaseDataManager.update_progress(username, category, data)
+            except Exception as e:
+                print(f"❌ Supabase update failed: {e}")
+                # Don't fall back - a JSON copy would silently diverge from the database
+                raise
         
-        if category in progress[username]:
-            progress[username][category].update(data)
+        with DataManager._progress_txn(username) as user_progress:
+            if category in user_progress:
+                ProgressEngine.merge(user_progress, category, data)
+            else:
+                ProgressEngine.replace(user_progress, category, data)
+            
+            user_progress["last_active"] = datetime.now().isoformat()
+        return True
+    
+    # --- Practice Attempt Buffer ---
+    
+    @staticmethod
+    def _apply_attempt(practice: Dict, problem_id: str, correct: bool, date: Optional[str] = None) -> Dict:
+        """Fold one attempt into a practice_problems dict, returning the problem's entry"""
+        entry = practice.setdefault(problem_id, {
+            "attempts": 0,
+            "correct": 0,
+            "incorrect": 0,
+            "needs_review": False
+        })
+        
+        entry["attempts"] = entry.get("attempts", 0) + 1
+        
+        if correct:
+            entry["correct"] = entry.get("correct", 0) + 1
+            entry["needs_review"] = False
         else:
-            progress[username][category] = data
+            entry["incorrect"] = entry.get("incorrect", 0) + 1
+            # Mark for review after 3 incorrect attempts
+            if entry["incorrect"] >= 3:
+                entry["needs_review"] = True
         
-        progress[username]["last_active"] = datetime.now().isoformat()
-        DataManager._save_json(PROGRESS_FILE, progress)
+        # Each answer is an SM-2 review of the problem
+        quality = spaced_repetition.QUALITY_CORRECT if correct else spaced_repetition.QUALITY_INCORRECT
+        spaced_repetition.sm2_review(entry, quality, datetime.fromisoformat(date) if date else None)
+        
+        return entry
+    
+    @staticmethod
+    def _journal_path(username: str, owner: Optional[str] = None) -> Path:
+        """Append-only journal of a user's buffered attempts (this process's unless owner is given)"""
+        return ATTEMPT_JOURNAL_DIR / f"{quote(username, safe='')}@{owner or _journal_owner}.jsonl"
+    
+    @staticmethod
+    def _journal_lock(username: str) -> Path:
+        """Path whose lock (see _locked) serializes changes to a user's journals across processes"""
+        return ATTEMPT_JOURNAL_DIR / quote(username, safe='')
+    
+    @staticmethod
+    def _lock_journal(handle, blocking: bool = True) -> bool:
+        """Exclusively lock an open journal; False if another process holds it (only when not blocking)"""
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            if blocking:
+                raise
+            return False
+        return True
+    
+    @staticmethod
+    def _own_journal(username: str):
+        """This process's journal for a user, created and locked on first use (call with the journal lock held)"""
+        handle = _owned_journals.get(username)
+        if handle is None:
+            handle = open(DataManager._journal_path(username), 'a')
+            DataManager._lock_journal(handle)
+            _owned_journals[username] = handle
+        return handle
+    
+    @staticmethod
+    def _release_journal(username: str):
+        """Remove this process's journal for a user once the store has its attempts"""
+        handle = _owned_journals.pop(username, None)
+        if handle is not None:
+            # Removed before unlocking, so no other process sees it unowned
+            DataManager._journal_path(username).unlink(missing_ok=True)
+            handle.close()
+    
+    @staticmethod
+    def _replay_journal(username: str):
+        """
+        Re-buffer attempts journaled by processes that died before flushing (call with the
+        journal lock held). Journals whose owner is still running are locked and left alone.
+        """
+        if username in _replayed_journals:
+            return
+        _replayed_journals.add(username)
+        
+        if not ATTEMPT_JOURNAL_DIR.exists():
+            return
+        
+        own = DataManager._journal_path(username)
+        for path in sorted(ATTEMPT_JOURNAL_DIR.glob(f"{quote(username, safe='')}@*.jsonl")):
+            if path == own:
+                continue
+            with open(path, 'r+') as orphan:
+                if not DataManager._lock_journal(orphan, blocking=False):
+                    continue  # Its owner is alive and will flush it
+                
+                lines, events = [], []
+                for line in orphan.read().splitlines():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line from a crash mid-write
+                    lines.append(line)
+                    events.append((record["problem_id"], record["correct"], record.get("date")))
+                
+                if events:
+                    print(f"♻️ Replaying {len(events)} journaled practice attempts for {username}")
+                    # Taken over into this process's journal before the orphan goes
+                    journal = DataManager._own_journal(username)
+                    journal.write("".join(line + "\n" for line in lines))
+                    journal.flush()
+                    with _pending_attempts_lock:
+                        pending = _pending_attempts.setdefault(username, {"events": [], "since": 0.0})
+                        pending["events"][:0] = events
+                        pending["since"] = 0.0  # Due immediately
+                path.unlink()
+    
+    @staticmethod
+    def _with_pending_attempts(username: str, user_progress: Dict) -> Dict:
+        """Apply attempts that are still buffered so reads see them"""
+        with _pending_attempts_lock:
+            pending = _pending_attempts.get(username)
+            events = list(pending["events"]) if pending else []
+        
+        if events:
+            practice = user_progress.get("practice_problems")
+            practice = practice if isinstance(practice, dict) else {}
+            changed = {}
+            for problem_id, correct, date in events:
+                if problem_id not in changed and problem_id in practice:
+                    changed[problem_id] = dict(practice[problem_id])
+                DataManager._apply_attempt(changed, problem_id, correct, date)
+            # Through the engine, so counters, topic index and due-queue include them
+            ProgressEngine.merge(user_progress, "practice_problems", changed)
+        return user_progress
+    
+    @staticmethod
+    def record_attempt(username: str, problem_id: str, correct: bool) -> Dict:
+        """Buffer a practice attempt (journaled first) and return the problem's updated stats"""
+        ATTEMPT_JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+        
+        with DataManager._locked(DataManager._journal_lock(username)):
+            DataManager._replay_journal(username)
+            attempt = {
+                "problem_id": problem_id,
+                "correct": correct,
+                "date": datetime.now().isoformat()
+            }
+            journal = DataManager._own_journal(username)
+            journal.write(json.dumps(attempt) + "\n")
+            journal.flush()
+            EventStore.append(username, "attempt", **attempt)
+            
+            with _pending_attempts_lock:
+                pending = _pending_attempts.setdefault(username, {"events": [], "since": time.monotonic()})
+                pending["events"].append((problem_id, correct, attempt["date"]))
+            # Reads include it from now on (snapshots are raw records, so they stay valid)
+            with _progress_versions_lock:
+                _progress_versions[username] = _progress_versions.get(username, 0) + 1
+        
+        DataManager.flush_attempts(username, only_if_due=True)
+        
+        return DataManager.get_user_progress(username)["practice_problems"][problem_id]
+    
+    @staticmethod
+    def _buffered_users() -> List[str]:
+        """Users with buffered attempts in memory or a journal on disk (any process's)"""
+        with _pending_attempts_lock:
+            usernames = set(_pending_attempts)
+        if ATTEMPT_JOURNAL_DIR.exists():
+            usernames.update(unquote(path.stem.rpartition("@")[0]) for path in ATTEMPT_JOURNAL_DIR.glob("*@*.jsonl"))
+        return sorted(usernames)
+    
+    @staticmethod
+    def flush_attempts(username: Optional[str] = None, only_if_due: bool = False) -> int:
+        """
+        Write buffered attempts into progress (all users if no username, including journals
+        of dead processes); returns how many were written
+        """
+        if username is None:
+            return sum(DataManager.flush_attempts(name, only_if_due) for name in DataManager._buffered_users())
+        
+        with _pending_attempts_lock:
+            buffered = username in _pending_attempts
+        if not buffered and (username in _replayed_journals or not ATTEMPT_JOURNAL_DIR.exists()):
+            return 0  # Nothing buffered and no journal left to replay (data/attempts may not exist yet)
+        
+        with DataManager._locked(DataManager._journal_lock(username)):
+            DataManager._replay_journal(username)
+            
+            with _pending_attempts_lock:
+                pending = _pending_attempts.get(username)
+                if not pending:
+                    return 0
+                if only_if_due and len(pending["events"]) < ATTEMPT_FLUSH_EVERY \
+                        and time.monotonic() - pending["since"] < ATTEMPT_FLUSH_SECONDS:
+                    return 0
+                events = _pending_attempts.pop(username)["events"]
+            
+            try:
+                practice = DataManager._load_user_progress(username).get("practice_problems", {})
+                changed = {}
+                for problem_id, correct, date in events:
+                    changed[problem_id] = DataManager._apply_attempt(practice, problem_id, correct, date)
+                if not DataManager.update_progress(username, 'practice_problems', changed):
+                    raise RuntimeError("the store did not take the write")
+            except Exception as e:
+                print(f"❌ Could not flush practice attempts for {username}: {e}")
+                # Keep them buffered and journaled for the next flush - the journal is
+                # only removed once the store has confirmed the write
+                with _pending_attempts_lock:
+                    pending = _pending_attempts.setdefault(username, {"events": [], "since": 0.0})
+                    pending["events"][:0] = events
+                    pending["since"] = 0.0
+                return 0
+            
+            DataManager._release_journal(username)
+        
+        print(f"💾 Flushed {len(events)} practice attempts for {username}")
+        return len(events)
+    
+    @staticmethod
+    def _flush_own_attempts():
+        """Flush the attempts this process buffered - other processes' journals are theirs to flush"""
+        with _pending_attempts_lock:
+            usernames = sorted(_pending_attempts)
+        for username in usernames:
+            DataManager.flush_attempts(username)
     
     @staticmethod
     def save_quiz_results(username: str, quiz_type: str, score: int, total: int, 
-                         weak_topics: List[str], strong_topics: List[str]):
+                         weak_topics: List[str], strong_topics: List[str]) -> bool:
         """Save quiz results"""
+        DataManager._progress_changing(username)
+        saved = DataManager._store_quiz_results(username, quiz_type, score, total, weak_topics, strong_topics)
+        # Only writes the store confirmed go into the event log
+        if saved:
+            EventStore.append(username, "quiz_submitted", quiz_type=quiz_type, score=score, total=total,
+                              weak_topics=weak_topics, strong_topics=strong_topics)
+        return saved
+    
+    @staticmethod
+    def _store_quiz_results(username: str, quiz_type: str, score: int, total: int,
+                            weak_topics: List[str], strong_topics: List[str]) -> bool:
+        """Write quiz results to the configured store"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.save_quiz_results(username, quiz_type, score, total, weak_topics, strong_topics)
+        
         # Use Supabase if available
         if USE_SUPABASE:
             try:
                 print(f"💾 Attempting Supabase save: {username} - {quiz_type}")
-                SupabaseDataManager.save_quiz_results(username, quiz_type, score, total, weak_topics, strong_topics)
-                print(f"✅ Saved to Supabase: {username} - {quiz_type}")
-                return  # Success, don't fall back to JSON
+                saved = SupabaseDataManager.save_quiz_results(username, quiz_type, score, total, weak_topics, strong_topics)
+                if saved:
+                    print(f"✅ Saved to Supabase: {username} - {quiz_type}")
+                return saved
             except Exception as e:
                 print(f"❌ Supabase save failed: {e}")
+                raise
         
-        # JSON fallback (always save to JSON too for safety)
-        progress = DataManager._load_json(PROGRESS_FILE)
-        if username not in progress:
-            DataManager.init_user_progress(username)
-            progress = DataManager._load_json(PROGRESS_FILE)
-        
-        quiz_data = {
-            "completed": True,
-            "score": score,
-            "total": total,
-            "weak_topics": weak_topics,
-            "strong_topics": strong_topics,
-            "date": datetime.now().isoformat()
-        }
-        
-        if quiz_type == "initial":
-            progress[username]["initial_quiz"] = quiz_data
-        else:
-            progress[username]["lesson_quizzes"][quiz_type] = quiz_data
-        
-        # Update overall progress
-        quiz_completed = progress[username].get("initial_quiz", {}).get("completed", False)
-        lessons_completed = len([l for l in progress[username].get("lessons", {}).values() if l.get("completed")])
-        practice_done = len(progress[username].get("practice_problems", {}))
-        
-        # Calculate overall progress (quiz 20%, lessons 60%, practice 20%)
-        overall = 0
-        if quiz_completed:
-            overall += 20
-        overall += (lessons_completed / 6) * 60 if lessons_completed > 0 else 0
-        overall += (practice_done / 10) * 20 if practice_done > 0 else 0
-        
-        progress[username]["overall_progress"] = int(overall)
-        print(f"📊 Quiz Progress Update: Quiz={quiz_completed}, Lessons={lessons_completed}/6, Practice={practice_done}/10 → Overall={int(overall)}%")
+        # JSON fallback
+        with DataManager._progress_txn(username) as user_progress:
+            quiz_data = {
+                "completed": True,
+                "score": score,
+                "total": total,
+                "weak_topics": weak_topics,
+                "strong_topics": strong_topics,
+                "date": datetime.now().isoformat()
+            }
+            
+            # ProgressEngine keeps the section counters and overall progress current
+            if quiz_type == "initial":
+                ProgressEngine.replace(user_progress, "initial_quiz", quiz_data)
+            else:
+                ProgressEngine.merge(user_progress, "lesson_quizzes", {quiz_type: quiz_data})
+            
+            print(f"📊 Quiz Progress Update: {ProgressEngine.describe(user_progress)}")
         
-        DataManager._save_json(PROGRESS_FILE, progress)
         print(f"✅ Saved to JSON: {username} - Quiz completed: {quiz_data['completed']}")
+        return True
     
     @staticmethod
-    def save_lesson_progress(username: str, lesson_id: str, completed: bool, time_spent: int):
+    def save_lesson_progress(username: str, lesson_id: str, completed: bool, time_spent: int) -> bool:
         """Save lesson completion progress"""
+        DataManager._progress_changing(username)
+        saved = DataManager._store_lesson_progress(username, lesson_id, completed, time_spent)
+        if saved:
+            EventStore.append(username, "lesson_completed" if completed else "lesson_started",
+                              lesson_id=lesson_id, time_spent=time_spent)
+        return saved
+    
+    @staticmethod
+    def _store_lesson_progress(username: str, lesson_id: str, completed: bool, time_spent: int) -> bool:
+        """Write lesson progress to the configured store"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.save_lesson_progress(username, lesson_id, completed, time_spent)
+        
         # Use Supabase if available
         if USE_SUPABASE:
             try:
                 print(f"💾 Attempting Supabase lesson save: {username} - {lesson_id}")
-                SupabaseDataManager.save_lesson_progress(username, lesson_id, completed, time_spent)
-                print(f"✅ Saved to Supabase: {username} - Lesson {lesson_id}")
-                return  # Success, don't fall back to JSON
+                saved = SupabaseDataManager.save_lesson_progress(username, lesson_id, completed, time_spent)
+                if saved:
+                    print(f"✅ Saved to Supabase: {username} - Lesson {lesson_id}")
+                return saved
             except Exception as e:
                 print(f"❌ Supabase lesson save failed: {e}")
+                raise
         
-        # JSON fallback (always save to JSON too for safety)
-        progress = DataManager._load_json(PROGRESS_FILE)
-        if username not in progress:
-            DataManager.init_user_progress(username)
-            progress = DataManager._load_json(PROGRESS_FILE)
-        
-        progress[username]["lessons"][lesson_id] = {
-            "completed": completed,
-            "time_spent": time_spent,
-            "date": datetime.now().isoformat()
-        }
-        
-        progress[username]["total_time_spent"] += time_spent
-        
-        # Update overall progress
-        quiz_completed = progress[username].get("initial_quiz", {}).get("completed", False)
-        lessons_completed = len([l for l in progress[username].get("lessons", {}).values() if l.get("completed")])
-        practice_done = len(progress[username].get("practice_problems", {}))
-        
-        # Calculate overall progress (quiz 20%, lessons 60%, practice 20%)
-        overall = 0
-        if quiz_completed:
-            overall += 20
-        overall += (lessons_completed / 6) * 60 if lessons_completed > 0 else 0
-        overall += (practice_done / 10) * 20 if practice_done > 0 else 0
-        
-        progress[username]["overall_progress"] = int(overall)
-        print(f"📊 Progress Update: Quiz={quiz_completed}, Lessons={lessons_completed}/6, Practice={practice_done}/10 → Overall={int(overall)}%")
-        
-        DataManager._save_json(PROGRESS_FILE, progress)
+        # JSON fallback
+        with DataManager._progress_txn(username) as user_progress:
+            ProgressEngine.merge(user_progress, "lessons", {lesson_id: {
+                "completed": completed,
+                "time_spent": time_spent,
+                "date": datetime.now().isoformat()
+            }})
+            
+            user_progress["total_time_spent"] += time_spent
+            print(f"📊 Progress Update: {ProgressEngine.describe(user_progress)}")
+        return True
     
     @staticmethod
-    def award_badge(username: str, badge_name: str, badge_description: str):
+    def award_badge(username: str, badge_name: str, badge_description: str) -> bool:
         """Award a badge to user"""
+        # Already earned? Checked on the progress this rerun has loaded, before the write drops it
+        earned_badge_names = [b.get('name') for b in DataManager.get_user_progress(username).get("badges", [])]
+        DataManager._progress_changing(username)
+        
+        # Use SQLite if configured
+        if USE_SQLITE:
+            saved = SQLiteDataManager.award_badge(username, badge_name, badge_description)
+        
         # Use Supabase if available
-        if USE_SUPABASE:
+        elif USE_SUPABASE:
             try:
-                SupabaseDataManager.award_badge(username, badge_name, badge_description)
-                print(f"✅ Saved to Supabase: {username} - Badge: {badge_name}")
+                saved = SupabaseDataManager.award_badge(username, badge_name, badge_description)
+                if saved:
+                    print(f"✅ Saved to Supabase: {username} - Badge: {badge_name}")
             except Exception as e:
-                print(f"⚠️ Supabase save failed: {e}, falling back to JSON")
+                print(f"❌ Supabase badge save failed: {e}")
+                raise
         
-        # JSON fallback (always save to JSON too for safety)
-        progress = DataManager._load_json(PROGRESS_FILE)
-        if username not in progress:
-            DataManager.init_user_progress(username)
-            progress = DataManager._load_json(PROGRESS_FILE)
-        
-        # Check if badge already exists by name
-        earned_badge_names = [b.get('name') for b in progress[username].get("badges", [])]
-        if badge_name not in earned_badge_names:
-            badge = {
-                "name": badge_name,
-                "description": badge_description,
-                "date": datetime.now().isoformat()
-            }
-            progress[username]["badges"].append(badge)
-            DataManager._save_json(PROGRESS_FILE, progress)
+        # JSON fallback
+        else:
+            with DataManager._progress_txn(username) as user_progress:
+                # Check if badge already exists by name
+                earned_badge_names = [b.get('name') for b in user_progress.get("badges", [])]
+                if badge_name not in earned_badge_names:
+                    badge = {
+                        "name": badge_name,
+                        "description": badge_description,
+                        "date": datetime.now().isoformat()
+                    }
+                    user_progress["badges"].append(badge)
+            saved = True
+        
+        if saved and badge_name not in earned_badge_names:
+            EventStore.append(username, "badge_awarded", name=badge_name, description=badge_description)
+        return saved
     
     @staticmethod
-    def award_certificate(username: str, cert_name: str, cert_description: str):
+    def award_certificate(username: str, cert_name: str, cert_description: str) -> bool:
         """Award a certificate to user"""
-        progress = DataManager._load_json(PROGRESS_FILE)
-        if username not in progress:
-            DataManager.init_user_progress(username)
-            progress = DataManager._load_json(PROGRESS_FILE)
+        DataManager._progress_changing(username)
         
-        cert = {
-            "name": cert_name,
-            "description": cert_description,
-            "date": datetime.now().isoformat()
-        }
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.award_certificate(username, cert_name, cert_description)
         
-        if cert not in progress[username]["certificates"]:
-            progress[username]["certificates"].append(cert)
-            DataManager._save_json(PROGRESS_FILE, progress)
+        with DataManager._progress_txn(username) as user_progress:
+            cert = {
+                "name": cert_name,
+                "description": cert_description,
+                "date": datetime.now().isoformat()
+            }
+            
+            if cert not in user_progress["certificates"]:
+                user_progress["certificates"].append(cert)
+        return True
     
     @staticmethod
     def link_student_to_teacher(student_username: str, teacher_code: str) -> tuple:
@@ -362,6 +1012,10 @@ class DataManager:
         Link a student to a teacher's class using teacher code
         Returns: (success: bool, message: str)
         """
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.link_student_to_teacher(student_username, teacher_code)
+        
         # Try Supabase first
         if USE_SUPABASE:
             try:
@@ -370,42 +1024,43 @@ class DataManager:
                 print(f"⚠️ Supabase link failed, falling back to JSON: {e}")
         
         # JSON fallback
-        users = DataManager._load_json(USERS_FILE)
-        
-        # Check if student exists
-        if student_username not in users:
-            return False, "Student account not found"
-        
-        # Find teacher with this code
-        teacher_username = None
-        for username, user_data in users.items():
-            if user_data.get('teacher_code') == teacher_code:
-                teacher_username = username
-                break
-        
-        if not teacher_username:
-            return False, f"Teacher with code '{teacher_code}' not found"
-        
-        # Add teacher code to student's list
-        if 'teacher_codes' not in users[student_username]:
-            users[student_username]['teacher_codes'] = []
-        
-        if teacher_code in users[student_username]['teacher_codes']:
-            return False, "Already enrolled in this class"
-        
-        users[student_username]['teacher_codes'].append(teacher_code)
-        
-        # Add student to teacher's class list (if field exists)
-        if 'students' not in users[teacher_username]:
-            users[teacher_username]['students'] = []
-        
-        if student_username not in users[teacher_username]['students']:
-            users[teacher_username]['students'].append(student_username)
-        
-        DataManager._save_json(USERS_FILE, users)
-        print(f"✅ Linked {student_username} to teacher {teacher_username} (code: {teacher_code})")
-        
-        return True, f"Successfully joined {teacher_username}'s class!"
+        with DataManager._locked(USERS_FILE):
+            users = DataManager._load_json(USERS_FILE)
+            
+            # Check if student exists
+            if student_username not in users:
+                return False, "Student account not found"
+            
+            # Find teacher with this code
+            teacher_username = None
+            for username, user_data in users.items():
+                if user_data.get('teacher_code') == teacher_code:
+                    teacher_username = username
+                    break
+            
+            if not teacher_username:
+                return False, f"Teacher with code '{teacher_code}' not found"
+            
+            # Add teacher code to student's list
+            if 'teacher_codes' not in users[student_username]:
+                users[student_username]['teacher_codes'] = []
+            
+            if teacher_code in users[student_username]['teacher_codes']:
+                return False, "Already enrolled in this class"
+            
+            users[student_username]['teacher_codes'].append(teacher_code)
+            
+            # Add student to teacher's class list (if field exists)
+            if 'students' not in users[teacher_username]:
+                users[teacher_username]['students'] = []
+            
+            if student_username not in users[teacher_username]['students']:
+                users[teacher_username]['students'].append(student_username)
+            
+            DataManager._save_json(USERS_FILE, users)
+            print(f"✅ Linked {student_username} to teacher {teacher_username} (code: {teacher_code})")
+            
+            return True, f"Successfully joined {teacher_username}'s class!"
     
     @staticmethod
     def link_parent_to_child(parent_username: str, child_share_code: str) -> tuple:
@@ -413,6 +1068,10 @@ class DataManager:
         Link a parent to their child's account using share code
         Returns: (success: bool, message: str)
         """
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.link_parent_to_child(parent_username, child_share_code)
+        
         # Try Supabase first
         if USE_SUPABASE:
             try:
@@ -421,46 +1080,51 @@ class DataManager:
                 print(f"⚠️ Supabase link failed, falling back to JSON: {e}")
         
         # JSON fallback
-        users = DataManager._load_json(USERS_FILE)
-        
-        # Check if parent exists
-        if parent_username not in users:
-            return False, "Parent account not found"
-        
-        # Find child with this share code
-        child_username = None
-        for username, user_data in users.items():
-            if user_data.get('share_code') == child_share_code:
-                child_username = username
-                break
-        
-        if not child_username:
-            return False, f"Student with share code '{child_share_code}' not found"
-        
-        # Add child to parent's list
-        if 'children' not in users[parent_username]:
-            users[parent_username]['children'] = []
-        
-        if child_username in users[parent_username]['children']:
-            return False, "Child already linked"
-        
-        users[parent_username]['children'].append(child_username)
-        
-        # Add parent code to child's list
-        if 'parent_codes' not in users[child_username]:
-            users[child_username]['parent_codes'] = []
-        
-        if parent_username not in users[child_username]['parent_codes']:
-            users[child_username]['parent_codes'].append(parent_username)
-        
-        DataManager._save_json(USERS_FILE, users)
-        print(f"✅ Linked {parent_username} to child {child_username} (code: {child_share_code})")
-        
-        return True, f"Successfully linked to {child_username}!"
+        with DataManager._locked(USERS_FILE):
+            users = DataManager._load_json(USERS_FILE)
+            
+            # Check if parent exists
+            if parent_username not in users:
+                return False, "Parent account not found"
+            
+            # Find child with this share code
+            child_username = None
+            for username, user_data in users.items():
+                if user_data.get('share_code') == child_share_code:
+                    child_username = username
+                    break
+            
+            if not child_username:
+                return False, f"Student with share code '{child_share_code}' not found"
+            
+            # Add child to parent's list
+            if 'children' not in users[parent_username]:
+                users[parent_username]['children'] = []
+            
+            if child_username in users[parent_username]['children']:
+                return False, "Child already linked"
+            
+            users[parent_username]['children'].append(child_username)
+            
+            # Add parent code to child's list
+            if 'parent_codes' not in users[child_username]:
+                users[child_username]['parent_codes'] = []
+            
+            if parent_username not in users[child_username]['parent_codes']:
+                users[child_username]['parent_codes'].append(parent_username)
+            
+            DataManager._save_json(USERS_FILE, users)
+            print(f"✅ Linked {parent_username} to child {child_username} (code: {child_share_code})")
+            
+            return True, f"Successfully linked to {child_username}!"
     
     @staticmethod
     def get_teacher_students(teacher_username: str) -> List[str]:
         """Get list of students enrolled in teacher's class"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.get_teacher_students(teacher_username)
+        
         users = DataManager._load_json(USERS_FILE)
         teacher_data = users.get(teacher_username, {})
         return teacher_data.get('students', [])
@@ -468,12 +1132,27 @@ class DataManager:
     @staticmethod
     def get_all_students() -> List[str]:
         """Get list of all student usernames"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.get_all_students()
+        
+        # Use Supabase if available
+        if USE_SUPABASE:
+            try:
+                return SupabaseDataManager.get_all_students()
+            except Exception as e:
+                print(f"❌ Supabase get_all_students failed: {e}")
+        
         users = DataManager._load_json(USERS_FILE)
         return [username for username, data in users.items() if data["role"] == "Student"]
     
     @staticmethod
     def get_students_by_teacher_code(teacher_code: str) -> List[Dict]:
         """Get students who joined with a teacher's code"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.get_students_by_teacher_code(teacher_code)
+        
         # Try Supabase first
         if USE_SUPABASE:
             try:
@@ -481,40 +1160,51 @@ class DataManager:
             except Exception as e:
                 print(f"⚠️ Supabase query failed, falling back to JSON: {e}")
         
-        # JSON fallback
-        users = DataManager._load_json(USERS_FILE)
-        progress = DataManager._load_json(PROGRESS_FILE)
+        # JSON fallback - indexed roster, one progress parse for the whole class
+        roster = DataManager._get_roster_index().get(teacher_code, [])
+        if not roster:
+            return []
+        progress = DataManager._read_many_progress([entry["username"] for entry in roster])
         
         students = []
-        for username, user_data in users.items():
-            if user_data["role"] == "Student" and teacher_code in user_data.get("teacher_codes", []):
-                student_progress = progress.get(username, {})
-                students.append({
-                    "username": username,
-                    "email": user_data["email"],
-                    "progress": student_progress.get("overall_progress", 0),
-                    "last_active": student_progress.get("last_active", "Never")
-                })
+        for entry in roster:
+            student_progress = progress.get(entry["username"], {})
+            students.append({
+                "username": entry["username"],
+                "email": entry["email"],
+                "progress": student_progress.get("overall_progress", 0),
+                "last_active": student_progress.get("last_active", "Never")
+            })
         
         return students
     
     @staticmethod
     def get_children_by_parent_code(parent_share_codes: List[str]) -> List[Dict]:
         """Get children data for parent based on share codes"""
+        # Use SQLite if configured
+        if USE_SQLITE:
+            return SQLiteDataManager.get_children_by_parent_code(parent_share_codes)
+        
         users = DataManager._load_json(USERS_FILE)
-        progress = DataManager._load_json(PROGRESS_FILE)
+        matches = [username for username, user_data in users.items()
+                   if user_data["role"] == "Student" and user_data.get("share_code") in parent_share_codes]
+        progress = DataManager._read_many_progress(matches)
         
         children = []
-        for username, user_data in users.items():
-            if user_data["role"] == "Student" and user_data.get("share_code") in parent_share_codes:
-                student_progress = progress.get(username, {})
-                children.append({
-                    "username": username,
-                    "share_code": user_data.get("share_code"),
-                    "progress": student_progress.get("overall_progress", 0),
-                    "weak_topics": student_progress.get("initial_quiz", {}).get("weak_topics", []),
-                    "strong_topics": student_progress.get("initial_quiz", {}).get("strong_topics", []),
-                    "last_active": student_progress.get("last_active", "Never")
-                })
+        for username in matches:
+            user_data = users[username]
+            student_progress = progress.get(username, {})
+            children.append({
+                "username": username,
+                "share_code": user_data.get("share_code"),
+                "progress": student_progress.get("overall_progress", 0),
+                "weak_topics": student_progress.get("initial_quiz", {}).get("weak_topics", []),
+                "strong_topics": student_progress.get("initial_quiz", {}).get("strong_topics", []),
+                "last_active": student_progress.get("last_active", "Never")
+            })
         
         return children
+
+
+# Don't leave attempts only in the journal on a clean shutdown
+atexit.register(DataManager._flush_own_attempts)
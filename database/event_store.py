@@ -0,0 +1,194 @@
+"""
+Learning Event Log - Append-only history of progress changes
+One JSON line per event in data/events/<hash prefix>/<username>.jsonl, plus a per-user
+snapshot that folds in new events incrementally from the last applied byte offset
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+# EVENT_LOG=off disables recording (e.g. read-only or ephemeral disks)
+EVENT_LOG_ENABLED = os.getenv("EVENT_LOG", "on").lower() != "off"
+EVENTS_DIR = Path(__file__).parent.parent / "data" / "events"
+
+EVENT_TYPES = ("attempt", "lesson_started", "lesson_completed", "quiz_submitted", "badge_awarded")
+
+# Attempts kept verbatim in the snapshot for time-series features
+ATTEMPT_HISTORY_LIMIT = 200
+
+# username -> snapshot, kept in memory once loaded
+_snapshots: Dict[str, Dict] = {}
+_snapshot_lock = threading.Lock()
+
+
+def _user_dir(username: str) -> Path:
+    """Directory holding a user's log and snapshot"""
+    return EVENTS_DIR / hashlib.sha1(username.encode()).hexdigest()[:2]
+
+
+def _log_path(username: str) -> Path:
+    return _user_dir(username) / f"{quote(username, safe='')}.jsonl"
+
+
+def _snapshot_path(username: str) -> Path:
+    return _user_dir(username) / f"{quote(username, safe='')}.snapshot.json"
+
+
+class EventStore:
+    """Append-only event log with incrementally materialized per-user snapshots"""
+
+    @staticmethod
+    def append(username: str, event_type: str, **fields) -> Optional[Dict]:
+        """Record one event; a single O_APPEND write, so concurrent writers never interleave"""
+        if not EVENT_LOG_ENABLED:
+            return None
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        event = {"type": event_type, "date": fields.pop("date", None) or datetime.now().isoformat()}
+        event.update(fields)
+
+        path = _log_path(username)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        line = (json.dumps(event, separators=(',', ':')) + "\n").encode()
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        return event
+
+    @staticmethod
+    def read_events(username: str, offset: int = 0) -> Tuple[List[Dict], int]:
+        """Complete events after byte offset, and the offset just past the last one"""
+        path = _log_path(username)
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        # A line without its newline is still being written - leave it for next time
+        end = data.rfind(b"\n") + 1
+        events = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        return events, offset + end
+
+    @staticmethod
+    def _empty_snapshot() -> Dict:
+        return {
+            "offset": 0,
+            "event_count": 0,
+            "first_event": None,
+            "last_event": None,
+            "attempts": 0,
+            "correct": 0,
+            "attempt_history": [],
+            "daily": {},
+            "lessons_completed": {},
+            "quizzes": [],
+            "badges": [],
+        }
+
+    @staticmethod
+    def _apply_event(snapshot: Dict, event: Dict):
+        """Fold one event into a snapshot"""
+        date = event["date"]
+        day = date[:10]
+        daily = snapshot["daily"].setdefault(day, {"events": 0, "attempts": 0, "correct": 0, "time_spent": 0})
+        daily["events"] += 1
+
+        snapshot["event_count"] += 1
+        snapshot["first_event"] = snapshot["first_event"] or date
+        snapshot["last_event"] = date
+
+        event_type = event["type"]
+        if event_type == "attempt":
+            snapshot["attempts"] += 1
+            daily["attempts"] += 1
+            if event.get("correct"):
+                snapshot["correct"] += 1
+                daily["correct"] += 1
+            snapshot["attempt_history"].append(
+                {"problem_id": event.get("problem_id"), "correct": bool(event.get("correct")), "date": date}
+            )
+            del snapshot["attempt_history"][:-ATTEMPT_HISTORY_LIMIT]
+        elif event_type in ("lesson_started", "lesson_completed"):
+            daily["time_spent"] += event.get("time_spent", 0)
+            if event_type == "lesson_completed":
+                snapshot["lessons_completed"].setdefault(event.get("lesson_id"), date)
+        elif event_type == "quiz_submitted":
+            snapshot["quizzes"].append({
+                "quiz_type": event.get("quiz_type"),
+                "score": event.get("score", 0),
+                "total": event.get("total", 0),
+                "date": date
+            })
+        elif event_type == "badge_awarded":
+            if event.get("name") not in snapshot["badges"]:
+                snapshot["badges"].append(event.get("name"))
+
+    @staticmethod
+    def _load_snapshot(username: str) -> Dict:
+        """In-memory snapshot, falling back to the persisted one"""
+        snapshot = _snapshots.get(username)
+        if snapshot is None:
+            try:
+                with open(_snapshot_path(username), 'r') as f:
+                    snapshot = json.load(f)
+            except (FileNotFoundError, ValueError):
+                snapshot = EventStore._empty_snapshot()
+        return snapshot
+
+    @staticmethod
+    def _save_snapshot(username: str, snapshot: Dict):
+        """Persist a snapshot atomically (temp file + os.replace)"""
+        path = _snapshot_path(username)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def snapshot(username: str) -> Dict:
+        """Materialized history for a user, applying only events logged since the last call"""
+        with _snapshot_lock:
+            snapshot = EventStore._load_snapshot(username)
+            events, offset = EventStore.read_events(username, snapshot["offset"])
+            if events:
+                for event in events:
+                    EventStore._apply_event(snapshot, event)
+                snapshot["offset"] = offset
+                EventStore._save_snapshot(username, snapshot)
+            # Users with no history are not cached - a batch scan would otherwise keep one per student
+            if snapshot["event_count"]:
+                _snapshots[username] = snapshot
+            return copy.deepcopy(snapshot)
+
+    @staticmethod
+    def rebuild(username: str) -> Dict:
+        """Discard the snapshot and replay the whole log"""
+        with _snapshot_lock:
+            _snapshots[username] = EventStore._empty_snapshot()
+        return EventStore.snapshot(username)
+
+    @staticmethod
+    def active_days(username: str) -> List[str]:
+        """Sorted ISO dates (YYYY-MM-DD) with at least one event"""
+        return sorted(EventStore.snapshot(username)["daily"])
@@ -0,0 +1,86 @@
+"""
+ML Feature Store - Precomputed per-student ML features
+Written in bulk by score_students.py, read one row at a time by the dashboard pages.
+Each row records a fingerprint of the progress it was computed from, so pages can tell
+whether it still matches the student's current progress.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_STORE_PATH = Path(__file__).parent.parent / "data" / "ml_features.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    username TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    scored_at TEXT NOT NULL,
+    features TEXT NOT NULL
+)
+"""
+
+# One connection per thread (sqlite3 connections are not shareable across threads)
+_local = threading.local()
+
+
+def get_store_path() -> Path:
+    """Feature store location (override with ML_FEATURE_STORE)"""
+    return Path(os.getenv("ML_FEATURE_STORE", str(DEFAULT_STORE_PATH)))
+
+
+def _connection() -> sqlite3.Connection:
+    """This thread's connection, creating the store on first use"""
+    store_path = get_store_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == store_path:
+        return conn
+
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(store_path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(SCHEMA)
+    conn.commit()
+
+    _local.conn = conn
+    _local.path = store_path
+    return conn
+
+
+class FeatureStore:
+    """Key-value store of scored features, one row per student"""
+
+    @staticmethod
+    def get(username: str) -> Optional[Dict]:
+        """Stored row for a student ({fingerprint, scored_at, features}) or None"""
+        try:
+            row = _connection().execute(
+                "SELECT fingerprint, scored_at, features FROM features WHERE username = ?", (username,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not read ML features for {username}: {e}")
+            return None
+
+        if row is None:
+            return None
+        return {"fingerprint": row[0], "scored_at": row[1], "features": json.loads(row[2])}
+
+    @staticmethod
+    def put_many(rows: List[Tuple[str, str, str, Dict]]):
+        """Upsert (username, fingerprint, scored_at, features) rows in one transaction"""
+        conn = _connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO features (username, fingerprint, scored_at, features) VALUES (?, ?, ?, ?)",
+                [(username, fingerprint, scored_at, json.dumps(features, separators=(',', ':')))
+                 for username, fingerprint, scored_at, features in rows]
+            )
+
+    @staticmethod
+    def count() -> int:
+        """Number of students with stored features"""
+        return _connection().execute("SELECT COUNT(*) FROM features").fetchone()[0]
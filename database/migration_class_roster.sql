@@ -0,0 +1,25 @@
+-- Migration: Server-side class roster lookups
+-- Run this in Supabase SQL Editor
+
+-- Older rows stored teacher_codes/parent_codes as JSON-encoded strings
+-- ('["TEACH-1234"]') instead of JSONB arrays; convert them so containment works
+UPDATE users
+SET teacher_codes = (teacher_codes #>> '{}')::jsonb
+WHERE jsonb_typeof(teacher_codes) = 'string';
+
+UPDATE users
+SET parent_codes = (parent_codes #>> '{}')::jsonb
+WHERE jsonb_typeof(parent_codes) = 'string';
+
+-- GIN index so "teacher_codes @> '["CODE"]'" is an index lookup, not a table scan
+CREATE INDEX IF NOT EXISTS idx_users_teacher_codes ON users USING GIN (teacher_codes jsonb_path_ops);
+
+-- Code lookups used when linking students/parents
+CREATE INDEX IF NOT EXISTS idx_users_teacher_code ON users(teacher_code);
+CREATE INDEX IF NOT EXISTS idx_users_share_code ON users(share_code);
+
+-- Verify the change
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'users'
+AND indexname IN ('idx_users_teacher_codes', 'idx_users_teacher_code', 'idx_users_share_code');
@@ -0,0 +1,64 @@
+-- Migration: Field-level progress updates with optimistic concurrency
+-- Run this in Supabase SQL Editor
+
+-- Version counter bumped on every progress write
+ALTER TABLE progress
+ADD COLUMN IF NOT EXISTS version INTEGER DEFAULT 0;
+
+UPDATE progress SET version = 0 WHERE version IS NULL;
+
+-- Older rows stored each document as a JSON-encoded string inside JSONB;
+-- convert them to real objects/arrays so they can be merged server-side
+UPDATE progress SET initial_quiz = (initial_quiz #>> '{}')::jsonb WHERE jsonb_typeof(initial_quiz) = 'string';
+UPDATE progress SET lessons = (lessons #>> '{}')::jsonb WHERE jsonb_typeof(lessons) = 'string';
+UPDATE progress SET lesson_quizzes = (lesson_quizzes #>> '{}')::jsonb WHERE jsonb_typeof(lesson_quizzes) = 'string';
+UPDATE progress SET practice_problems = (practice_problems #>> '{}')::jsonb WHERE jsonb_typeof(practice_problems) = 'string';
+UPDATE progress SET final_test = (final_test #>> '{}')::jsonb WHERE jsonb_typeof(final_test) = 'string';
+UPDATE progress SET badges = (badges #>> '{}')::jsonb WHERE jsonb_typeof(badges) = 'string';
+UPDATE progress SET certificates = (certificates #>> '{}')::jsonb WHERE jsonb_typeof(certificates) = 'string';
+
+-- Apply a partial update to one user's progress row.
+--   p_set    : {column: value}          replaces whole columns
+--   p_merge  : {column: {key: value}}   shallow-merges keys into object columns
+--   p_append : {column: [items]}        appends items to array columns
+--   p_expected_version : only apply if the row is still at this version (NULL = always)
+-- Returns the new version, or NULL when the row changed underneath the caller.
+CREATE OR REPLACE FUNCTION patch_progress(
+    p_username TEXT,
+    p_set JSONB DEFAULT '{}'::jsonb,
+    p_merge JSONB DEFAULT '{}'::jsonb,
+    p_append JSONB DEFAULT '{}'::jsonb,
+    p_expected_version INTEGER DEFAULT NULL
+) RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    UPDATE progress SET
+        initial_quiz = (CASE WHEN p_set ? 'initial_quiz' THEN p_set->'initial_quiz' ELSE initial_quiz END)
+                       || COALESCE(p_merge->'initial_quiz', '{}'::jsonb),
+        lessons = (CASE WHEN p_set ? 'lessons' THEN p_set->'lessons' ELSE lessons END)
+                  || COALESCE(p_merge->'lessons', '{}'::jsonb),
+        lesson_quizzes = (CASE WHEN p_set ? 'lesson_quizzes' THEN p_set->'lesson_quizzes' ELSE lesson_quizzes END)
+                         || COALESCE(p_merge->'lesson_quizzes', '{}'::jsonb),
+        practice_problems = (CASE WHEN p_set ? 'practice_problems' THEN p_set->'practice_problems' ELSE practice_problems END)
+                            || COALESCE(p_merge->'practice_problems', '{}'::jsonb),
+        final_test = (CASE WHEN p_set ? 'final_test' THEN p_set->'final_test' ELSE final_test END)
+                     || COALESCE(p_merge->'final_test', '{}'::jsonb),
+        badges = (CASE WHEN p_set ? 'badges' THEN p_set->'badges' ELSE badges END)
+                 || COALESCE(p_append->'badges', '[]'::jsonb),
+        certificates = (CASE WHEN p_set ? 'certificates' THEN p_set->'certificates' ELSE certificates END)
+                       || COALESCE(p_append->'certificates', '[]'::jsonb),
+        total_time_spent = CASE WHEN p_set ? 'total_time_spent' THEN (p_set->>'total_time_spent')::integer ELSE total_time_spent END,
+        current_level = CASE WHEN p_set ? 'current_level' THEN (p_set->>'current_level')::integer ELSE current_level END,
+        overall_progress = CASE WHEN p_set ? 'overall_progress' THEN (p_set->>'overall_progress')::integer ELSE overall_progress END,
+        last_active = NOW(),
+        version = version + 1
+    WHERE username = p_username
+      AND (p_expected_version IS NULL OR version = p_expected_version)
+    RETURNING version;
+$$;
+
+-- Verify the change
+SELECT column_name, data_type, column_default
+FROM information_schema.columns
+WHERE table_name = 'progress'
+AND column_name = 'version';
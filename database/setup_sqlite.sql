@@ -0,0 +1,54 @@
+-- SQLite Database Schema for BrainyYack
+-- Mirrors setup_supabase.sql for single-node deployments (DATA_BACKEND=sqlite).
+-- Applied automatically by database/sqlite_manager.py on first connection.
+
+-- Users table (JSONB columns are stored as JSON text)
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    password TEXT NOT NULL,
+    email TEXT NOT NULL,
+    role TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    age_level TEXT,
+    grade TEXT,
+    share_code TEXT,
+    teacher_code TEXT,
+    parent_codes TEXT DEFAULT '[]',
+    teacher_codes TEXT DEFAULT '[]',
+    children TEXT DEFAULT '[]'
+);
+
+-- One row per (class, student) so rosters are an index lookup
+-- instead of scanning every student's teacher_codes list
+CREATE TABLE IF NOT EXISTS class_enrollments (
+    teacher_code TEXT NOT NULL,
+    username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+    PRIMARY KEY (teacher_code, username)
+);
+
+-- Progress table
+CREATE TABLE IF NOT EXISTS progress (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+    initial_quiz TEXT DEFAULT '{}',
+    lessons TEXT DEFAULT '{}',
+    lesson_quizzes TEXT DEFAULT '{}',
+    practice_problems TEXT DEFAULT '{}',
+    final_test TEXT DEFAULT '{}',
+    badges TEXT DEFAULT '[]',
+    certificates TEXT DEFAULT '[]',
+    total_time_spent INTEGER DEFAULT 0,
+    last_active TEXT,
+    current_level INTEGER DEFAULT 1,
+    overall_progress INTEGER DEFAULT 0,
+    -- Any other progress keys (streaks, review schedule, ...) as one JSON object
+    extra TEXT DEFAULT '{}'
+);
+
+-- Create indexes for better performance (username is indexed by its UNIQUE constraint)
+CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
+CREATE INDEX IF NOT EXISTS idx_users_share_code ON users(share_code);
+CREATE INDEX IF NOT EXISTS idx_users_teacher_code ON users(teacher_code);
+CREATE INDEX IF NOT EXISTS idx_class_enrollments_username ON class_enrollments(username);
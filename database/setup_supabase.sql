@@ -32,13 +32,18 @@ CREATE TABLE IF NOT EXISTS progress (
     total_time_spent INTEGER DEFAULT 0,
     last_active TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     current_level INTEGER DEFAULT 1,
-    overall_progress INTEGER DEFAULT 0
+    overall_progress INTEGER DEFAULT 0,
+    -- Bumped on every write; see migration_progress_patches.sql for patch_progress()
+    version INTEGER DEFAULT 0
 );
 
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
+CREATE INDEX IF NOT EXISTS idx_users_teacher_code ON users(teacher_code);
+CREATE INDEX IF NOT EXISTS idx_users_share_code ON users(share_code);
+CREATE INDEX IF NOT EXISTS idx_users_teacher_codes ON users USING GIN (teacher_codes jsonb_path_ops);
 CREATE INDEX IF NOT EXISTS idx_progress_username ON progress(username);
 
 -- Enable Row Level Security (RLS) - Optional but recommended
@@ -0,0 +1,550 @@
+"""
+SQLite Data Manager - Embedded single-node storage
+Same schema as Supabase (see setup_sqlite.sql) with real transactions and no network hop
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from progress_engine import ProgressEngine
+
+SCHEMA_FILE = Path(__file__).parent / "setup_sqlite.sql"
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "brainyyack.db"
+
+# Progress columns holding JSON documents
+PROGRESS_JSON_COLUMNS = {
+    "initial_quiz": {},
+    "lessons": {},
+    "lesson_quizzes": {},
+    "practice_problems": {},
+    "final_test": {},
+    "badges": [],
+    "certificates": [],
+}
+PROGRESS_SCALAR_COLUMNS = ["total_time_spent", "last_active", "current_level", "overall_progress"]
+USER_JSON_COLUMNS = ["parent_codes", "teacher_codes", "children"]
+
+# One connection per thread (sqlite3 connections are not shareable across threads)
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+
+def get_db_path() -> Path:
+    """Database file location (override with SQLITE_PATH)"""
+    return Path(os.getenv("SQLITE_PATH", str(DEFAULT_DB_PATH)))
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return this thread's connection, opening it (WAL mode) on first use"""
+    db_path = get_db_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == db_path:
+        return conn
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # isolation_level=None: we issue BEGIN/COMMIT ourselves in _transaction()
+    conn = sqlite3.connect(str(db_path), isolation_level=None, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+
+    with _schema_lock:
+        if db_path not in _schema_ready:
+            conn.executescript(SCHEMA_FILE.read_text())
+            _schema_ready.add(db_path)
+
+    _local.conn = conn
+    _local.path = db_path
+    return conn
+
+
+@contextmanager
+def _transaction():
+    """Write transaction - takes the database write lock up front to avoid upgrade deadlocks"""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class SQLiteDataManager:
+    """Handles all data persistence via an embedded SQLite database"""
+
+    @staticmethod
+    def _hash_password(password: str) -> str:
+        """Hash password for secure storage"""
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    @staticmethod
+    def _user_from_row(row: sqlite3.Row) -> Dict:
+        """Convert a users row into the dict shape the app expects"""
+        user = dict(row)
+        user.pop("id", None)
+        for column in USER_JSON_COLUMNS:
+            user[column] = json.loads(user[column]) if user.get(column) else []
+        return user
+
+    @staticmethod
+    def _default_progress() -> Dict:
+        """Default progress record for a new user"""
+        return {
+            "initial_quiz": {"completed": False, "score": 0, "total": 18, "weak_topics": [], "strong_topics": [], "date": None},
+            "lessons": {},
+            "lesson_quizzes": {},
+            "practice_problems": {},
+            "final_test": {"completed": False, "score": 0, "date": None},
+            "badges": [],
+            "certificates": [],
+            "total_time_spent": 0,
+            "last_active": datetime.now().isoformat(),
+            "current_level": 1,
+            "overall_progress": 0
+        }
+
+    @staticmethod
+    def _progress_from_row(row: sqlite3.Row) -> Dict:
+        """Convert a progress row into the parsed progress dict"""
+        progress = {}
+        for column, default in PROGRESS_JSON_COLUMNS.items():
+            progress[column] = json.loads(row[column]) if row[column] else type(default)()
+        for column in PROGRESS_SCALAR_COLUMNS:
+            progress[column] = row[column]
+        progress.update(json.loads(row["extra"] or "{}"))
+        return progress
+
+    @staticmethod
+    def _progress_to_params(progress: Dict) -> Dict:
+        """Split a progress dict into column values (unknown keys go to 'extra')"""
+        params = {}
+        extra = {}
+        for key, value in progress.items():
+            if key in PROGRESS_JSON_COLUMNS:
+                params[key] = json.dumps(value)
+            elif key in PROGRESS_SCALAR_COLUMNS:
+                params[key] = value
+            elif key != "username":
+                extra[key] = value
+        for column, default in PROGRESS_JSON_COLUMNS.items():
+            params.setdefault(column, json.dumps(default))
+        params.setdefault("total_time_spent", 0)
+        params.setdefault("last_active", datetime.now().isoformat())
+        params.setdefault("current_level", 1)
+        params.setdefault("overall_progress", 0)
+        params["extra"] = json.dumps(extra)
+        return params
+
+    @staticmethod
+    def _write_progress(conn: sqlite3.Connection, username: str, progress: Dict):
+        """Insert or replace a user's progress row"""
+        params = SQLiteDataManager._progress_to_params(progress)
+        params["username"] = username
+        columns = list(params.keys())
+        placeholders = ", ".join(f":{c}" for c in columns)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "username")
+        conn.execute(
+            f"INSERT INTO progress ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(username) DO UPDATE SET {updates}",
+            params
+        )
+
+    @staticmethod
+    @contextmanager
+    def _progress_txn(username: str):
+        """
+        Load a user's progress inside a write transaction and save it back on exit.
+        Yields None and writes nothing for an unregistered username (progress rows
+        must reference a users row).
+        """
+        with _transaction() as conn:
+            row = conn.execute("SELECT * FROM progress WHERE username = ?", (username,)).fetchone()
+            if row is None and not conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
+                print(f"⚠️ No such user {username} - progress not saved")
+                yield None
+                return
+            progress = SQLiteDataManager._progress_from_row(row) if row else SQLiteDataManager._default_progress()
+            yield progress
+            SQLiteDataManager._write_progress(conn, username, progress)
+
+    # --- User Management ---
+
+    @staticmethod
+    def register_user(username: str, password: str, email: str, role: str, **kwargs) -> tuple[bool, str]:
+        """Register a new user"""
+        teacher_codes = kwargs.get("teacher_codes", []) or []
+
+        with _transaction() as conn:
+            if conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
+                return False, "Username already exists"
+
+            conn.execute(
+                """INSERT INTO users (username, password, email, role, created_at, age_level, grade,
+                                      share_code, teacher_code, parent_codes, teacher_codes, children)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '[]')""",
+                (
+                    username,
+                    SQLiteDataManager._hash_password(password),
+                    email,
+                    role,
+                    datetime.now().isoformat(),
+                    kwargs.get("age_level", "High School"),
+                    kwargs.get("grade", ""),
+                    kwargs.get("share_code", ""),
+                    kwargs.get("teacher_code", ""),
+                    json.dumps(kwargs.get("parent_codes", []) or []),
+                    json.dumps(teacher_codes),
+                )
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO class_enrollments (teacher_code, username) VALUES (?, ?)",
+                [(code, username) for code in teacher_codes]
+            )
+
+            # Initialize progress for new user
+            SQLiteDataManager._write_progress(conn, username, SQLiteDataManager._default_progress())
+
+        return True, "Registration successful"
+
+    @staticmethod
+    def login_user(username: str, password: str) -> tuple[bool, Optional[Dict], str]:
+        """Authenticate user login"""
+        user = SQLiteDataManager.get_user(username)
+
+        if user is None:
+            return False, None, "User not found"
+
+        if user["password"] != SQLiteDataManager._hash_password(password):
+            return False, None, "Incorrect password"
+
+        return True, user, "Login successful"
+
+    @staticmethod
+    def get_user(username: str) -> Optional[Dict]:
+        """Get user information"""
+        row = get_connection().execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+        return SQLiteDataManager._user_from_row(row) if row else None
+
+    @staticmethod
+    def update_user(username: str, updates: Dict) -> bool:
+        """Update user information"""
+        columns = {key: value for key, value in updates.items() if key not in ("id", "username")}
+        if not columns:
+            return SQLiteDataManager.get_user(username) is not None
+
+        params = {key: json.dumps(value) if key in USER_JSON_COLUMNS else value for key, value in columns.items()}
+        assignments = ", ".join(f"{key} = :{key}" for key in params)
+        params["username"] = username
+
+        try:
+            with _transaction() as conn:
+                cursor = conn.execute(f"UPDATE users SET {assignments} WHERE username = :username", params)
+                if cursor.rowcount == 0:
+                    return False
+                if "teacher_codes" in columns:
+                    conn.execute("DELETE FROM class_enrollments WHERE username = ?", (username,))
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO class_enrollments (teacher_code, username) VALUES (?, ?)",
+                        [(code, username) for code in columns["teacher_codes"]]
+                    )
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating user: {e}")
+            return False
+
+    @staticmethod
+    def reset_password(username: str, email: str, new_password: str) -> tuple[bool, str]:
+        """Reset user password"""
+        with _transaction() as conn:
+            row = conn.execute("SELECT email FROM users WHERE username = ?", (username,)).fetchone()
+            if row is None:
+                return False, "User not found"
+
+            if row["email"] != email:
+                return False, "Email doesn't match"
+
+            conn.execute(
+                "UPDATE users SET password = ? WHERE username = ?",
+                (SQLiteDataManager._hash_password(new_password), username)
+            )
+        return True, "Password reset successful"
+
+    # --- Progress Management ---
+
+    @staticmethod
+    def init_user_progress(username: str):
+        """Initialize progress tracking for a new user"""
+        try:
+            with _transaction() as conn:
+                if conn.execute("SELECT 1 FROM progress WHERE username = ?", (username,)).fetchone():
+                    return
+                SQLiteDataManager._write_progress(conn, username, SQLiteDataManager._default_progress())
+        except sqlite3.IntegrityError:
+            pass  # No such user - progress rows must reference a registered user
+
+    @staticmethod
+    def get_user_progress(username: str) -> Dict:
+        """Get user progress data"""
+        row = get_connection().execute("SELECT * FROM progress WHERE username = ?", (username,)).fetchone()
+        if row:
+            return SQLiteDataManager._progress_from_row(row)
+
+        SQLiteDataManager.init_user_progress(username)
+        return SQLiteDataManager._default_progress()
+
+    @staticmethod
+    def get_many_progress(usernames: List[str]) -> Dict[str, Dict]:
+        """Get progress for several users in one query, keyed by username"""
+        if not usernames:
+            return {}
+
+        conn = get_connection()
+        progress_by_user = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(usernames), 500):
+            chunk = list(usernames[start:start + 500])
+            placeholders = ", ".join("?" for _ in chunk)
+            for row in conn.execute(f"SELECT * FROM progress WHERE username IN ({placeholders})", chunk):
+                progress_by_user[row["username"]] = SQLiteDataManager._progress_from_row(row)
+
+        for username in usernames:
+            if username not in progress_by_user:
+                progress_by_user[username] = SQLiteDataManager.get_user_progress(username)
+
+        return progress_by_user
+
+    @staticmethod
+    def update_progress(username: str, category: str, data: Dict) -> bool:
+        """Update specific category of user progress (False if the user isn't registered)"""
+        with SQLiteDataManager._progress_txn(username) as progress:
+            if progress is None:
+                return False
+            if category in progress:
+                ProgressEngine.merge(progress, category, data)
+            else:
+                ProgressEngine.replace(progress, category, data)
+
+            progress["last_active"] = datetime.now().isoformat()
+        return True
+
+    @staticmethod
+    def save_quiz_results(username: str, quiz_type: str, score: int, total: int,
+                          weak_topics: List[str], strong_topics: List[str]) -> bool:
+        """Save initial or lesson quiz results (False if the user isn't registered)"""
+        with SQLiteDataManager._progress_txn(username) as progress:
+            if progress is None:
+                return False
+            quiz_data = {
+                "completed": True,
+                "score": score,
+                "total": total,
+                "weak_topics": weak_topics,
+                "strong_topics": strong_topics,
+                "date": datetime.now().isoformat()
+            }
+
+            if quiz_type == "initial":
+                ProgressEngine.replace(progress, "initial_quiz", quiz_data)
+            else:
+                ProgressEngine.merge(progress, "lesson_quizzes", {quiz_type: quiz_data})
+
+            print(f"📊 SQLite Quiz Progress Update: {username} → {ProgressEngine.describe(progress)}")
+        return True
+
+    @staticmethod
+    def save_lesson_progress(username: str, lesson_id: str, completed: bool = False, time_spent: int = 0) -> bool:
+        """Save lesson completion progress (False if the user isn't registered)"""
+        with SQLiteDataManager._progress_txn(username) as progress:
+            if progress is None:
+                return False
+            ProgressEngine.merge(progress, "lessons", {lesson_id: {
+                "completed": completed,
+                "time_spent": time_spent,
+                "date": datetime.now().isoformat()
+            }})
+
+            progress["total_time_spent"] = (progress.get("total_time_spent") or 0) + time_spent
+            print(f"📊 SQLite Lesson Progress Update: {username} → {ProgressEngine.describe(progress)}")
+        return True
+
+    @staticmethod
+    def award_badge(username: str, badge_name: str, badge_description: str) -> bool:
+        """Award a badge to user (False if the user isn't registered)"""
+        with SQLiteDataManager._progress_txn(username) as progress:
+            if progress is None:
+                return False
+            # Check if badge already exists by name
+            earned_badge_names = [b.get('name') if isinstance(b, dict) else b for b in progress["badges"]]
+            if badge_name not in earned_badge_names:
+                progress["badges"].append({
+                    "name": badge_name,
+                    "description": badge_description,
+                    "date": datetime.now().isoformat()
+                })
+        return True
+
+    @staticmethod
+    def award_certificate(username: str, cert_name: str, cert_description: str) -> bool:
+        """Award a certificate to user (False if the user isn't registered)"""
+        with SQLiteDataManager._progress_txn(username) as progress:
+            if progress is None:
+                return False
+            cert = {
+                "name": cert_name,
+                "description": cert_description,
+                "date": datetime.now().isoformat()
+            }
+
+            if cert not in progress["certificates"]:
+                progress["certificates"].append(cert)
+        return True
+
+    # --- Class & Family Links ---
+
+    @staticmethod
+    def link_student_to_teacher(student_username: str, teacher_code: str) -> tuple:
+        """
+        Link a student to a teacher's class using teacher code
+        Returns: (success: bool, message: str)
+        """
+        with _transaction() as conn:
+            student = conn.execute("SELECT teacher_codes FROM users WHERE username = ?", (student_username,)).fetchone()
+            if student is None:
+                return False, "Student account not found"
+
+            teacher = conn.execute("SELECT username FROM users WHERE teacher_code = ?", (teacher_code,)).fetchone()
+            if teacher is None:
+                return False, f"Teacher with code '{teacher_code}' not found"
+            teacher_username = teacher["username"]
+
+            teacher_codes = json.loads(student["teacher_codes"] or "[]")
+            if teacher_code in teacher_codes:
+                return False, "Already enrolled in this class"
+
+            teacher_codes.append(teacher_code)
+            conn.execute(
+                "UPDATE users SET teacher_codes = ? WHERE username = ?",
+                (json.dumps(teacher_codes), student_username)
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO class_enrollments (teacher_code, username) VALUES (?, ?)",
+                (teacher_code, student_username)
+            )
+
+        print(f"✅ Linked {student_username} to teacher {teacher_username} (code: {teacher_code})")
+        return True, f"Successfully joined {teacher_username}'s class!"
+
+    @staticmethod
+    def link_parent_to_child(parent_username: str, child_share_code: str) -> tuple:
+        """
+        Link a parent to their child's account using share code
+        Returns: (success: bool, message: str)
+        """
+        with _transaction() as conn:
+            parent = conn.execute("SELECT children FROM users WHERE username = ?", (parent_username,)).fetchone()
+            if parent is None:
+                return False, "Parent account not found"
+
+            child = conn.execute(
+                "SELECT username, parent_codes FROM users WHERE share_code = ?", (child_share_code,)
+            ).fetchone()
+            if child is None:
+                return False, f"Student with share code '{child_share_code}' not found"
+            child_username = child["username"]
+
+            children = json.loads(parent["children"] or "[]")
+            if child_username in children:
+                return False, "Child already linked"
+
+            children.append(child_username)
+            conn.execute("UPDATE users SET children = ? WHERE username = ?", (json.dumps(children), parent_username))
+
+            parent_codes = json.loads(child["parent_codes"] or "[]")
+            if parent_username not in parent_codes:
+                parent_codes.append(parent_username)
+                conn.execute(
+                    "UPDATE users SET parent_codes = ? WHERE username = ?",
+                    (json.dumps(parent_codes), child_username)
+                )
+
+        print(f"✅ Linked {parent_username} to child {child_username} (code: {child_share_code})")
+        return True, f"Successfully linked to {child_username}!"
+
+    @staticmethod
+    def get_teacher_students(teacher_username: str) -> List[str]:
+        """Get list of students enrolled in teacher's class"""
+        rows = get_connection().execute(
+            """SELECT e.username FROM users t
+               JOIN class_enrollments e ON e.teacher_code = t.teacher_code
+               WHERE t.username = ? AND t.teacher_code != ''""",
+            (teacher_username,)
+        ).fetchall()
+        return [row["username"] for row in rows]
+
+    @staticmethod
+    def get_all_students() -> List[str]:
+        """Get list of all student usernames"""
+        rows = get_connection().execute("SELECT username FROM users WHERE role = 'Student'").fetchall()
+        return [row["username"] for row in rows]
+
+    @staticmethod
+    def get_students_by_teacher_code(teacher_code: str) -> List[Dict]:
+        """Get students who joined with a teacher's code"""
+        rows = get_connection().execute(
+            """SELECT u.username, u.email, p.overall_progress, p.last_active
+               FROM class_enrollments e
+               JOIN users u ON u.username = e.username
+               LEFT JOIN progress p ON p.username = u.username
+               WHERE e.teacher_code = ? AND u.role = 'Student'
+               ORDER BY u.id""",
+            (teacher_code,)
+        ).fetchall()
+
+        return [
+            {
+                "username": row["username"],
+                "email": row["email"],
+                "progress": row["overall_progress"] or 0,
+                "last_active": row["last_active"] or "Never"
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_children_by_parent_code(parent_share_codes: List[str]) -> List[Dict]:
+        """Get children data for parent based on share codes"""
+        if not parent_share_codes:
+            return []
+
+        placeholders = ", ".join("?" for _ in parent_share_codes)
+        rows = get_connection().execute(
+            f"""SELECT u.username, u.share_code, p.overall_progress, p.initial_quiz, p.last_active
+                FROM users u
+                LEFT JOIN progress p ON p.username = u.username
+                WHERE u.share_code IN ({placeholders}) AND u.role = 'Student'""",
+            list(parent_share_codes)
+        ).fetchall()
+
+        children = []
+        for row in rows:
+            initial_quiz = json.loads(row["initial_quiz"] or "{}")
+            children.append({
+                "username": row["username"],
+                "share_code": row["share_code"],
+                "progress": row["overall_progress"] or 0,
+                "weak_topics": initial_quiz.get("weak_topics", []),
+                "strong_topics": initial_quiz.get("strong_topics", []),
+                "last_active": row["last_active"] or "Never"
+            })
+        return children
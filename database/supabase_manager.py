@@ -1,33 +1,171 @@
 """
 Supabase Data Manager - Cloud-persistent storage
 Replaces JSON files with PostgreSQL database via Supabase
+The supabase client library (and httpx) is imported when the first client is created.
 """
 
 import streamlit as st
-from supabase import create_client, Client
 import hashlib
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 import json
 
+from progress_engine import DERIVED_KEYS, ProgressEngine
 
-def get_supabase_client() -> Client:
-    """Initialize and return Supabase client"""
+# Connection pool defaults (override with [supabase] pool_size / health_check_interval
+# in secrets.toml, or SUPABASE_POOL_SIZE / SUPABASE_HEALTH_CHECK_INTERVAL env vars)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_HEALTH_CHECK_INTERVAL = 30  # seconds
+KEEPALIVE_EXPIRY = 60  # seconds an idle pooled connection is kept open
+
+# Progress columns stored as JSONB documents
+PROGRESS_JSON_COLUMNS = ['initial_quiz', 'lessons', 'lesson_quizzes', 'practice_problems',
+                         'final_test', 'badges', 'certificates']
+
+# How often a read-compute-patch cycle is retried when another tab wrote first
+MAX_PATCH_RETRIES = 3
+
+
+class ProgressConflictError(Exception):
+    """A progress change kept losing to writes from other sessions (see MAX_PATCH_RETRIES)"""
+
+if TYPE_CHECKING:
+    import httpx
+    from supabase import Client
+
+# Process-wide client shared by every Streamlit session in this worker
+_client: Optional["Client"] = None
+_http_client: Optional["httpx.Client"] = None
+_client_config: Optional[Dict] = None
+_last_health_check = 0.0
+_client_lock = threading.Lock()
+
+# Counters so we can confirm the pool is actually being reused
+CLIENT_STATS = {
+    "clients_created": 0,
+    "checkouts": 0,
+    "health_checks": 0,
+    "reconnects": 0,
+}
+
+
+def _load_client_config() -> Dict:
+    """Read Supabase credentials and pool settings (once per process)"""
     try:
         # Try to get from Streamlit secrets (production)
-        supabase_url = st.secrets["supabase"]["url"]
-        supabase_key = st.secrets["supabase"]["key"]
+        secrets = st.secrets["supabase"]
+        supabase_url = secrets["url"]
+        supabase_key = secrets["key"]
+        pool_size = secrets.get("pool_size")
+        health_check_interval = secrets.get("health_check_interval")
     except:
         # Fallback to environment variables or raise error
-        import os
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_KEY")
-        
+        pool_size = os.getenv("SUPABASE_POOL_SIZE")
+        health_check_interval = os.getenv("SUPABASE_HEALTH_CHECK_INTERVAL")
+
         if not supabase_url or not supabase_key:
             st.error("⚠️ Supabase credentials not found! Please configure secrets.")
             st.stop()
-    
-    return create_client(supabase_url, supabase_key)
+
+    return {
+        "url": supabase_url,
+        "key": supabase_key,
+        "pool_size": int(pool_size or DEFAULT_POOL_SIZE),
+        "health_check_interval": float(health_check_interval or DEFAULT_HEALTH_CHECK_INTERVAL),
+    }
+
+
+def _create_pooled_client(config: Dict) -> tuple["Client", Optional["httpx.Client"]]:
+    """Build a Supabase client backed by a keep-alive HTTP connection pool"""
+    import httpx
+    from supabase import create_client
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=config["pool_size"],
+            max_keepalive_connections=config["pool_size"],
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+    )
+    try:
+        from supabase import ClientOptions
+        client = create_client(config["url"], config["key"], options=ClientOptions(httpx_client=http_client))
+    except (ImportError, TypeError):
+        # Older supabase-py without httpx_client support - still reuse one client
+        http_client.close()
+        http_client = None
+        client = create_client(config["url"], config["key"])
+
+    CLIENT_STATS["clients_created"] += 1
+    return client, http_client
+
+
+def _is_healthy(client: "Client") -> bool:
+    """Cheap round trip to confirm the pooled connection still works"""
+    CLIENT_STATS["health_checks"] += 1
+    try:
+        client.table('users').select('username').limit(1).execute()
+        return True
+    except Exception as e:
+        print(f"⚠️ Supabase health check failed: {e}")
+        return False
+
+
+def reset_supabase_client():
+    """Drop the pooled client so the next call reconnects"""
+    global _client, _http_client
+    with _client_lock:
+        if _http_client is not None:
+            try:
+                _http_client.close()
+            except Exception:
+                pass
+        _client = None
+        _http_client = None
+
+
+def get_supabase_client() -> "Client":
+    """Return the process-wide Supabase client, creating it on first use"""
+    global _client, _http_client, _client_config, _last_health_check
+
+    with _client_lock:
+        CLIENT_STATS["checkouts"] += 1
+
+        if _client_config is None:
+            _client_config = _load_client_config()
+
+        if _client is None:
+            _client, _http_client = _create_pooled_client(_client_config)
+            _last_health_check = time.monotonic()
+            return _client
+
+        # Periodic health check - one caller claims it, everyone else carries on with the client
+        client = _client
+        now = time.monotonic()
+        if now - _last_health_check < _client_config["health_check_interval"]:
+            return client
+        _last_health_check = now
+
+    # The round trip happens outside the lock so other sessions aren't queued behind it
+    if _is_healthy(client):
+        return client
+
+    with _client_lock:
+        # Reconnect transparently if the pool went stale (unless another caller already did)
+        if _client is None or _client is client:
+            if _http_client is not None:
+                try:
+                    _http_client.close()
+                except Exception:
+                    pass
+            _client, _http_client = _create_pooled_client(_client_config)
+            CLIENT_STATS["reconnects"] += 1
+        return _client
 
 
 class SupabaseDataManager:
@@ -61,8 +199,9 @@ class SupabaseDataManager:
             "grade": kwargs.get("grade", ""),
             "share_code": kwargs.get("share_code", ""),
             "teacher_code": kwargs.get("teacher_code", ""),
-            "parent_codes": json.dumps(kwargs.get("parent_codes", [])),
-            "teacher_codes": json.dumps(kwargs.get("teacher_codes", []))
+            # Stored as real JSONB arrays so roster containment queries match
+            "parent_codes": kwargs.get("parent_codes", []),
+            "teacher_codes": kwargs.get("teacher_codes", [])
         }
         
         try:
@@ -132,12 +271,7 @@ class SupabaseDataManager:
         supabase = get_supabase_client()
         
         try:
-            # Convert lists to JSON strings if present
-            if 'parent_codes' in updates:
-                updates['parent_codes'] = json.dumps(updates['parent_codes'])
-            if 'teacher_codes' in updates:
-                updates['teacher_codes'] = json.dumps(updates['teacher_codes'])
-            
+            # parent_codes / teacher_codes go in as lists - JSONB arrays, like register_user
             supabase.table('users').update(updates).eq('username', username).execute()
             return True
         except:
@@ -150,31 +284,8 @@ class SupabaseDataManager:
         """Initialize progress tracking for a new user"""
         supabase = get_supabase_client()
         
-        progress_data = {
-            "username": username,
-            "initial_quiz": json.dumps({
-                "completed": False,
-                "score": 0,
-                "total": 18,
-                "weak_topics": [],
-                "strong_topics": [],
-                "date": None
-            }),
-            "lessons": json.dumps({}),
-            "lesson_quizzes": json.dumps({}),
-            "practice_problems": json.dumps({}),
-            "final_test": json.dumps({
-                "completed": False,
-                "score": 0,
-                "date": None
-            }),
-            "badges": json.dumps([]),
-            "certificates": json.dumps([]),
-            "total_time_spent": 0,
-            "last_active": datetime.now().isoformat(),
-            "current_level": 1,
-            "overall_progress": 0
-        }
+        progress_data = SupabaseDataManager._default_progress()
+        progress_data["username"] = username
         
         try:
             supabase.table('progress').insert(progress_data).execute()
@@ -182,25 +293,8 @@ class SupabaseDataManager:
             pass  # Progress already exists
     
     @staticmethod
-    def get_user_progress(username: str) -> Dict:
-        """Get user progress data"""
-        supabase = get_supabase_client()
-        
-        response = supabase.table('progress').select('*').eq('username', username).execute()
-        
-        if response.data:
-            progress = response.data[0]
-            # Parse JSON fields
-            progress['initial_quiz'] = json.loads(progress.get('initial_quiz', '{}'))
-            progress['lessons'] = json.loads(progress.get('lessons', '{}'))
-            progress['lesson_quizzes'] = json.loads(progress.get('lesson_quizzes', '{}'))
-            progress['practice_problems'] = json.loads(progress.get('practice_problems', '{}'))
-            progress['final_test'] = json.loads(progress.get('final_test', '{}'))
-            progress['badges'] = json.loads(progress.get('badges', '[]'))
-            progress['certificates'] = json.loads(progress.get('certificates', '[]'))
-            return progress
-        
-        # Return default if not found
+    def _default_progress() -> Dict:
+        """Progress shape returned for users without a progress row"""
         return {
             "initial_quiz": {"completed": False, "score": 0, "total": 18, "weak_topics": [], "strong_topics": [], "date": None},
             "lessons": {},
@@ -215,36 +309,156 @@ class SupabaseDataManager:
             "overall_progress": 0
         }
     
+    @staticmethod
+    def _parse_progress_row(progress: Dict) -> Dict:
+        """Decode the JSONB columns of a progress row in place"""
+        for column in PROGRESS_JSON_COLUMNS:
+            value = progress.get(column)
+            default = [] if column in ('badges', 'certificates') else {}
+            if value is None:
+                progress[column] = default
+            elif isinstance(value, str):
+                # Rows written before migration_progress_patches.sql hold JSON-encoded strings
+                progress[column] = json.loads(value) if value else default
+        return progress
+    
+    @staticmethod
+    def get_user_progress(username: str) -> Dict:
+        """Get user progress data"""
+        supabase = get_supabase_client()
+        
+        response = supabase.table('progress').select('*').eq('username', username).execute()
+        
+        if response.data:
+            return SupabaseDataManager._parse_progress_row(response.data[0])
+        
+        # Return default if not found
+        return SupabaseDataManager._default_progress()
+    
+    @staticmethod
+    def get_many_progress(usernames: List[str]) -> Dict[str, Dict]:
+        """Get progress for several users in one round trip, keyed by username"""
+        if not usernames:
+            return {}
+        
+        supabase = get_supabase_client()
+        
+        response = supabase.table('progress').select('*').in_('username', list(usernames)).execute()
+        
+        progress_by_user = {
+            row['username']: SupabaseDataManager._parse_progress_row(row)
+            for row in response.data
+        }
+        
+        # Users without a progress row get the same default as get_user_progress
+        for username in usernames:
+            if username not in progress_by_user:
+                progress_by_user[username] = SupabaseDataManager._default_progress()
+        
+        return progress_by_user
+    
     @staticmethod
     def update_user_progress(username: str, progress_data: Dict) -> bool:
-        """Update user progress"""
+        """
+        Write a whole progress row (prefer patch_user_progress), only if the row is still at
+        progress_data's version - or last_active, for rows from before the version column.
+        Returns False when another session wrote in between.
+        """
         supabase = get_supabase_client()
         
-        try:
-            # Convert complex objects to JSON strings
-            update_data = {}
-            for key, value in progress_data.items():
-                if key in ['initial_quiz', 'lessons', 'lesson_quizzes', 'practice_problems', 
-                          'final_test', 'badges', 'certificates']:
-                    update_data[key] = json.dumps(value)
-                else:
-                    update_data[key] = value
-            
-            update_data['last_active'] = datetime.now().isoformat()
-            
-            supabase.table('progress').update(update_data).eq('username', username).execute()
-            return True
-        except Exception as e:
-            st.error(f"Error updating progress: {e}")
-            return False
+        update_data = {key: value for key, value in progress_data.items() if key not in ('id', 'username', 'version') + DERIVED_KEYS}
+        update_data['last_active'] = datetime.now().isoformat()
+        if 'version' in progress_data:
+            update_data['version'] = (progress_data.get('version') or 0) + 1
+        
+        query = supabase.table('progress').update(update_data).eq('username', username)
+        if 'version' in progress_data:
+            query = query.eq('version', progress_data.get('version') or 0)
+        else:
+            query = query.eq('last_active', progress_data.get('last_active'))
+        return bool(query.execute().data)
+    
+    @staticmethod
+    def patch_user_progress(username: str, set_fields: Optional[Dict] = None, merge_fields: Optional[Dict] = None,
+                            append_fields: Optional[Dict] = None, expected_version: Optional[int] = None) -> Optional[int]:
+        """
+        Send only the changed parts of a progress row (see migration_progress_patches.sql)
+        set_fields replaces columns, merge_fields merges keys into object columns,
+        append_fields appends to array columns.
+        Returns the new row version, or None if the row was not at expected_version.
+        """
+        supabase = get_supabase_client()
+        
+        response = supabase.rpc('patch_progress', {
+            'p_username': username,
+            'p_set': set_fields or {},
+            'p_merge': merge_fields or {},
+            'p_append': append_fields or {},
+            'p_expected_version': expected_version
+        }).execute()
+        return response.data
+    
+    @staticmethod
+    def _apply_progress_change(username: str, build_patch) -> bool:
+        """
+        Read progress, let build_patch(progress) update it in place and return the patch
+        (or None if nothing changed), then send the patch guarded by the row version.
+        Retries when another session wrote in between and raises ProgressConflictError
+        once MAX_PATCH_RETRIES are used up. Returns False if the user isn't registered.
+        """
+        for attempt in range(MAX_PATCH_RETRIES):
+            progress = SupabaseDataManager.get_user_progress(username)
+            if 'id' not in progress:
+                # No progress row yet - create it (progress rows must reference a user), then patch it
+                if SupabaseDataManager.get_user(username) is None:
+                    print(f"⚠️ No such user {username} - progress not saved")
+                    return False
+                SupabaseDataManager.init_user_progress(username)
+                continue
+            
+            patch = build_patch(progress)
+            if patch is None:
+                return True
+            
+            try:
+                version = SupabaseDataManager.patch_user_progress(
+                    username, expected_version=progress.get('version'), **patch
+                )
+                applied = version is not None
+            except Exception as e:
+                # Database without migration_progress_patches.sql - same guard, whole row
+                print(f"⚠️ patch_progress unavailable ({e}), sending full progress row")
+                applied = SupabaseDataManager.update_user_progress(username, progress)
+            
+            if applied:
+                return True
+            print(f"🔁 Progress for {username} changed in another session, retrying ({attempt + 1}/{MAX_PATCH_RETRIES})")
+        
+        raise ProgressConflictError(f"Progress for {username} changed in another session on each of {MAX_PATCH_RETRIES} attempts")
     
     # --- Additional Methods (keeping same signatures as original) ---
     
     @staticmethod
-    def save_quiz_results(username: str, quiz_type: str, score: int, total: int, weak_topics: List[str], strong_topics: List[str]):
+    def update_progress(username: str, category: str, data: Dict) -> bool:
+        """Merge data into one progress category and refresh overall progress"""
+        def build_patch(progress):
+            if isinstance(progress.get(category), dict) and isinstance(data, dict):
+                ProgressEngine.merge(progress, category, data)
+            else:
+                ProgressEngine.replace(progress, category, data)
+            
+            if category in PROGRESS_JSON_COLUMNS and category not in ('badges', 'certificates') and isinstance(data, dict):
+                patch = {'merge_fields': {category: data}, 'set_fields': {}}
+            else:
+                patch = {'set_fields': {category: data}}
+            patch['set_fields']['overall_progress'] = progress['overall_progress']
+            return patch
+        
+        return SupabaseDataManager._apply_progress_change(username, build_patch)
+    
+    @staticmethod
+    def save_quiz_results(username: str, quiz_type: str, score: int, total: int, weak_topics: List[str], strong_topics: List[str]) -> bool:
         """Save quiz results (initial or lesson quiz)"""
-        progress = SupabaseDataManager.get_user_progress(username)
-        
         quiz_data = {
             "completed": True,
             "score": score,
@@ -254,84 +468,72 @@ class SupabaseDataManager:
             "date": datetime.now().isoformat()
         }
         
-        if quiz_type == "initial":
-            progress['initial_quiz'] = quiz_data
-        else:
-            if 'lesson_quizzes' not in progress:
-                progress['lesson_quizzes'] = {}
-            progress['lesson_quizzes'][quiz_type] = quiz_data
-        
-        # Update overall progress (quiz 20%, lessons 60%, practice 20%)
-        quiz_completed = progress.get("initial_quiz", {}).get("completed", False)
-        lessons_completed = len([l for l in progress.get("lessons", {}).values() if l.get("completed")])
-        practice_done = len(progress.get("practice_problems", {}))
-        
-        overall = 0
-        if quiz_completed:
-            overall += 20
-        overall += (lessons_completed / 6) * 60 if lessons_completed > 0 else 0
-        overall += (practice_done / 10) * 20 if practice_done > 0 else 0
-        
-        progress["overall_progress"] = int(overall)
-        print(f"📊 Supabase Quiz Progress Update: Quiz={quiz_completed}, Lessons={lessons_completed}/6, Practice={practice_done}/10 → Overall={int(overall)}%")
+        def build_patch(progress):
+            set_fields = {}
+            merge_fields = {}
+            if quiz_type == "initial":
+                ProgressEngine.replace(progress, 'initial_quiz', quiz_data)
+                set_fields['initial_quiz'] = quiz_data
+            else:
+                ProgressEngine.merge(progress, 'lesson_quizzes', {quiz_type: quiz_data})
+                merge_fields['lesson_quizzes'] = {quiz_type: quiz_data}
+            
+            set_fields["overall_progress"] = progress["overall_progress"]
+            print(f"📊 Supabase Quiz Progress Update: {ProgressEngine.describe(progress)}")
+            
+            return {'set_fields': set_fields, 'merge_fields': merge_fields}
         
-        SupabaseDataManager.update_user_progress(username, progress)
+        return SupabaseDataManager._apply_progress_change(username, build_patch)
     
     @staticmethod
-    def save_lesson_progress(username: str, lesson_id: str, completed: bool = False, time_spent: int = 0):
+    def save_lesson_progress(username: str, lesson_id: str, completed: bool = False, time_spent: int = 0) -> bool:
         """Save lesson progress (matches DataManager API)"""
-        progress = SupabaseDataManager.get_user_progress(username)
-        if 'lessons' not in progress:
-            progress['lessons'] = {}
-        
-        progress['lessons'][lesson_id] = {
+        lesson_data = {
             "completed": completed,
             "time_spent": time_spent,
-            "progress": 1.0 if completed else 0.5,
             "date": datetime.now().isoformat()
         }
         
-        # Update total time spent
-        progress['total_time_spent'] = progress.get('total_time_spent', 0) + time_spent
-        
-        # Update overall progress (quiz 20%, lessons 60%, practice 20%)
-        quiz_completed = progress.get("initial_quiz", {}).get("completed", False)
-        lessons_completed = len([l for l in progress.get("lessons", {}).values() if l.get("completed")])
-        practice_done = len(progress.get("practice_problems", {}))
-        
-        overall = 0
-        if quiz_completed:
-            overall += 20
-        overall += (lessons_completed / 6) * 60 if lessons_completed > 0 else 0
-        overall += (practice_done / 10) * 20 if practice_done > 0 else 0
-        
-        progress["overall_progress"] = int(overall)
-        print(f"📊 Supabase Lesson Progress Update: Quiz={quiz_completed}, Lessons={lessons_completed}/6, Practice={practice_done}/10 → Overall={int(overall)}%")
+        def build_patch(progress):
+            ProgressEngine.merge(progress, 'lessons', {lesson_id: lesson_data})
+            
+            # Update total time spent
+            progress['total_time_spent'] = (progress.get('total_time_spent') or 0) + time_spent
+            print(f"📊 Supabase Lesson Progress Update: {ProgressEngine.describe(progress)}")
+            
+            return {
+                'set_fields': {'total_time_spent': progress['total_time_spent'], 'overall_progress': progress['overall_progress']},
+                'merge_fields': {'lessons': {lesson_id: lesson_data}}
+            }
         
-        SupabaseDataManager.update_user_progress(username, progress)
+        return SupabaseDataManager._apply_progress_change(username, build_patch)
     
     @staticmethod
     def update_lesson_progress(username: str, lesson_id: str, completed: bool, time_spent: int):
         """Update lesson progress (legacy method)"""
-        SupabaseDataManager.save_lesson_progress(username, lesson_id, completed, time_spent)
+        return SupabaseDataManager.save_lesson_progress(username, lesson_id, completed, time_spent)
     
     @staticmethod
-    def award_badge(username: str, badge_name: str, description: str):
+    def award_badge(username: str, badge_name: str, description: str) -> bool:
         """Award a badge to user"""
-        progress = SupabaseDataManager.get_user_progress(username)
-        badges = progress.get('badges', [])
-        
-        # Check if badge already exists by name
-        earned_badge_names = [b.get('name') if isinstance(b, dict) else b for b in badges]
-        if badge_name not in earned_badge_names:
-            badge = {
-                "name": badge_name,
-                "description": description,
-                "date": datetime.now().isoformat()
-            }
+        badge = {
+            "name": badge_name,
+            "description": description,
+            "date": datetime.now().isoformat()
+        }
+        
+        def build_patch(progress):
+            badges = progress.setdefault('badges', [])
+            
+            # Check if badge already exists by name
+            earned_badge_names = [b.get('name') if isinstance(b, dict) else b for b in badges]
+            if badge_name in earned_badge_names:
+                return None
+            
             badges.append(badge)
-            progress['badges'] = badges
-            SupabaseDataManager.update_user_progress(username, progress)
+            return {'append_fields': {'badges': [badge]}}
+        
+        return SupabaseDataManager._apply_progress_change(username, build_patch)
     
     @staticmethod
     def reset_password(username: str, email: str, new_password: str) -> bool:
@@ -405,7 +607,7 @@ class SupabaseDataManager:
                     'parent_codes': parent_codes
                 }).eq('username', child_username).execute()
             
-            return True, f"Successfully linked to {child_username}'s account!"
+            return True, f"Successfully linked to {child_username}!"
         
         except Exception as e:
             print(f"Error linking parent to child: {e}")
@@ -457,33 +659,52 @@ class SupabaseDataManager:
             print(f"Error linking student to teacher: {e}")
             return False, f"Error: {str(e)}"
     
+    @staticmethod
+    def get_all_students(page_size: int = 1000) -> List[str]:
+        """Get list of all student usernames (paged - PostgREST caps rows per response)"""
+        supabase = get_supabase_client()
+        
+        usernames = []
+        start = 0
+        while True:
+            response = supabase.table('users') \
+                .select('username') \
+                .eq('role', 'Student') \
+                .order('username') \
+                .range(start, start + page_size - 1) \
+                .execute()
+            usernames.extend(row['username'] for row in response.data)
+            if len(response.data) < page_size:
+                return usernames
+            start += page_size
+    
     @staticmethod
     def get_students_by_teacher_code(teacher_code: str) -> List[Dict]:
-        """Get students who joined with a teacher's code"""
+        """Get students who joined with a teacher's code (single round trip)"""
         supabase = get_supabase_client()
         
         try:
-            # Get all students
-            students_response = supabase.table('users').select('*').eq('role', 'Student').execute()
+            # JSONB containment on teacher_codes (GIN-indexed) with progress embedded
+            # via the progress.username foreign key - one query for the whole roster
+            response = supabase.table('users') \
+                .select('username, email, progress(overall_progress, last_active)') \
+                .eq('role', 'Student') \
+                .contains('teacher_codes', json.dumps([teacher_code])) \
+                .execute()
             
             students = []
-            for user in students_response.data:
-                # Check if teacher_code is in student's teacher_codes array
-                teacher_codes = user.get('teacher_codes', [])
-                if not isinstance(teacher_codes, list):
-                    teacher_codes = json.loads(teacher_codes) if teacher_codes else []
+            for user in response.data:
+                # One-to-one embeds come back as an object, older PostgREST returns a list
+                progress_data = user.get('progress') or {}
+                if isinstance(progress_data, list):
+                    progress_data = progress_data[0] if progress_data else {}
                 
-                if teacher_code in teacher_codes:
-                    # Get student's progress
-                    progress_response = supabase.table('progress').select('*').eq('username', user['username']).execute()
-                    progress_data = progress_response.data[0] if progress_response.data else {}
-                    
-                    students.append({
-                        "username": user['username'],
-                        "email": user['email'],
-                        "progress": progress_data.get('overall_progress', 0),
-                        "last_active": progress_data.get('last_active', 'Never')
-                    })
+                students.append({
+                    "username": user['username'],
+                    "email": user['email'],
+                    "progress": progress_data.get('overall_progress', 0),
+                    "last_active": progress_data.get('last_active', 'Never')
+                })
             
             return students
         
@@ -0,0 +1,279 @@
+"""
+Supabase Stand-in - Local HTTP server speaking the slice of the PostgREST API the app uses
+Backs the users/progress tables (setup_supabase.sql) and patch_progress()
+(migration_progress_patches.sql) with in-memory rows, so the real supabase client can be
+exercised by tests and benchmarks without a cloud project. Counts connections and requests,
+and can add a per-request / per-connection delay to stand in for network and TLS cost.
+
+Usage:
+    with SupabaseStandIn(latency=0.005) as server:
+        os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"] = server.url, server.key
+"""
+import copy
+import itertools
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+# Column defaults from setup_supabase.sql
+TABLE_DEFAULTS = {
+    "users": {
+        "parent_codes": [],
+        "teacher_codes": [],
+        "children": [],
+    },
+    "progress": {
+        "initial_quiz": {},
+        "lessons": {},
+        "lesson_quizzes": {},
+        "practice_problems": {},
+        "final_test": {},
+        "badges": [],
+        "certificates": [],
+        "total_time_spent": 0,
+        "current_level": 1,
+        "overall_progress": 0,
+        "version": 0,
+    },
+}
+
+# patch_progress(): object columns take p_merge, array columns take p_append
+PATCH_OBJECT_COLUMNS = ["initial_quiz", "lessons", "lesson_quizzes", "practice_problems", "final_test"]
+PATCH_ARRAY_COLUMNS = ["badges", "certificates"]
+PATCH_SCALAR_COLUMNS = ["total_time_spent", "current_level", "overall_progress"]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _text(value) -> str:
+    """A column value as PostgREST compares it in filters"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _split_columns(select: str) -> List[str]:
+    """'a,b,progress(c,d)' -> ['a', 'b', 'progress(c,d)']"""
+    columns, depth, current = [], 0, ""
+    for char in select.replace(" ", ""):
+        if char == "," and depth == 0:
+            columns.append(current)
+            current = ""
+            continue
+        depth += (char == "(") - (char == ")")
+        current += char
+    if current:
+        columns.append(current)
+    return columns
+
+
+class PostgrestError(Exception):
+    """An error response in PostgREST's shape"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.body = {"code": code, "message": message, "details": None, "hint": None}
+
+
+class SupabaseStandIn:
+    """In-memory users/progress tables behind a local PostgREST-compatible HTTP server"""
+
+    # The client only checks that a key is present
+    key = "standin.anon.key"
+
+    def __init__(self, latency: float = 0.0, connect_latency: float = 0.0):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.tables: Dict[str, List[Dict]] = {"users": [], "progress": []}
+        self.stats = {"connections": 0, "requests": 0}
+        self._ids = {table: itertools.count(1) for table in self.tables}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # --- Server lifecycle ---
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SupabaseStandIn":
+        standin = self
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, so pooled clients reuse connections
+            disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+            def setup(self):
+                # Once per accepted connection, on that connection's own thread
+                super().setup()
+                with standin._lock:
+                    standin.stats["connections"] += 1
+                if standin.connect_latency:
+                    time.sleep(standin.connect_latency)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                parts = urlsplit(self.path)
+                if standin.latency:
+                    time.sleep(standin.latency)
+                try:
+                    status, payload = standin.handle(method, parts.path, parse_qsl(parts.query), body)
+                except PostgrestError as e:
+                    status, payload = e.status, e.body
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "SupabaseStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # --- Request handling ---
+
+    def handle(self, method: str, path: str, params: List[tuple], body) -> tuple:
+        """(status, JSON payload) for one REST request"""
+        with self._lock:
+            self.stats["requests"] += 1
+            prefix = "/rest/v1/"
+            if not path.startswith(prefix):
+                raise PostgrestError(404, "PGRST000", f"Unknown path {path}")
+            name = path[len(prefix):]
+
+            if name == "rpc/patch_progress" and method == "POST":
+                return 200, self.patch_progress(**body)
+            if name not in self.tables:
+                raise PostgrestError(404, "42P01", f'relation "{name}" does not exist')
+
+            if method == "GET":
+                return 200, self._select(name, params)
+            if method == "POST":
+                return 201, self._insert(name, body if isinstance(body, list) else [body])
+            if method == "PATCH":
+                rows = self._filter(name, params)
+                for row in rows:
+                    row.update(copy.deepcopy(body))
+                return 200, copy.deepcopy(rows)
+            raise PostgrestError(405, "PGRST000", f"{method} not supported")
+
+    def _filter(self, table: str, params: List[tuple]) -> List[Dict]:
+        """Rows matching the eq./in./cs. filters among the query parameters"""
+        rows = self.tables[table]
+        for column, condition in params:
+            if column in ("select", "order", "offset", "limit") or "." not in condition:
+                continue
+            operator, value = condition.split(".", 1)
+            if operator == "eq":
+                rows = [row for row in rows if _text(row.get(column)) == value]
+            elif operator == "in":
+                values = {v.strip('"') for v in value.strip("()").split(",")}
+                rows = [row for row in rows if _text(row.get(column)) in values]
+            elif operator == "cs":
+                wanted = json.loads(value)
+                rows = [row for row in rows if all(item in (row.get(column) or []) for item in wanted)]
+            else:
+                raise PostgrestError(400, "PGRST100", f"Unsupported operator {operator}")
+        return rows
+
+    def _select(self, table: str, params: List[tuple]) -> List[Dict]:
+        query = dict(params)
+        rows = self._filter(table, params)
+        if "order" in query:
+            column, direction = query["order"].split(".")[:2]
+            rows = sorted(rows, key=lambda row: _text(row.get(column)), reverse=direction == "desc")
+        offset = int(query.get("offset", 0))
+        rows = rows[offset:offset + int(query["limit"])] if "limit" in query else rows[offset:]
+
+        columns = _split_columns(query.get("select", "*"))
+        result = []
+        for row in rows:
+            selected = {}
+            for column in columns:
+                if column == "*":
+                    selected.update(row)
+                elif "(" in column:
+                    # One-to-one embed through progress.username -> users.username
+                    embedded, inner = column[:-1].split("(", 1)
+                    match = next((r for r in self.tables[embedded] if r["username"] == row["username"]), None)
+                    selected[embedded] = None if match is None else \
+                        {key: match.get(key) for key in _split_columns(inner)}
+                else:
+                    selected[column] = row.get(column)
+            result.append(copy.deepcopy(selected))
+        return result
+
+    def _insert(self, table: str, records: List[Dict]) -> List[Dict]:
+        inserted = []
+        for record in records:
+            if any(row["username"] == record["username"] for row in self.tables[table]):
+                raise PostgrestError(409, "23505", f'duplicate key value violates unique constraint "{table}_username_key"')
+            if table == "progress" and not any(u["username"] == record["username"] for u in self.tables["users"]):
+                raise PostgrestError(409, "23503", 'insert or update on table "progress" violates foreign key constraint')
+            row = copy.deepcopy(TABLE_DEFAULTS[table])
+            row.update(copy.deepcopy(record))
+            row["id"] = next(self._ids[table])
+            row.setdefault("created_at" if table == "users" else "last_active", _now())
+            self.tables[table].append(row)
+            inserted.append(copy.deepcopy(row))
+        return inserted
+
+    def patch_progress(self, p_username: str, p_set: Optional[Dict] = None, p_merge: Optional[Dict] = None,
+                       p_append: Optional[Dict] = None, p_expected_version: Optional[int] = None) -> Optional[int]:
+        """Same semantics as patch_progress() in migration_progress_patches.sql"""
+        p_set, p_merge, p_append = p_set or {}, p_merge or {}, p_append or {}
+        row = next((r for r in self.tables["progress"] if r["username"] == p_username), None)
+        if row is None or (p_expected_version is not None and row["version"] != p_expected_version):
+            return None
+
+        for column in PATCH_OBJECT_COLUMNS:
+            value = copy.deepcopy(p_set[column]) if column in p_set else row[column]
+            row[column] = {**value, **copy.deepcopy(p_merge.get(column, {}))}
+        for column in PATCH_ARRAY_COLUMNS:
+            value = copy.deepcopy(p_set[column]) if column in p_set else row[column]
+            row[column] = value + copy.deepcopy(p_append.get(column, []))
+        for column in PATCH_SCALAR_COLUMNS:
+            if column in p_set:
+                row[column] = int(p_set[column])
+        row["last_active"] = _now()
+        row["version"] += 1
+        return row["version"]
@@ -0,0 +1,102 @@
+"""
+Import-Time Budget
+Profiles module import time with `python -X importtime` in a fresh interpreter and checks the
+login path (everything imported before the login page can render) against a budget in ms.
+Streamlit itself is imported first, so only the app's own imports are counted.
+
+Usage:
+    python import_budget.py                          # login path, exit code 1 if over budget
+    python import_budget.py --budget 150 --runs 7
+    python import_budget.py pages.progress_tracker   # profile any module
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Modules imported on the way to the first paint of the login page (app_main imports
+# data_manager, then route_to_page renders pages.auth -> login)
+LOGIN_PATH_MODULES = ["data_manager", "pages.auth", "pages.auth.login"]
+
+# Cold import budget for the login path, in ms (override with IMPORT_BUDGET_MS)
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "150"))
+
+# Imported before timing starts - the framework cost isn't ours to budget
+FRAMEWORK_MODULES = ["streamlit"]
+
+APP_DIR = Path(__file__).parent
+
+
+def profile_imports(modules: List[str]) -> List[Tuple[str, int, int, int]]:
+    """(name, depth, self_us, cumulative_us) for every module imported, in a fresh interpreter"""
+    preload = [m for m in FRAMEWORK_MODULES if importlib.util.find_spec(m) is not None]
+    code = "".join(f"import {m}\n" for m in preload)
+    code += "import sys; sys.stderr.write('-- app imports --\\n')\n"
+    code += "".join(f"import {m}\n" for m in modules)
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    lines = result.stderr.split("-- app imports --\n", 1)[1].splitlines()
+    profile = []
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self_us |   cumulative_us | <2 spaces per nesting level>name"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        profile.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return profile
+
+
+def import_time_ms(profile: List[Tuple[str, int, int, int]]) -> float:
+    """Total import time: the cumulative time of every top-level import"""
+    return sum(cumulative for _, depth, _, cumulative in profile if depth == 0) / 1000
+
+
+def heaviest(profile: List[Tuple[str, int, int, int]], count: int) -> List[Tuple[str, int]]:
+    """Modules with the largest self time"""
+    by_module: Dict[str, int] = {}
+    for name, _, self_us, _ in profile:
+        by_module[name] = by_module.get(name, 0) + self_us
+    return sorted(by_module.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import time against a budget")
+    parser.add_argument("modules", nargs="*", default=LOGIN_PATH_MODULES, help="modules to import (default: login path)")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="budget in ms")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time (median is checked)")
+    parser.add_argument("--top", type=int, default=10, help="heaviest modules to list")
+    args = parser.parse_args()
+
+    try:
+        runs = [profile_imports(args.modules) for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(f"❌ Could not import {', '.join(args.modules)}: {e}")
+        sys.exit(2)
+    times = [import_time_ms(profile) for profile in runs]
+    median = statistics.median(times)
+    median_run = runs[times.index(sorted(times)[len(times) // 2])]
+
+    print(f"⏱️ Import time for {', '.join(args.modules)}: median {median:.1f} ms "
+          f"(min {min(times):.1f}, max {max(times):.1f}, {args.runs} runs)")
+    print("📊 Heaviest imports (self time):")
+    for name, self_us in heaviest(median_run, args.top):
+        print(f"   {self_us / 1000:7.1f} ms  {name}")
+
+    if median > args.budget:
+        print(f"❌ Over budget: {median:.1f} ms > {args.budget:.0f} ms")
+        sys.exit(1)
+    print(f"✅ Within budget ({args.budget:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Migrate JSON Progress Storage Layout
+Converts data/progress.json into one file per user (PROGRESS_LAYOUT=sharded) and back
+
+Usage:
+    python migrate_progress_layout.py            # single file -> per-user shards
+    python migrate_progress_layout.py --reverse  # per-user shards -> single file
+"""
+import argparse
+from pathlib import Path
+from urllib.parse import unquote
+
+import data_manager
+from data_manager import DataManager, PROGRESS_FILE, PROGRESS_SHARD_DIR
+
+
+def shard_path(username: str) -> Path:
+    """Shard file for a user, independent of the layout currently configured"""
+    original_layout = data_manager.PROGRESS_LAYOUT
+    data_manager.PROGRESS_LAYOUT = "sharded"
+    try:
+        return DataManager._progress_path(username)
+    finally:
+        data_manager.PROGRESS_LAYOUT = original_layout
+
+
+def split_progress_file() -> int:
+    """Write every user in progress.json to its own shard file"""
+    progress = DataManager._load_json(PROGRESS_FILE)
+
+    for username, user_progress in progress.items():
+        path = shard_path(username)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with DataManager._locked(path):
+            DataManager._save_json(path, user_progress)
+
+    return len(progress)
+
+
+def merge_shards() -> int:
+    """Collect every shard file back into a single progress.json"""
+    merged = {}
+    with DataManager._locked(PROGRESS_FILE):
+        merged.update(DataManager._load_json(PROGRESS_FILE))
+
+        for path in PROGRESS_SHARD_DIR.glob("*/*.json"):
+            user_progress = DataManager._load_json(path)
+            if user_progress:
+                merged[unquote(path.stem)] = user_progress
+
+        DataManager._save_json(PROGRESS_FILE, merged)
+
+    return len(merged)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert JSON progress storage between layouts")
+    parser.add_argument("--reverse", action="store_true", help="merge per-user shards back into progress.json")
+    args = parser.parse_args()
+
+    if args.reverse:
+        count = merge_shards()
+        print(f"✅ Merged {count} users into {PROGRESS_FILE}")
+        print("💡 Unset PROGRESS_LAYOUT (or set it to 'single') before restarting the app")
+    else:
+        count = split_progress_file()
+        print(f"✅ Wrote {count} users to {PROGRESS_SHARD_DIR}")
+        print("💡 Set PROGRESS_LAYOUT=sharded before restarting the app")
+        print(f"💡 {PROGRESS_FILE.name} was left in place as a backup")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,33 +5,64 @@ spaced repetition, and predictive analytics
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
 import statistics
 from data_manager import DataManager
+from database.event_store import EventStore
+from database.feature_store import FeatureStore
+import spaced_repetition
+from practice_bank import get_problem, practice_problems, topic_ids
+from progress_engine import DERIVED_KEYS, ProgressEngine
 
+# Topics scored for confidence and adaptive difficulty
+ML_TOPICS = ["Limit Definition", "Basic Rules", "Product Rule", "Chain Rule", "Implicit Diff.", "Applications"]
 
-def calculate_topic_confidence(username: str, topic: str) -> int:
+# Stored features older than this many seconds are recomputed even if progress is unchanged
+# (retention and engagement factors depend on today's date)
+ML_FEATURE_MAX_AGE = float(os.getenv("ML_FEATURE_MAX_AGE", str(24 * 3600)))
+
+
+def _topic_attempts(progress: Dict, topic: str) -> List[Dict]:
+    """
+    Practice entries for a topic ID or quiz topic name (oldest first within each topic ID),
+    looked up through the progress topic index instead of scanning every entry
+    """
+    practice = progress.get('practice_problems', {})
+    index = ProgressEngine.topic_index(progress)
+    # Entries recorded outside the problem bank are indexed under their own topic name
+    keys = topic_ids(topic) + ([topic] if topic in index and topic not in practice_problems() else [])
+    return [practice[problem_id] for topic_id in keys for problem_id in index.get(topic_id, [])]
+
+
+def _attempt_total(entry: Dict) -> int:
+    """Attempts recorded for a practice entry ('total' in older records)"""
+    return entry.get('attempts', entry.get('total', 0))
+
+
+def calculate_topic_confidence(username: str, topic: str, progress: Optional[Dict] = None) -> int:
     """
     ML: Calculate confidence score (0-100) for a topic based on multiple factors
     Uses weighted combination of accuracy, consistency, and time factors
     """
-    progress = DataManager.get_user_progress(username)
+    if progress is None:
+        progress = DataManager.get_user_progress(username)
     
     # Get attempts for this topic
-    practice = progress.get('practice_problems', {})
-    topic_attempts = [p for p_id, p in practice.items() 
-                     if topic.lower() in p.get('topic', '').lower()]
+    topic_attempts = _topic_attempts(progress, topic)
     
     if not topic_attempts:
         return 0
     
     # Factor 1: Accuracy (50% weight)
-    total = sum(p.get('total', 0) for p in topic_attempts)
+    total = sum(_attempt_total(p) for p in topic_attempts)
     correct = sum(p.get('correct', 0) for p in topic_attempts)
     accuracy = correct / total if total > 0 else 0
     
     # Factor 2: Consistency (30% weight)
-    recent_scores = [p.get('correct', 0) / max(p.get('total', 1), 1) 
+    recent_scores = [p.get('correct', 0) / max(_attempt_total(p), 1) 
                      for p in topic_attempts[-5:]]  # Last 5 attempts
     consistency = 1 - (statistics.stdev(recent_scores) if len(recent_scores) > 1 else 0)
     
@@ -50,24 +81,23 @@ def calculate_topic_confidence(username: str, topic: str) -> int:
     return round(min(100, max(0, confidence)))
 
 
-def get_adaptive_difficulty(username: str, topic: str) -> str:
+def get_adaptive_difficulty(username: str, topic: str, progress: Optional[Dict] = None) -> str:
     """
     ML: Determine optimal difficulty level based on recent performance
     Returns: 'easy', 'medium', or 'hard'
     """
-    progress = DataManager.get_user_progress(username)
-    practice = progress.get('practice_problems', {})
+    if progress is None:
+        progress = DataManager.get_user_progress(username)
     
     # Get recent attempts for this topic
-    topic_attempts = [p for p_id, p in practice.items() 
-                     if topic.lower() in p.get('topic', '').lower()]
+    topic_attempts = _topic_attempts(progress, topic)
     
     if not topic_attempts:
         return "easy"  # Start with easy for new topics
     
     # Calculate recent accuracy (last 5 attempts)
     recent = topic_attempts[-5:]
-    total = sum(p.get('total', 0) for p in recent)
+    total = sum(_attempt_total(p) for p in recent)
     correct = sum(p.get('correct', 0) for p in recent)
     accuracy = (correct / total * 100) if total > 0 else 0
     
@@ -80,12 +110,13 @@ def get_adaptive_difficulty(username: str, topic: str) -> str:
         return "easy"      # Struggling - build confidence
     
 
-def calculate_learning_velocity(username: str) -> Tuple[float, str]:
+def calculate_learning_velocity(username: str, progress: Optional[Dict] = None) -> Tuple[float, str]:
     """
     ML: Calculate learning speed and classify learner type
     Returns: (velocity_score, learner_type)
     """
-    progress = DataManager.get_user_progress(username)
+    if progress is None:
+        progress = DataManager.get_user_progress(username)
     
     # Get quiz scores over time
     initial_quiz = progress.get('initial_quiz', {})
@@ -105,8 +136,12 @@ def calculate_learning_velocity(username: str) -> Tuple[float, str]:
     # Calculate activity level
     lessons_completed = len([l for l in progress.get('lessons', {}).values() if l.get('completed')])
     
+    # Days since the first recorded event when the event log has history,
+    # otherwise fall back to the last_active timestamp
+    first_event = EventStore.snapshot(username).get('first_event')
+    
     # Handle timezone-aware/naive datetime comparison
-    last_active_str = progress.get('last_active', datetime.now().isoformat())
+    last_active_str = first_event or progress.get('last_active', datetime.now().isoformat())
     try:
         last_active = datetime.fromisoformat(last_active_str.replace('Z', '+00:00'))
         # Make both timezone-naive for comparison
@@ -132,78 +167,67 @@ def calculate_learning_velocity(username: str) -> Tuple[float, str]:
     return velocity, learner_type
 
 
-def calculate_next_review(topic: str, performance: float) -> Dict:
+def calculate_next_review(entry: Dict, correct: bool, reviewed_at: Optional[datetime] = None) -> Dict:
     """
-    ML: Spaced Repetition - Calculate when to review a topic next
-    Based on SM-2 algorithm (SuperMemo/Anki)
+    ML: Spaced Repetition - Schedule a practice problem's next review after an answer
+    SM-2 algorithm (SuperMemo/Anki); the entry's easiness, interval and repetitions are updated in place
     """
-    today = datetime.now()
-    
-    # SM-2 Algorithm (simplified)
-    if performance < 60:
-        interval_days = 1          # Review tomorrow
-        easiness = 1.3
-        priority = "high"
-    elif performance < 80:
-        interval_days = 3          # Review in 3 days
-        easiness = 2.0
-        priority = "medium"
-    else:
-        interval_days = 7          # Review in 1 week
-        easiness = 2.5
-        priority = "low"
-    
-    next_review_date = today + timedelta(days=interval_days)
+    quality = spaced_repetition.QUALITY_CORRECT if correct else spaced_repetition.QUALITY_INCORRECT
+    spaced_repetition.sm2_review(entry, quality, reviewed_at)
     
     return {
-        'topic': topic,
-        'next_review': next_review_date.isoformat(),
-        'interval_days': interval_days,
-        'easiness_factor': easiness,
-        'priority': priority,
-        'performance': performance
+        'next_review': entry['due'],
+        'interval_days': entry['interval'],
+        'easiness_factor': entry['easiness'],
+        'repetitions': entry['repetitions'],
+        'priority': spaced_repetition.review_priority(entry)
     }
 
 
-def get_review_schedule(username: str) -> List[Dict]:
+def get_review_schedule(username: str, progress: Optional[Dict] = None, limit: Optional[int] = None) -> List[Dict]:
     """
-    ML: Get all topics due for review based on spaced repetition
+    ML: Practice problems due for review, most overdue first
+    Served from the progress due-queue, so only the due items are touched
     """
-    progress = DataManager.get_user_progress(username)
-    review_schedule = progress.get('review_schedule', {})
+    if progress is None:
+        progress = DataManager.get_user_progress(username)
+    practice = progress.get('practice_problems', {})
+    queue = ProgressEngine.review_queue(progress)
     
     today = datetime.now()
     due_reviews = []
     
-    for topic, review_info in review_schedule.items():
-        next_review = datetime.fromisoformat(review_info['next_review'].split('.')[0])
-        if next_review <= today:
-            due_reviews.append({
-                'topic': topic,
-                'days_overdue': (today - next_review).days,
-                'priority': review_info.get('priority', 'medium')
-            })
-    
-    # Sort by priority then days overdue
-    priority_order = {'high': 0, 'medium': 1, 'low': 2}
-    due_reviews.sort(key=lambda x: (priority_order.get(x['priority'], 1), -x['days_overdue']))
+    for problem_id in spaced_repetition.pop_due(queue, practice, today.isoformat(timespec='seconds'), limit):
+        entry = practice[problem_id]
+        problem = get_problem(problem_id) or {}
+        due_reviews.append({
+            'problem_id': problem_id,
+            'topic': problem.get('topic') or entry.get('topic') or problem_id,
+            'days_overdue': (today - datetime.fromisoformat(entry['due'])).days,
+            'priority': spaced_repetition.review_priority(entry),
+            'last_reviewed': entry.get('last_reviewed', '')[:10],
+            'next_review': entry['due'][:10],
+            'interval_days': entry.get('interval', 0),
+            'easiness_factor': entry.get('easiness', spaced_repetition.DEFAULT_EASINESS)
+        })
     
     return due_reviews
 
 
-def predict_final_score(username: str) -> Dict:
+def predict_final_score(username: str, progress: Optional[Dict] = None) -> Dict:
     """
     ML: Predictive Analytics - Predict final test score using linear regression
     Returns prediction with confidence interval
     """
-    progress = DataManager.get_user_progress(username)
+    if progress is None:
+        progress = DataManager.get_user_progress(username)
     
     # Feature engineering
     initial_quiz = progress.get('initial_quiz', {})
     initial_knowledge = (initial_quiz.get('score', 0) / max(initial_quiz.get('total', 8), 1))
     
-    lessons = progress.get('lessons', {})
-    lesson_completion = len([l for l in lessons.values() if l.get('completed')]) / 5  # 5 total lessons
+    sections = ProgressEngine.section_completion(progress)
+    lesson_completion = sections['lessons']
     
     practice = progress.get('practice_problems', {})
     if practice:
@@ -234,7 +258,7 @@ def predict_final_score(username: str) -> Dict:
     data_completeness = (
         min(1.0, initial_quiz.get('total', 0) / 8) * 0.3 +
         lesson_completion * 0.4 +
-        min(1.0, len(practice) / 10) * 0.3
+        sections['practice'] * 0.3
     )
     
     confidence = round(data_completeness * 100)
@@ -261,12 +285,13 @@ def get_prediction_recommendation(score: float) -> str:
         return "At risk. Recommend reviewing fundamentals and seeking additional help."
 
 
-def update_streak(username: str) -> Dict:
+def update_streak(username: str, progress: Optional[Dict] = None) -> Dict:
     """
     Track and update daily activity streak
     Returns: streak info with milestone status
     """
-    progress = DataManager.get_user_progress(username)
+    if progress is None:
+        progress = DataManager.get_user_progress(username)
     today = datetime.now().date()
     
     last_active_str = progress.get('last_active', datetime.now().isoformat())
@@ -275,8 +300,19 @@ def update_streak(username: str) -> Dict:
     current_streak = progress.get('streak', 0)
     longest_streak = progress.get('longest_streak', 0)
     
+    active_days = EventStore.active_days(username)
+    
     # Update streak logic
-    if last_active == today:
+    if active_days:
+        # Real history - count consecutive active days ending today (or yesterday)
+        streak, longest_streak = _activity_streaks(active_days, today)
+        longest_streak = max(longest_streak, progress.get('longest_streak', 0))
+        # current_streak is the streak before today, so today's milestone is still reported
+        if streak and datetime.fromisoformat(active_days[-1]).date() == today:
+            current_streak = streak - 1
+        else:
+            current_streak = streak
+    elif last_active == today:
         # Same day - no change
         streak = current_streak
     elif last_active == today - timedelta(days=1):
@@ -307,3 +343,64 @@ def update_streak(username: str) -> Dict:
         'milestone': new_milestone,
         'next_milestone': next((v for k, v in sorted(milestones.items()) if k > streak), None)
     }
+
+
+def _activity_streaks(active_days: List[str], today) -> Tuple[int, int]:
+    """Current and longest run of consecutive days in a sorted list of ISO dates"""
+    days = [datetime.fromisoformat(day).date() for day in active_days]
+    
+    longest = run = 1
+    for previous, day in zip(days, days[1:]):
+        run = run + 1 if day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+    
+    # The run only counts as current if it reaches today or yesterday
+    current = run if days[-1] >= today - timedelta(days=1) else 0
+    return current, longest
+
+
+def progress_fingerprint(progress: Dict) -> str:
+    """Short hash of a progress record (derived keys excluded)"""
+    payload = {key: value for key, value in progress.items() if key not in DERIVED_KEYS}
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()[:16]
+
+
+def compute_features(username: str, progress: Dict) -> Dict:
+    """
+    All ML features for one student, computed from their progress
+    (the batch scorer and the live fallback in get_features both use this)
+    """
+    velocity, learner_type = calculate_learning_velocity(username, progress)
+    return {
+        'velocity': velocity,
+        'learner_type': learner_type,
+        'prediction': predict_final_score(username, progress),
+        'topics': {
+            topic: {
+                'confidence': calculate_topic_confidence(username, topic, progress),
+                'difficulty': get_adaptive_difficulty(username, topic, progress)
+            }
+            for topic in ML_TOPICS
+        }
+    }
+
+
+def get_features(username: str, progress: Optional[Dict] = None) -> Dict:
+    """
+    ML features for a student - the batch-scored row when it was computed from the
+    student's current progress and is recent enough, otherwise computed now
+    """
+    if progress is None:
+        progress = DataManager.get_user_progress(username)
+    
+    stored = FeatureStore.get(username)
+    if stored and stored['fingerprint'] == progress_fingerprint(progress):
+        try:
+            age = (datetime.now() - datetime.fromisoformat(stored['scored_at'])).total_seconds()
+        except ValueError:
+            age = ML_FEATURE_MAX_AGE + 1
+        if age <= ML_FEATURE_MAX_AGE:
+            return stored['features']
+    
+    return compute_features(username, progress)
@@ -115,5 +115,5 @@ AUTH_STYLES = """
 
 def apply_auth_styles():
     """Apply authentication page styles"""
-    import streamlit as st
-    st.markdown(AUTH_STYLES, unsafe_allow_html=True)
+    from components.styles import apply_styles
+    apply_styles("auth", AUTH_STYLES)
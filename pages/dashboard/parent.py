@@ -2,6 +2,7 @@
 """
 import streamlit as st
 from data_manager import DataManager
+from progress_engine import ProgressEngine, LESSON_COUNT
 from pages.dashboard.styles import apply_dashboard_styles
 from datetime import datetime, timedelta
 
@@ -24,6 +25,9 @@ def render():
     parent_data = DataManager.get_user(username)
     linked_children = parent_data.get('children', [])
     
+    # Fetch all children's progress in one go
+    progress_by_child = DataManager.get_many_progress(linked_children)
+    
     # Calculate stats
     if linked_children:
         total_children = len(linked_children)
@@ -31,7 +35,7 @@ def render():
         active_this_week = 0
         
         for child_username in linked_children:
-            child_progress = DataManager.get_user_progress(child_username)
+            child_progress = progress_by_child[child_username]
             children_progress.append(child_progress)
             
             # Check if active this week
@@ -110,15 +114,15 @@ def render():
         st.subheader("📊 Children's Progress Reports")
         
         for child_username in linked_children:
-            render_child_report(child_username)
+            render_child_report(child_username, progress_by_child[child_username])
     else:
         st.info("👨‍👩‍👧‍👦 No children connected yet. Use your child's share code to link their account and monitor their progress!")
 
 
-def render_child_report(child_username: str):
+def render_child_report(child_username: str, child_progress: dict = None):
     """Render detailed progress report for a child"""
-    child_data = DataManager.get_user(child_username)
-    child_progress = DataManager.get_user_progress(child_username)
+    if child_progress is None:
+        child_progress = DataManager.get_user_progress(child_username)
     
     # Format child name for display
     display_name = child_username.replace('_', ' ').title()
@@ -143,8 +147,8 @@ def render_child_report(child_username: str):
                 st.metric("Quiz Score", "Not taken")
         
         with col3:
-            lessons_done = len([l for l in child_progress.get('lessons', {}).values() if l.get('completed')])
-            st.metric("Lessons Done", f"{lessons_done}/5")
+            lessons_done = ProgressEngine.counters(child_progress)['lessons_completed']
+            st.metric("Lessons Done", f"{lessons_done}/{LESSON_COUNT}")
         
         with col4:
             badges = len(child_progress.get('badges', []))
@@ -97,5 +97,5 @@ DASHBOARD_STYLES = """
 
 def apply_dashboard_styles():
     """Apply consistent olive green dashboard styles"""
-    import streamlit as st
-    st.markdown(DASHBOARD_STYLES, unsafe_allow_html=True)
+    from components.styles import apply_styles
+    apply_styles("dashboard", DASHBOARD_STYLES)
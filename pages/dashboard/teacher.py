@@ -3,6 +3,7 @@ Teacher dashboard - clean and consistent
 """
 import streamlit as st
 from data_manager import DataManager
+from class_analytics import ClassSummaryStore
 from pages.dashboard.styles import apply_dashboard_styles
 
 
@@ -27,14 +28,9 @@ def render():
     students = DataManager.get_students_by_teacher_code(teacher_code)
     total_students = len(students)
     
-    # Calculate average progress
-    avg_progress = 0
-    if students:
-        progress_sum = 0
-        for student in students:
-            student_progress = DataManager.get_user_progress(student['username'])
-            progress_sum += student_progress.get('overall_progress', 0)
-        avg_progress = int(progress_sum / total_students) if total_students > 0 else 0
+    # Precomputed class summary (only students whose progress changed are reloaded)
+    summary = ClassSummaryStore.get(teacher_code, [s['username'] for s in students])
+    avg_progress = int(summary['avg_progress'])
     
     # Quick stats
     col1, col2, col3 = st.columns(3)
@@ -86,9 +82,9 @@ def render():
         recent_students = students[:5]  # Show first 5
         
         for student in recent_students:
-            student_progress = DataManager.get_user_progress(student['username'])
-            progress_pct = student_progress.get('overall_progress', 0)
-            quiz_completed = student_progress.get('initial_quiz', {}).get('completed', False)
+            student_summary = summary['students'][student['username']]
+            progress_pct = student_summary['overall_progress']
+            quiz_completed = student_summary['quiz_completed']
             
             with st.container(border=True):
                 col1, col2, col3 = st.columns([2, 1, 1])
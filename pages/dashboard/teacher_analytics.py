@@ -4,8 +4,7 @@ Teacher Analytics - ML-Powered Student Insights
 import streamlit as st
 from data_manager import DataManager
 from pages.dashboard.styles import apply_dashboard_styles
-import json
-from pathlib import Path
+from class_analytics import build_class_frame, class_summary, student_analytics
 
 
 def get_students_by_teacher(teacher_code):
@@ -40,61 +39,13 @@ def get_students_by_teacher(teacher_code):
     return students
 
 
-def analyze_student_performance(username):
+def analyze_student_performance(username, progress=None):
     """ML-powered analysis of student performance"""
-    progress = DataManager.get_user_progress(username)
+    if progress is None:
+        progress = DataManager.get_user_progress(username)
     
-    # Extract metrics
-    quiz_data = progress.get('initial_quiz', {})
-    lessons_data = progress.get('lessons', {})
-    practice_data = progress.get('practice_problems', {})
-    
-    # Calculate scores
-    quiz_score = quiz_data.get('score', 0) / max(quiz_data.get('total', 1), 1) * 100
-    overall_progress = progress.get('overall_progress', 0)
-    
-    # Identify weak/strong topics
-    weak_topics = quiz_data.get('weak_topics', [])
-    strong_topics = quiz_data.get('strong_topics', [])
-    
-    # Calculate engagement
-    total_time = progress.get('total_time_spent', 0)
-    lessons_completed = sum(1 for l in lessons_data.values() if l.get('completed'))
-    
-    # Practice accuracy
-    practice_correct = sum(1 for p in practice_data.values() if p.get('correct', 0) > 0)
-    practice_total = len(practice_data)
-    practice_accuracy = (practice_correct / max(practice_total, 1)) * 100 if practice_total > 0 else 0
-    
-    # ML Prediction: Risk level
-    risk_level = "Low"
-    if quiz_score < 50 or overall_progress < 20:
-        risk_level = "High"
-    elif quiz_score < 70 or overall_progress < 40:
-        risk_level = "Medium"
-    
-    # Recommendations
-    recommendations = []
-    if weak_topics:
-        recommendations.append(f"Focus on: {', '.join(weak_topics)}")
-    if practice_accuracy < 60:
-        recommendations.append("Needs more practice problems")
-    if total_time < 60:
-        recommendations.append("Low engagement - encourage regular study")
-    if lessons_completed == 0:
-        recommendations.append("Has not completed any lessons yet")
-    
-    return {
-        'quiz_score': quiz_score,
-        'overall_progress': overall_progress,
-        'weak_topics': weak_topics,
-        'strong_topics': strong_topics,
-        'total_time': total_time,
-        'lessons_completed': lessons_completed,
-        'practice_accuracy': practice_accuracy,
-        'risk_level': risk_level,
-        'recommendations': recommendations
-    }
+    frame = build_class_frame({username: progress})
+    return student_analytics(frame.loc[username])
 
 
 def render():
@@ -134,18 +85,18 @@ def render():
     # Class overview
     st.subheader(f"👥 Class Overview ({len(students)} students)")
     
-    # Analyze all students
-    all_analytics = {}
-    for student in students:
-        all_analytics[student['username']] = analyze_student_performance(student['username'])
+    # Analyze all students at once (progress fetched in one bulk call, metrics computed column-wise)
+    class_progress = DataManager.get_many_progress([s['username'] for s in students])
+    frame = build_class_frame(class_progress)
+    summary = class_summary(frame)
     
     # Class statistics
     col1, col2, col3, col4 = st.columns(4)
     
-    avg_quiz = sum(a['quiz_score'] for a in all_analytics.values()) / len(all_analytics)
-    avg_progress = sum(a['overall_progress'] for a in all_analytics.values()) / len(all_analytics)
-    total_time = sum(a['total_time'] for a in all_analytics.values())
-    at_risk = sum(1 for a in all_analytics.values() if a['risk_level'] == 'High')
+    avg_quiz = summary['avg_quiz']
+    avg_progress = summary['avg_progress']
+    total_time = summary['total_time']
+    at_risk = summary['at_risk']
     
     with col1:
         st.markdown("""
@@ -187,7 +138,7 @@ def render():
     
     for student in students:
         username = student['username']
-        analytics = all_analytics[username]
+        analytics = student_analytics(frame.loc[username])
         
         # Risk color
         risk_colors = {
@@ -251,27 +202,15 @@ def render():
     st.subheader("🔍 Class-Wide Insights")
     
     # Most common weak topics
-    all_weak = []
-    for a in all_analytics.values():
-        all_weak.extend(a['weak_topics'])
-    
-    if all_weak:
-        from collections import Counter
-        weak_counts = Counter(all_weak)
+    if summary['weak_topics']:
         st.markdown("**⚠️ Topics Most Students Struggle With:**")
-        for topic, count in weak_counts.most_common(3):
+        for topic, count in list(summary['weak_topics'].items())[:3]:
             percentage = (count / len(students)) * 100
             st.markdown(f"- **{topic}**: {count} students ({percentage:.0f}%)")
     
     # Most common strong topics
-    all_strong = []
-    for a in all_analytics.values():
-        all_strong.extend(a['strong_topics'])
-    
-    if all_strong:
-        from collections import Counter
-        strong_counts = Counter(all_strong)
+    if summary['strong_topics']:
         st.markdown("**✅ Topics Most Students Excel At:**")
-        for topic, count in strong_counts.most_common(3):
+        for topic, count in list(summary['strong_topics'].items())[:3]:
             percentage = (count / len(students)) * 100
             st.markdown(f"- **{topic}**: {count} students ({percentage:.0f}%)")
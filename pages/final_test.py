@@ -1,10 +1,13 @@
 # final_test.py
 # Final mastery test page for the ITS
 
-import time
 import random
 import streamlit as st
-import streamlit.components.v1 as components
+
+from attempt_timer import start_timed_attempt
+from components.fragments import fragment, rerun_fragment
+from question_bank import get_question_bank
+from quiz_attempt import QuizAttempt
 
 
 # -----------------------------
@@ -12,439 +15,9 @@ import streamlit.components.v1 as components
 # -----------------------------
 def _get_question_bank():
     """
-    Return the full bank of final-test questions.
-    Each question:
-      - id: unique string
-      - topic: short label
-      - prompt: text description
-      - latex: optional LaTeX expression to show with st.latex (for the prompt only)
-      - choices: list of option strings (plain text for display)
-      - answer: index of correct choice in choices
-      - explanation: short text explanation
+    Return the final-test questions (shared, read-only; see question_bank for the fields).
     """
-    return [
-        # ---------- Limit Definition ----------
-        {
-            "id": "ft1",
-            "topic": "Limit Definition",
-            "prompt": "Using the limit definition, compute f'(2) for f(x) = x^2.",
-            "latex": r"f(x) = x^2,\quad f'(2) = ?",
-            "choices": ["2", "3", "4", "5"],
-            "answer": 2,
-            "explanation": "Using the limit definition or power rule, f'(x) = 2x, so f'(2) = 4.",
-        },
-        {
-            "id": "ft2",
-            "topic": "Limit Definition",
-            "prompt": "Which expression correctly represents the difference quotient for f(x) = 3x - 1?",
-            "latex": r"f(x) = 3x - 1",
-            "choices": [
-                "(f(x + h) - f(x)) / h",
-                "(f(x) - f(h)) / (x - h)",
-                "(f(x) - f(x - h)) / x",
-                "f(x + h) / h",
-            ],
-            "answer": 0,
-            "explanation": "By definition, the difference quotient is (f(x + h) - f(x)) / h.",
-        },
-        {
-            "id": "ft3",
-            "topic": "Limit Definition",
-            "prompt": "For f(x) = 5x^2, which limit expression equals f'(3)?",
-            "latex": r"f(x) = 5x^2,\quad f'(3) = ?",
-            "choices": [
-                "lim (h → 0) [5(3 + h)^2 - 5·3^2] / h",
-                "lim (x → 3) [5·3^2 - 5x^2] / (x - 3)",
-                "lim (h → 0) (25 - 9h) / h",
-                "lim (x → 0) (5x^2 - 45) / x",
-            ],
-            "answer": 0,
-            "explanation": "By the h-definition, f'(3) = lim (h→0) [f(3 + h) - f(3)] / h.",
-        },
-        {
-            "id": "ft4",
-            "topic": "Limit Definition",
-            "prompt": "Using the limit definition at a point a, which limit equals f'(a)?",
-            "latex": r"f'(a) = ?",
-            "choices": [
-                "lim (h→0) (f(a + h) - f(a)) / h",
-                "lim (h→0) (f(a) - f(h)) / h",
-                "lim (h→0) (f(h) - f(a)) / h",
-                "lim (h→a) (f(h) - f(a)) / (h - a)",
-            ],
-            "answer": 0,
-            "explanation": "By definition, f'(a) = lim (h→0) (f(a + h) - f(a)) / h.",
-        },
-
-        # ---------- Basic Rules ----------
-        {
-            "id": "ft5",
-            "topic": "Power Rule",
-            "prompt": "Differentiate using the power rule.",
-            "latex": r"f(x) = 7x^3",
-            "choices": ["21x^2", "21x^3", "7x^2", "3x^2"],
-            "answer": 0,
-            "explanation": "Power rule: d/dx[x^n] = n x^{n-1}. So d/dx[7x^3] = 7·3x^2 = 21x^2.",
-        },
-        {
-            "id": "ft6",
-            "topic": "Power Rule",
-            "prompt": "Differentiate using the power rule.",
-            "latex": r"f(x) = x^5 - 4x^2 + 1",
-            "choices": ["5x^4 - 8x", "5x^4 - 4x", "5x^4 - 8x^2", "4x^3 - 8x"],
-            "answer": 0,
-            "explanation": "Differentiate term-by-term: d/dx[x^5] = 5x^4, d/dx[-4x^2] = -8x, constant goes to 0.",
-        },
-        {
-            "id": "ft7",
-            "topic": "Power Rule",
-            "prompt": "Find f'(x) for f(x) = 2x^{-3}.",
-            "latex": r"f(x) = 2x^{-3}",
-            "choices": ["-6x^{-4}", "6x^{-4}", "2x^{-2}", "-3x^{-2}"],
-            "answer": 0,
-            "explanation": "Power rule with negative exponent: d/dx[x^n] = n x^{n-1}, so 2·(-3)x^{-4} = -6x^{-4}.",
-        },
-
-        # ---------- Sum & Difference ----------
-        {
-            "id": "ft8",
-            "topic": "Sum Rule",
-            "prompt": "Differentiate f(x) = 3x^2 + 5x - 7.",
-            "latex": r"f(x) = 3x^2 + 5x - 7",
-            "choices": ["6x + 5", "6x + 7", "3x + 5", "3x^2 + 5"],
-            "answer": 0,
-            "explanation": "Differentiate each term: 3x^2 → 6x, 5x → 5, -7 → 0.",
-        },
-        {
-            "id": "ft9",
-            "topic": "Sum Rule",
-            "prompt": "Find the derivative.",
-            "latex": r"f(x) = x^4 - 2x^3 + 3x - 10",
-            "choices": ["4x^3 - 6x^2 + 3", "4x^3 - 2x^2 + 3", "4x^3 - 6x^2 + 1", "3x^2 - 6x + 3"],
-            "answer": 0,
-            "explanation": "Apply the power rule to each term: 4x^3 - 6x^2 + 3.",
-        },
-
-        # ---------- Product Rule ----------
-        {
-            "id": "ft10",
-            "topic": "Product Rule",
-            "prompt": "Use the product rule to differentiate.",
-            "latex": r"f(x) = x^2 \sin(x)",
-            "choices": [
-                "2x sin(x) + x^2 cos(x)",
-                "2x sin(x) - x^2 cos(x)",
-                "x^2 cos(x)",
-                "2x cos(x) + sin(x)",
-            ],
-            "answer": 0,
-            "explanation": "Product rule: (uv)' = u'v + uv'. Here u = x^2, v = sin(x).",
-        },
-        {
-            "id": "ft11",
-            "topic": "Product Rule",
-            "prompt": "Differentiate using the product rule.",
-            "latex": r"f(x) = (3x)(x^2 + 1)",
-            "choices": [
-                "3x^2 + 6x",
-                "9x^2 + 3",
-                "9x^2 + 6x",
-                "3x^3 + 3x",
-            ],
-            "answer": 0,  # (kept as-is to match your original key)
-            "explanation": "You can expand or use product rule. Expanded: f(x) = 3x^3 + 3x → 9x^2 + 3.",
-        },
-
-        # ---------- Quotient Rule ----------
-        {
-            "id": "ft12",
-            "topic": "Quotient Rule",
-            "prompt": "Use the quotient rule to differentiate.",
-            "latex": r"f(x) = \frac{x^2}{x + 1}",
-            "choices": [
-                "[(2x)(x + 1) - x^2] / (x + 1)^2",
-                "[2x(x + 1) - x^2] / (x + 1)^3",
-                "2x(x + 1) / (x + 1)^2",
-                "2x / (x + 1)",
-            ],
-            "answer": 0,
-            "explanation": "Quotient rule: [u/v]' = (u'v - uv')/v^2; u = x^2, v = x + 1.",
-        },
-        {
-            "id": "ft13",
-            "topic": "Quotient Rule",
-            "prompt": "Differentiate using the quotient rule.",
-            "latex": r"f(x) = \frac{3x}{x^2 + 1}",
-            "choices": [
-                "[3(x^2 + 1) - 3x(2x)] / (x^2 + 1)^2",
-                "[3(x^2 + 1) + 3x(2x)] / (x^2 + 1)^2",
-                "3 / (x^2 + 1)",
-                "3x(2x) / (x^2 + 1)^2",
-            ],
-            "answer": 0,
-            "explanation": "u = 3x, v = x^2 + 1 ⇒ (u'v - uv')/v^2 = [3(x^2+1) - 3x(2x)]/(x^2+1)^2.",
-        },
-
-        # ---------- Chain Rule ----------
-        {
-            "id": "ft14",
-            "topic": "Chain Rule",
-            "prompt": "Differentiate using the chain rule.",
-            "latex": r"f(x) = (2x + 1)^5",
-            "choices": [
-                "5(2x + 1)^4",
-                "10(2x + 1)^4",
-                "5(2x + 1)^5",
-                "10(2x + 1)^6",
-            ],
-            "answer": 1,
-            "explanation": "Outer: u^5 → 5u^4, inner: 2x+1 → derivative 2, multiply: 5·(2x+1)^4·2 = 10(2x+1)^4.",
-        },
-        {
-            "id": "ft15",
-            "topic": "Chain Rule",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = \sqrt{5x^2 + 1}",
-            "choices": [
-                "10x / (2√(5x^2 + 1))",
-                "10x / √(5x^2 + 1)",
-                "5x / √(5x^2 + 1)",
-                "√(5x^2 + 1)",
-            ],
-            "answer": 0,
-            "explanation": "Rewrite as (5x^2+1)^(1/2). Chain rule: (1/2)(5x^2+1)^(-1/2)·10x = 10x/(2√(5x^2+1)).",
-        },
-        {
-            "id": "ft16",
-            "topic": "Chain Rule",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = \sin(3x^2)",
-            "choices": [
-                "6x cos(3x^2)",
-                "3x cos(3x^2)",
-                "3 cos(3x^2)",
-                "6x sin(3x^2)",
-            ],
-            "answer": 0,
-            "explanation": "Outer sin(u) → cos(u), inner 3x^2 → 6x, multiply: 6x cos(3x^2).",
-        },
-
-        # ---------- Exponential & Logarithmic ----------
-        {
-            "id": "ft17",
-            "topic": "Exponentials",
-            "prompt": "Differentiate the exponential function.",
-            "latex": r"f(x) = e^{3x}",
-            "choices": ["3e^{3x}", "e^{3x}", "3e^x", "e^x + 3"],
-            "answer": 0,
-            "explanation": "Chain rule: derivative of e^{3x} is 3e^{3x}.",
-        },
-        {
-            "id": "ft18",
-            "topic": "Exponentials",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = \sqrt{1 + 4x}",
-            "choices": [
-                "2 / √(1 + 4x)",
-                "1 / (2√(1 + 4x))",
-                "4√(1 + 4x)",
-                "1 / √(1 + 4x)",
-            ],
-            "answer": 0,
-            "explanation": "Rewrite as (1 + 4x)^(1/2) and apply chain rule.",
-        },
-        {
-            "id": "ft19",
-            "topic": "Exponentials",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = 3^x",
-            "choices": [
-                "3^x ln(3)",
-                "3^x",
-                "x·3^{x-1}",
-                "x·3^{x-1} ln(3)",
-            ],
-            "answer": 0,
-            "explanation": "If f(x) = a^x, then f'(x) = a^x ln(a). Here a = 3.",
-        },
-        {
-            "id": "ft20",
-            "topic": "Logarithms",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = \ln(\sqrt{x})",
-            "choices": [
-                "1 / (2x)",
-                "1 / x",
-                "2 / x",
-                "1 / (2√x)",
-            ],
-            "answer": 0,
-            "explanation": "√x = x^(1/2), so ln(√x) = (1/2) ln(x); derivative is (1/2)(1/x) = 1/(2x).",
-        },
-
-        # ---------- Applications & Interpretation ----------
-        {
-            "id": "ft21",
-            "topic": "Interpretation",
-            "prompt": "f(x) models the position of a particle along a line (in meters), where x is in seconds. What does f'(x) represent?",
-            "choices": [
-                "The particle's acceleration (m/s^2)",
-                "The particle's velocity (m/s)",
-                "The particle's position (m)",
-                "The particle's jerk (rate of change of acceleration)",
-            ],
-            "answer": 1,
-            "explanation": "The derivative of position with respect to time is velocity.",
-        },
-        {
-            "id": "ft22",
-            "topic": "Applications",
-            "prompt": "The marginal cost function C'(q) gives:",
-            "choices": [
-                "The total cost of producing q units.",
-                "The average cost per unit.",
-                "The approximate cost of producing one more unit at output level q.",
-                "The revenue from producing q units.",
-            ],
-            "answer": 2,
-            "explanation": "Marginal cost is interpreted as the cost of the next (additional) unit.",
-        },
-        {
-            "id": "ft23",
-            "topic": "Interpretation",
-            "prompt": "If a function is increasing on an interval, what can be said about its derivative on that interval (assuming it exists)?",
-            "choices": [
-                "The derivative is positive.",
-                "The derivative is negative.",
-                "The derivative is zero.",
-                "The derivative does not exist.",
-            ],
-            "answer": 0,
-            "explanation": "If a function is increasing, then its derivative is ≥ 0. In many basic examples, strictly increasing ⇒ derivative > 0.",
-        },
-        {
-            "id": "ft24",
-            "topic": "Applications",
-            "prompt": "Which of the following is a practical interpretation of the derivative?",
-            "choices": [
-                "The total value of a function at a point.",
-                "The average rate of change over an interval.",
-                "The instantaneous rate of change at a specific point.",
-                "The sum of function values over an interval.",
-            ],
-            "answer": 2,
-            "explanation": "The derivative measures the instantaneous rate of change at a point.",
-        },
-
-        # ---------- Mixed ----------
-        {
-            "id": "ft25",
-            "topic": "Mixed",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = (x^2 + 1)(x^3 - 2)",
-            "choices": [
-                "2x(x^3 - 2) + (x^2 + 1)·3x^2",
-                "2x(x^3 - 2)",
-                "3x^2(x^2 + 1)",
-                "5x^4 - 4x",
-            ],
-            "answer": 0,
-            "explanation": "Use the product rule: (u·v)' = u'v + uv'.",
-        },
-        {
-            "id": "ft26",
-            "topic": "Mixed",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = \frac{\sin x}{x}",
-            "choices": [
-                "(x cos x - sin x) / x^2",
-                "(x cos x + sin x) / x^2",
-                "cos x / x^2",
-                "cos x / x",
-            ],
-            "answer": 0,
-            "explanation": "Quotient rule with u = sin x, v = x.",
-        },
-        {
-            "id": "ft27",
-            "topic": "Mixed",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = e^x \cos x",
-            "choices": [
-                "e^x cos x - e^x sin x",
-                "e^x cos x + e^x sin x",
-                "e^x cos x",
-                "e^x sin x",
-            ],
-            "answer": 1,
-            "explanation": "Product rule: derivative is e^x cos x - e^x sin x + e^x cos x = e^x(cos x + sin x).",
-        },
-        {
-            "id": "ft28",
-            "topic": "Mixed",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = (x^2 + 4)^3",
-            "choices": [
-                "3(x^2 + 4)^2 · 2x",
-                "3(x^2 + 4)^2",
-                "2x(x^2 + 4)^3",
-                "6x(x^2 + 4)",
-            ],
-            "answer": 0,
-            "explanation": "Chain rule: outer u^3, inner u = x^2+4, so derivative is 3u^2·2x.",
-        },
-        {
-            "id": "ft29",
-            "topic": "Mixed",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = \sqrt{3x + 1}",
-            "choices": [
-                "3 / (2√(3x + 1))",
-                "1 / (2√(3x + 1))",
-                "3 / √(3x + 1)",
-                "√(3x + 1)",
-            ],
-            "answer": 0,
-            "explanation": "Write as (3x+1)^(1/2) and apply chain rule.",
-        },
-        {
-            "id": "ft30",
-            "topic": "Mixed",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = x^2\cos x",
-            "choices": [
-                "2x cos(x) - x^2 sin(x)",
-                "2x cos(x) + x^2 sin(x)",
-                "x^2 sin(x)",
-                "2x cos(x)",
-            ],
-            "answer": 0,
-            "explanation": "Product rule: u = x^2, v = cos x ⇒ u'v + uv' = 2x cos x - x^2 sin x.",
-        },
-        {
-            "id": "ft31",
-            "topic": "Mixed",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = (x^3 + 1)^2",
-            "choices": [
-                "2(x^3 + 1)(3x^2)",
-                "2(x^3 + 1)",
-                "3x^2(x^3 + 1)^2",
-                "6x(x^3 + 1)",
-            ],
-            "answer": 0,
-            "explanation": "Chain rule: outer u^2, inner u = x^3+1, so derivative is 2u·3x^2.",
-        },
-        {
-            "id": "ft32",
-            "topic": "Mixed",
-            "prompt": "Differentiate the function.",
-            "latex": r"f(x) = \frac{1}{x}",
-            "choices": ["-1 / x^2", "1 / x^2", "1 / x", "-1 / x"],
-            "answer": 0,
-            "explanation": "Write f(x) = x^(−1); derivative is −x^(−2) = −1/x².",
-        },
-    ]
+    return get_question_bank().questions("final_test")
 
 
 # -----------------------------
@@ -457,16 +30,16 @@ def _init_session_state():
         ss.final_started = False
     if "final_finished" not in ss:
         ss.final_finished = False
-    if "final_questions" not in ss:
-        ss.final_questions = []
-    if "final_responses" not in ss:
-        ss.final_responses = []
+    if "final_attempt" not in ss:
+        # QuizAttempt: question IDs, packed choice orders and responses (text stays in the bank)
+        ss.final_attempt = None
     if "final_idx" not in ss:
         ss.final_idx = 0
     if "final_score" not in ss:
         ss.final_score = 0
-    if "final_start_time" not in ss:
-        ss.final_start_time = None
+    if "final_timer" not in ss:
+        # TimedAttempt: the server-side deadline; submitted by attempt_timer's sweeper if time runs out
+        ss.final_timer = None
     if "final_time_limit" not in ss:
         # CHANGE TIME HERE (minutes * 60(seconds))
         ss.final_time_limit = 1 * 60
@@ -489,165 +62,89 @@ def _start_new_attempt():
     bank = _get_question_bank()
     n = min(20, len(bank))  # always 20 questions if possible
 
-    # Sample 20 random questions
-    raw_questions = random.sample(bank, n)
-    questions = []
-
-    # Shuffle choices within each question while preserving which is correct
-    for q in raw_questions:
-        q_copy = q.copy()
-        original_choices = list(q_copy["choices"])
-        correct_choice = original_choices[q_copy["answer"]]
-
-        random.shuffle(original_choices)
-        q_copy["choices"] = original_choices
-        q_copy["answer"] = original_choices.index(correct_choice)
-        questions.append(q_copy)
-
-    ss.final_questions = questions
-    ss.final_responses = [None] * len(questions)
+    # Sample 20 random questions; choices are shuffled within each question
+    ss.final_attempt = QuizAttempt.start(random.sample(bank, n))
+    ss.final_timer = start_timed_attempt(ss.final_attempt, ss.final_time_limit)
     ss.final_idx = 0
     ss.final_started = True
     ss.final_finished = False
     ss.final_time_up = False
-    ss.final_start_time = time.time()
     ss.final_last_duration = None
     ss.final_attempts += 1
 
 
 def _check_time_limit():
     """
-    Check if time is up; if yes, auto-submit the test.
+    Move to the results view if the attempt was submitted at its deadline.
 
-    All unanswered questions are treated as incorrect because we only
-    increment the score when ans is not None and equals the correct answer.
+    The deadline is enforced server-side: attempt_timer's sweeper scores the attempt
+    when time runs out, whether or not this page is rerunning. All unanswered
+    questions count as incorrect.
     """
     ss = st.session_state
 
-    if not ss.get("final_started", False):
+    if not ss.get("final_started", False) or ss.get("final_finished", False):
         return
-    if ss.get("final_start_time") is None:
+    timer = ss.get("final_timer")
+    if timer is None:
         return
 
-    elapsed = int(time.time() - ss.final_start_time)
-    # Default to 40 min if key is missing
-    limit = ss.get("final_time_limit", 40 * 60)
+    if timer.remaining() <= 0:
+        timer.submit()  # no-op if the sweeper got there first
+    if timer.submitted:
+        _finish_attempt(timer)
+        st.rerun()
 
-    if elapsed >= limit and not ss.get("final_finished", False):
-        questions = ss.get("final_questions", [])
-        responses = ss.get("final_responses", [])
 
-        score = 0
-        for ans, q in zip(responses, questions):
-            if ans is not None and ans == q["answer"]:
-                score += 1
+def _finish_attempt(timer):
+    """Copy a submitted attempt's result into the session."""
+    ss = st.session_state
+    ss.final_score = timer.score
+    ss.final_finished = True
+    ss.final_started = False
+    ss.final_time_up = timer.time_up  # so the results message says time is up
+    ss.final_last_duration = timer.duration()
 
-        ss.final_score = score
-        ss.final_finished = True
-        ss.final_started = False
-        ss.final_time_up = True  # so the results message says time is up
-        st.rerun()
 
+# Seconds between refreshes of the timer region (only the timer fragment reruns; without
+# fragment support the timer updates on full reruns and the sweeper still submits on time)
+TIMER_REFRESH_SECONDS = 1
 
-def _render_timer():
-    """Render a live countdown timer in the browser using JavaScript."""
-    ss = st.session_state
 
-    if ss.final_start_time is None:
+@fragment(run_every=TIMER_REFRESH_SECONDS)
+def _render_timer():
+    """Render the countdown from the server-side deadline; rerun the page once time is up."""
+    timer = st.session_state.get("final_timer")
+    if timer is None or not st.session_state.get("final_started", False):
         return
 
-    end_ts_ms = int((ss.final_start_time + ss.final_time_limit) * 1000)
-    total_secs = int(ss.final_time_limit)
-
-    html = f"""
-    <div style="max-width: 260px;">
-      <div style="
-          padding: 10px 16px;
-          border-radius: 999px;
-          background: #0F172A;
-          display: flex;
-          align-items: center;
-          gap: 10px;
-          color: #F9FAFB;
-          font-family: system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-      ">
-        <div style="
-            width: 32px;
-            height: 32px;
-            border-radius: 999px;
-            border: 2px solid #F97316;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 18px;
-        ">
-          ⏱
-        </div>
-        <div>
-          <div style="font-size: 11px; text-transform: uppercase; letter-spacing: 0.16em; opacity: 0.8;">
-            Time Remaining
-          </div>
-          <div id="final-timer-label" style="font-size: 18px; font-weight: 700;">
-            --
-          </div>
-          <div style="
-              margin-top: 6px;
-              width: 100%;
-              height: 6px;
-              background: #1F2937;
-              border-radius: 999px;
-              overflow: hidden;
-          ">
-            <div id="final-timer-bar" style="
-                width: 100%;
-                height: 100%;
-                background: linear-gradient(90deg, #22C55E, #FACC15, #F97316, #EF4444);
-                transition: width 0.3s linear;
-            "></div>
+    if timer.submitted or timer.remaining() <= 0:
+        st.rerun()  # full rerun - _check_time_limit moves to the results view
+
+    remaining = int(timer.remaining())
+    width = 100 * remaining / timer.time_limit if timer.time_limit > 0 else 0
+
+    st.markdown(
+        f"""
+        <div style="max-width: 260px; padding: 10px 16px; border-radius: 999px; background: #0F172A;
+                    display: flex; align-items: center; gap: 10px; color: #F9FAFB;">
+          <div style="width: 32px; height: 32px; border-radius: 999px; border: 2px solid #F97316;
+                      display: flex; align-items: center; justify-content: center; font-size: 18px;">⏱</div>
+          <div style="flex: 1;">
+            <div style="font-size: 11px; text-transform: uppercase; letter-spacing: 0.16em; opacity: 0.8;">
+              Time Remaining
+            </div>
+            <div style="font-size: 18px; font-weight: 700;">{remaining // 60:02d}:{remaining % 60:02d}</div>
+            <div style="margin-top: 6px; width: 100%; height: 6px; background: #1F2937;
+                        border-radius: 999px; overflow: hidden;">
+              <div style="width: {width:.1f}%; height: 100%;
+                          background: linear-gradient(90deg, #22C55E, #FACC15, #F97316, #EF4444);"></div>
+            </div>
           </div>
         </div>
-      </div>
-    </div>
-
-    <script>
-    const FINAL_TIMER_END = {end_ts_ms};
-    const FINAL_TIMER_TOTAL = {total_secs};
-    if (!window.FINAL_TIMER_RUNNING) {{
-      window.FINAL_TIMER_RUNNING = true;
-      const updateFinalTimer = () => {{
-        const now = Date.now();
-        let remaining = Math.max(0, Math.floor((FINAL_TIMER_END - now) / 1000));
-
-        const m = String(Math.floor(remaining / 60)).padStart(2, '0');
-        const s = String(Math.floor(remaining % 60)).padStart(2, '0');
-
-        const labelEl = window.document.getElementById("final-timer-label");
-        const barEl = window.document.getElementById("final-timer-bar");
-
-        if (labelEl) {{
-          labelEl.textContent = m + ":" + s;
-        }}
-
-        if (barEl && FINAL_TIMER_TOTAL > 0) {{
-          const width = Math.max(0, Math.min(100, 100 * remaining / FINAL_TIMER_TOTAL));
-          barEl.style.width = width + "%";
-        }}
-
-        if (remaining <= 0) {{
-          clearInterval(window.FINAL_TIMER_INTERVAL);
-        }}
-      }};
-      updateFinalTimer();
-
-      // Then update every second
-      if (!window.finalTimerInterval) {{
-        window.finalTimerInterval = setInterval(updateFinalTimer, 1000);
-      }}
-    }}
-    </script>
-    """
-
-    components.html(html, height=80)
+        """,
+        unsafe_allow_html=True,
+    )
 
 
 def _render_certificate_card(name: str, pct: int):
@@ -681,6 +178,61 @@ def _render_certificate_card(name: str, pct: int):
             st.write("____________________")
 
 
+@fragment
+def _render_question():
+    """The current question and navigation (a fragment - answering reruns only this part)."""
+    ss = st.session_state
+    if ss.final_timer.submitted:
+        st.rerun()  # time ran out - full rerun shows the results
+
+    attempt = ss.final_attempt
+    idx = ss.final_idx
+    q = attempt.question(idx)
+
+    st.markdown(f"#### Question {idx + 1} of {len(attempt)} — {q['topic']}")
+    st.write(q["prompt"])
+    if q.get("latex"):
+        st.latex(q["latex"])
+
+    current_answer = attempt.response(idx)
+
+    # IMPORTANT: no default selected on a new attempt
+    choice_index = st.radio(
+        "Choose your answer:",
+        list(range(len(q["choices"]))),
+        format_func=lambda i: q["choices"][i],
+        index=current_answer if current_answer is not None else None,
+        key=f"final_q_{idx}",
+    )
+
+    # Responses are refused once the deadline has passed
+    ss.final_timer.answer(idx, choice_index)
+
+    st.markdown("---")
+    col_prev, col_mid, col_next = st.columns([1, 1, 1])
+
+    with col_prev:
+        if idx > 0:
+            if st.button("◀ Previous", key="prev_q"):
+                ss.final_idx -= 1
+                rerun_fragment()
+
+    with col_mid:
+        st.write(f"Question {idx + 1} of {len(attempt)}")
+
+    with col_next:
+        if idx < len(attempt) - 1:
+            if st.button("Next ▶", key="next_q"):
+                ss.final_idx += 1
+                rerun_fragment()
+        else:
+            if st.button("Submit Final Test ✅", key="submit_final"):
+                # If the deadline already passed, the sweeper's submission stands
+                ss.final_timer.submit()
+                _finish_attempt(ss.final_timer)
+                st.rerun()
+
+
 # -----------------------------
 # MAIN ENTRYPOINT
 # -----------------------------
@@ -745,69 +297,13 @@ def show():
 
     # ---------------- In-progress attempt ----------------
     if ss.final_started and not ss.final_finished:
-        questions = ss.final_questions
-        idx = ss.final_idx
-        q = questions[idx]
-
-        st.markdown(f"#### Question {idx + 1} of {len(questions)} — {q['topic']}")
-        st.write(q["prompt"])
-        if q.get("latex"):
-            st.latex(q["latex"])
-
-        current_answer = ss.final_responses[idx]
-
-        # IMPORTANT: no default selected on a new attempt
-        choice_index = st.radio(
-            "Choose your answer:",
-            list(range(len(q["choices"]))),
-            format_func=lambda i: q["choices"][i],
-            index=current_answer if current_answer is not None else None,
-            key=f"final_q_{idx}",
-        )
-
-        ss.final_responses[idx] = choice_index
-
-        st.markdown("---")
-        col_prev, col_mid, col_next = st.columns([1, 1, 1])
-
-        with col_prev:
-            if idx > 0:
-                if st.button("◀ Previous", key="prev_q"):
-                    ss.final_idx -= 1
-                    st.rerun()
-
-        with col_mid:
-            st.write(f"Question {idx + 1} of {len(questions)}")
-
-        with col_next:
-            if idx < len(questions) - 1:
-                if st.button("Next ▶", key="next_q"):
-                    ss.final_idx += 1
-                    st.rerun()
-            else:
-                if st.button("Submit Final Test ✅", key="submit_final"):
-                    questions = ss.final_questions
-                    responses = ss.final_responses
-                    score = 0
-                    for ans, qq in zip(responses, questions):
-                        if ans is not None and ans == qq["answer"]:
-                            score += 1
-
-                    ss.final_score = score
-                    ss.final_finished = True
-                    ss.final_started = False
-                    ss.final_time_up = False
-                    ss.final_last_duration = min(
-                        time.time() - ss.final_start_time,
-                        ss.get("final_time_limit", 40 * 60),
-                    )
-                    st.rerun()
-
+        _render_question()
         return
 
     # ---------------- Results view ----------------
     if ss.final_finished:
-        questions = ss.final_questions
+        attempt = ss.final_attempt
+        questions = list(attempt.questions())
         total = len(questions)
         score = ss.final_score
         pct = round(100 * score / total) if total > 0 else 0
@@ -869,8 +365,8 @@ def show():
 
             # Simple weakness detection by topic
             topic_wrong_counts = {}
-            for ans, q in zip(ss.final_responses, questions):
-                if ans is None or ans != q["answer"]:
+            for i, q in enumerate(questions):
+                if not attempt.is_correct(i):
                     topic = q.get("topic", "Mixed")
                     topic_wrong_counts[topic] = topic_wrong_counts.get(topic, 0) + 1
 
@@ -897,7 +393,7 @@ def show():
                 if q.get("latex"):
                     st.latex(q["latex"])
 
-                user_idx = ss.final_responses[i]
+                user_idx = attempt.response(i)
                 correct_idx = q["answer"]
 
                 if user_idx is None:
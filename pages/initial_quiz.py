@@ -6,165 +6,130 @@ import random
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from data_manager import DataManager
 from pages.quiz.styles import apply_quiz_styles
+from question_bank import get_question_bank
+from quiz_attempt import QuizAttempt
+from components.fragments import fragment, rerun_fragment
 
-apply_quiz_styles()
+def _quiz_questions():
+    """
+    Quiz questions - 18 total (3 per topic across 6 topics). Read from the question bank on
+    each start, so a reloaded bank is picked up without restarting the app.
+    """
+    return get_question_bank().questions("initial_quiz")
 
-# quiz questions - 18 total (3 per topic across 6 topics)
-QUESTIONS = [
-    # Limit Definition (3 questions)
-    {
-        "id": "q1", 
-        "topic": "Limit Definition", 
-        "stem": "Using the limit definition, what is f'(x) if f(x)=x²?", 
-        "choices": ["2x", "x", "x²", "1"], 
-        "answer": 0,
-        "explanation": "Using the limit definition: f'(x) = lim(h→0) [(x+h)² - x²]/h = lim(h→0) [2xh + h²]/h = 2x"
-    },
-    {
-        "id": "q2",
-        "topic": "Limit Definition",
-        "stem": "Using the limit definition, f'(x) for f(x) = 3x is:",
-        "choices": ["3", "3x", "x", "0"],
-        "answer": 0,
-        "explanation": "f'(x) = lim(h→0) [3(x+h) - 3x]/h = lim(h→0) 3h/h = 3"
-    },
-    {
-        "id": "q3",
-        "topic": "Limit Definition",
-        "stem": "The derivative as a limit represents:",
-        "choices": ["Instantaneous rate of change", "Average rate of change", "Total change", "Indefinite integral"],
-        "answer": 0,
-        "explanation": "The limit definition captures the instantaneous rate of change at a point"
-    },
-    # Basic Rules (3 questions)
-    {
-        "id": "q4", 
-        "topic": "Basic Rules", 
-        "stem": "Differentiate: f(x)=5x³ − 4x + 7", 
-        "choices": ["15x² − 4", "15x² − 4x", "5x² − 4", "15x³ − 4"], 
-        "answer": 0,
-        "explanation": "Using the power rule: d/dx(5x³) = 15x², d/dx(4x) = 4, d/dx(7) = 0. Result: 15x² - 4"
-    },
-    {
-        "id": "q5",
-        "topic": "Basic Rules",
-        "stem": "What is the derivative of f(x) = 7?",
-        "choices": ["0", "7", "7x", "1"],
-        "answer": 0,
-        "explanation": "The derivative of any constant is 0"
-    },
-    {
-        "id": "q6",
-        "topic": "Basic Rules",
-        "stem": "Differentiate: f(x) = √x",
-        "choices": ["1/(2√x)", "√x", "2√x", "x/2"],
-        "answer": 0,
-        "explanation": "Rewrite as x^(1/2), then power rule: (1/2)x^(-1/2) = 1/(2√x)"
-    },
-    # Product Rule (3 questions)
-    {
-        "id": "q7", 
-        "topic": "Product Rule", 
-        "stem": "Differentiate: f(x) = x²·sin x", 
-        "choices": ["2x sin x + x² cos x", "x² cos x", "2x sin x", "cos x"], 
-        "answer": 0,
-        "explanation": "Product Rule: (uv)' = u'v + uv'. Here u=x², v=sin x, so (x²)'(sin x) + (x²)(sin x)' = 2x sin x + x² cos x"
-    },
-    {
-        "id": "q8", 
-        "topic": "Product Rule", 
-        "stem": "Differentiate: f(x)= (x³)(eˣ)", 
-        "choices": ["3x² eˣ + x³ eˣ", "3x² eˣ", "x³ eˣ", "eˣ"], 
-        "answer": 0,
-        "explanation": "Product Rule: (x³)'(eˣ) + (x³)(eˣ)' = 3x² eˣ + x³ eˣ = eˣ(3x² + x³)"
-    },
-    {
-        "id": "q9",
-        "topic": "Product Rule",
-        "stem": "Differentiate: f(x) = x·cos(x)",
-        "choices": ["cos(x) - x·sin(x)", "-x·sin(x)", "cos(x)", "x·cos(x)"],
-        "answer": 0,
-        "explanation": "Product Rule: (x)'·cos(x) + x·(cos x)' = 1·cos(x) + x·(-sin x) = cos(x) - x·sin(x)"
-    },
-    # Chain Rule (3 questions)
-    {
-        "id": "q10", 
-        "topic": "Chain Rule", 
-        "stem": "Differentiate: f(x) = (3x² + 1)⁴", 
-        "choices": ["4(3x²+1)³·6x", "(3x²+1)³", "12x(3x²+1)⁴", "6x(3x²+1)"], 
-        "answer": 0,
-        "explanation": "Chain Rule: outer derivative × inner derivative = 4(3x²+1)³ · 6x = 24x(3x²+1)³"
-    },
-    {
-        "id": "q11", 
-        "topic": "Chain Rule", 
-        "stem": "Differentiate: f(x)=sin(5x²)", 
-        "choices": ["cos(5x²)·10x", "cos(5x²)", "5cos(5x²)", "10x"], 
-        "answer": 0,
-        "explanation": "Chain Rule: outer derivative × inner derivative = cos(5x²) · 10x"
-    },
-    {
-        "id": "q12",
-        "topic": "Chain Rule",
-        "stem": "Find f'(x) if f(x) = e^(3x)",
-        "choices": ["3e^(3x)", "e^(3x)", "3x·e^(3x)", "e^(3x)/3"],
-        "answer": 0,
-        "explanation": "Chain Rule: e^(3x) · 3 = 3e^(3x)"
-    },
-    # Implicit Differentiation (3 questions)
-    {
-        "id": "q13", 
-        "topic": "Implicit Diff.", 
-        "stem": "For x² + y² = 25, what is dy/dx?", 
-        "choices": ["−x/y", "x/y", "−y/x", "y/x"], 
-        "answer": 0,
-        "explanation": "Differentiate both sides: 2x + 2y(dy/dx) = 0. Solving for dy/dx: dy/dx = -2x/2y = -x/y"
-    },
-    {
-        "id": "q14",
-        "topic": "Implicit Diff.",
-        "stem": "For xy = 10, find dy/dx",
-        "choices": ["-y/x", "y/x", "-x/y", "10"],
-        "answer": 0,
-        "explanation": "Differentiate: y + x(dy/dx) = 0, so dy/dx = -y/x"
-    },
-    {
-        "id": "q15",
-        "topic": "Implicit Diff.",
-        "stem": "For x³ + y³ = 6xy, find dy/dx",
-        "choices": ["(2y - x²)/(y² - 2x)", "(x² - 2y)/(2x - y²)", "-x²/y²", "3x²/3y²"],
-        "answer": 0,
-        "explanation": "Differentiate: 3x² + 3y²(dy/dx) = 6y + 6x(dy/dx). Solve: dy/dx = (2y - x²)/(y² - 2x)"
-    },
-    # Applications (3 questions)
-    {
-        "id": "q16", 
-        "topic": "Applications", 
-        "stem": "At x=2, the slope of the tangent to f(x)=x² is:", 
-        "choices": ["4", "2", "1", "0"], 
-        "answer": 0,
-        "explanation": "f'(x) = 2x. At x=2, f'(2) = 2(2) = 4. The derivative gives the slope of the tangent line."
-    },
-    {
-        "id": "q17",
-        "topic": "Applications",
-        "stem": "The position of an object is s(t) = t³ - 6t². Its velocity at t=1 is:",
-        "choices": ["-9", "3", "-5", "-12"],
-        "answer": 0,
-        "explanation": "Velocity v(t) = s'(t) = 3t² - 12t. At t=1: v(1) = 3(1)² - 12(1) = -9"
-    },
-    {
-        "id": "q18",
-        "topic": "Applications",
-        "stem": "The area of a circle is A = πr². The rate of change of area with respect to radius is:",
-        "choices": ["2πr", "πr²", "πr", "2π"],
-        "answer": 0,
-        "explanation": "dA/dr = d/dr(πr²) = 2πr (circumference!)"
-    },
-]
+
+@fragment
+def render_question_screen():
+    """One quiz question with its navigation (a fragment - answering reruns only this screen)"""
+    attempt = st.session_state.quiz_attempt
+    # Bounds check to prevent IndexError
+    if st.session_state.quiz_idx >= len(attempt):
+        st.session_state.quiz_idx = len(attempt) - 1
+    
+    q = attempt.question(st.session_state.quiz_idx)
+    progress = (st.session_state.quiz_idx + 1) / len(attempt) * 100
+
+    # Progress bar
+    st.markdown(f"""
+    <div class="progress-container">
+        <div class="progress-bar" style="width: {progress}%;"></div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown(f'<div class="question-number">Question {st.session_state.quiz_idx + 1} of {len(attempt)}</div>', unsafe_allow_html=True)
+
+    # Question card
+    st.markdown(f"""
+    <div class="question-card">
+        <div class="question-topic">{q['topic']}</div>
+        <div class="question-stem">{q['prompt']}</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Answer choices with proper label
+    st.markdown("**Select your answer:**")
+    key = f"choice_{q['id']}"
+    current = attempt.response(st.session_state.quiz_idx)
+
+    # Create radio button with shuffled choices
+    if current is not None:
+        choice = st.radio("choices", q["choices"], index=current, key=key, label_visibility="collapsed")
+    else:
+        choice = st.radio("choices", q["choices"], key=key, label_visibility="collapsed")
+
+    # Save selection
+    if choice is not None:
+        attempt.answer(st.session_state.quiz_idx, q["choices"].index(choice))
+    
+    # Hint and Skip functionality
+    hint_col, skip_col = st.columns(2)
+    with hint_col:
+        if not st.session_state.hints_used[st.session_state.quiz_idx]:
+            if st.button("💡 Show Hint", use_container_width=True):
+                st.session_state.hints_used[st.session_state.quiz_idx] = True
+                rerun_fragment()
+        else:
+            st.info(f"💡 **Hint:** {q.get('explanation', 'Think about the rule carefully.')[:100]}...")
+    
+    with skip_col:
+        if st.button("⏭️ Skip Question", use_container_width=True):
+            if st.session_state.quiz_idx not in st.session_state.skipped_questions:
+                st.session_state.skipped_questions.append(st.session_state.quiz_idx)
+            if st.session_state.quiz_idx < len(attempt) - 1:
+                st.session_state.quiz_idx += 1
+                rerun_fragment()
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Navigation buttons
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        if st.session_state.quiz_idx > 0:
+            if st.button("◀ Previous", use_container_width=True):
+                st.session_state.quiz_idx -= 1
+                rerun_fragment()
+
+    with col2:
+        if st.button("🔄 Restart Quiz", use_container_width=True):
+            st.session_state.quiz_started = False
+            st.session_state.quiz_idx = 0
+            st.rerun()
+
+    with col3:
+        if st.session_state.quiz_idx < len(attempt) - 1:
+            if st.button("Next ▶", type="primary", use_container_width=True):
+                st.session_state.quiz_idx += 1
+                rerun_fragment()
+        else:
+            # Allow submission if all questions answered or if some were skipped
+            answered_count = attempt.answered()
+            submit_enabled = answered_count >= len(attempt) - len(st.session_state.skipped_questions)
+            
+            if st.button("✅ Submit Quiz", disabled=not submit_enabled, type="primary", use_container_width=True):
+                # Calculate results with shuffled answers
+                correct_count = attempt.score()
+                answered_count = attempt.answered()
+                st.session_state.quiz_score = correct_count
+                print(f"📊 Quiz Submission: Answered={answered_count}/18, Correct={correct_count}/18, Skipped={18-answered_count}")
+            
+                # Store detailed quiz data for feedback page
+                st.session_state.quiz_data = {
+                    "question_ids": attempt.question_ids,
+                    "responses": [attempt.response(i) for i in range(len(attempt))],
+                    "score": correct_count,
+                    "total": len(attempt)
+                }
+            
+                st.session_state.quiz_finished = True
+                st.session_state.quiz_completed = True  # Mark quiz as completed for feedback access
+                st.rerun()
 
 
 def main():
+    apply_quiz_styles()
+    
     # init session state
     if "quiz_started" not in st.session_state:
         st.session_state.quiz_started = False
@@ -172,14 +137,13 @@ def main():
         st.session_state.quiz_idx = 0
     if "quiz_score" not in st.session_state:
         st.session_state.quiz_score = 0
-    if "quiz_responses" not in st.session_state:
-        st.session_state.quiz_responses = []
     if "quiz_finished" not in st.session_state:
         st.session_state.quiz_finished = False
     if "quiz_data" not in st.session_state:
         st.session_state.quiz_data = {}
-    if "shuffled_questions" not in st.session_state:
-        st.session_state.shuffled_questions = None
+    if "quiz_attempt" not in st.session_state:
+        # QuizAttempt: question IDs, packed choice orders and responses (text stays in the bank)
+        st.session_state.quiz_attempt = None
     if "hints_used" not in st.session_state:
         st.session_state.hints_used = []
     if "skipped_questions" not in st.session_state:
@@ -265,146 +229,28 @@ def main():
         with col_btn2:
             if st.button("🚀 Start Quiz", type="primary", use_container_width=True):
                 # Use all 18 questions (already organized by topic with 3 per topic)
-                selected_questions = QUESTIONS.copy()
+                selected_questions = list(_quiz_questions())
                 random.shuffle(selected_questions)  # Shuffle order for variety
                 
-                # Shuffle answer choices for each question
-                shuffled_questions = []
-                for q in selected_questions:
-                    shuffled_q = q.copy()
-                    choices_with_indices = list(enumerate(q['choices']))
-                    random.shuffle(choices_with_indices)
-                    shuffled_q['choices'] = [c for _, c in choices_with_indices]
-                    shuffled_q['answer_map'] = [i for i, _ in choices_with_indices]
-                    shuffled_q['original_answer'] = q['answer']
-                    shuffled_q['shuffled_answer'] = shuffled_q['answer_map'].index(q['answer'])
-                    shuffled_questions.append(shuffled_q)
-                
-                st.session_state.shuffled_questions = shuffled_questions
+                # Answer choices are shuffled for each question
+                st.session_state.quiz_attempt = QuizAttempt.start(selected_questions)
                 st.session_state.quiz_started = True
                 st.session_state.quiz_idx = 0
                 st.session_state.quiz_score = 0
-                st.session_state.quiz_responses = [None] * 18
                 st.session_state.hints_used = [False] * 18
                 st.session_state.skipped_questions = []
                 st.rerun()
 
     # quiz screen
     elif not st.session_state.quiz_finished:
-        # Bounds check to prevent IndexError
-        if st.session_state.quiz_idx >= len(st.session_state.shuffled_questions):
-            st.session_state.quiz_idx = len(st.session_state.shuffled_questions) - 1
-        
-        q = st.session_state.shuffled_questions[st.session_state.quiz_idx]
-        progress = (st.session_state.quiz_idx + 1) / len(st.session_state.shuffled_questions) * 100
-    
-        # Progress bar
-        st.markdown(f"""
-        <div class="progress-container">
-            <div class="progress-bar" style="width: {progress}%;"></div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-        st.markdown(f'<div class="question-number">Question {st.session_state.quiz_idx + 1} of {len(st.session_state.shuffled_questions)}</div>', unsafe_allow_html=True)
-    
-        # Question card
-        st.markdown(f"""
-        <div class="question-card">
-            <div class="question-topic">{q['topic']}</div>
-            <div class="question-stem">{q['stem']}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-        st.markdown("<br>", unsafe_allow_html=True)
-    
-        # Answer choices with proper label
-        st.markdown("**Select your answer:**")
-        key = f"choice_{q['id']}"
-        current = st.session_state.quiz_responses[st.session_state.quiz_idx]
-    
-        # Create radio button with shuffled choices
-        if current is not None:
-            choice = st.radio("choices", q["choices"], index=current, key=key, label_visibility="collapsed")
-        else:
-            choice = st.radio("choices", q["choices"], key=key, label_visibility="collapsed")
-    
-        # Save selection
-        if choice is not None:
-            st.session_state.quiz_responses[st.session_state.quiz_idx] = q["choices"].index(choice)
-        
-        # Hint and Skip functionality
-        hint_col, skip_col = st.columns(2)
-        with hint_col:
-            if not st.session_state.hints_used[st.session_state.quiz_idx]:
-                if st.button("💡 Show Hint", use_container_width=True):
-                    st.session_state.hints_used[st.session_state.quiz_idx] = True
-                    st.rerun()
-            else:
-                st.info(f"💡 **Hint:** {q.get('explanation', 'Think about the rule carefully.')[:100]}...")
-        
-        with skip_col:
-            if st.button("⏭️ Skip Question", use_container_width=True):
-                if st.session_state.quiz_idx not in st.session_state.skipped_questions:
-                    st.session_state.skipped_questions.append(st.session_state.quiz_idx)
-                if st.session_state.quiz_idx < len(st.session_state.shuffled_questions) - 1:
-                    st.session_state.quiz_idx += 1
-                    st.rerun()
-    
-        st.markdown("<br>", unsafe_allow_html=True)
-    
-        # Navigation buttons
-        col1, col2, col3 = st.columns([1, 1, 1])
-        with col1:
-            if st.session_state.quiz_idx > 0:
-                if st.button("◀ Previous", use_container_width=True):
-                    st.session_state.quiz_idx -= 1
-                    st.rerun()
-    
-        with col2:
-            if st.button("🔄 Restart Quiz", use_container_width=True):
-                st.session_state.quiz_started = False
-                st.session_state.quiz_idx = 0
-                st.session_state.quiz_responses = [None] * 18
-                st.rerun()
-    
-        with col3:
-            if st.session_state.quiz_idx < len(st.session_state.shuffled_questions) - 1:
-                if st.button("Next ▶", type="primary", use_container_width=True):
-                    st.session_state.quiz_idx += 1
-                    st.rerun()
-            else:
-                # Allow submission if all questions answered or if some were skipped
-                answered_count = sum(1 for r in st.session_state.quiz_responses if r is not None)
-                submit_enabled = answered_count >= len(st.session_state.shuffled_questions) - len(st.session_state.skipped_questions)
-                
-                if st.button("✅ Submit Quiz", disabled=not submit_enabled, type="primary", use_container_width=True):
-                    # Calculate results with shuffled answers
-                    correct_count = 0
-                    answered_count = 0
-                    for r, q in zip(st.session_state.quiz_responses, st.session_state.shuffled_questions):
-                        if r is not None:
-                            answered_count += 1
-                            if r == q["shuffled_answer"]:
-                                correct_count += 1
-                    st.session_state.quiz_score = correct_count
-                    print(f"📊 Quiz Submission: Answered={answered_count}/18, Correct={correct_count}/18, Skipped={18-answered_count}")
-                
-                    # Store detailed quiz data for feedback page
-                    st.session_state.quiz_data = {
-                        "questions": st.session_state.shuffled_questions,
-                        "responses": st.session_state.quiz_responses,
-                        "score": correct_count,
-                        "total": len(st.session_state.shuffled_questions)
-                    }
-                
-                    st.session_state.quiz_finished = True
-                    st.session_state.quiz_completed = True  # Mark quiz as completed for feedback access
-                    st.rerun()
+        render_question_screen()
 
     # results screen
     else:
+        attempt = st.session_state.quiz_attempt
+        questions = list(attempt.questions())
         score = st.session_state.quiz_score
-        total = len(st.session_state.shuffled_questions)
+        total = len(attempt)
         pct = round(100 * score / total)
         
         if pct >= 90:
@@ -423,9 +269,9 @@ def main():
         # analyze performance
         if not st.session_state.get('quiz_analyzed', False):
             topic_performance = {}
-            for i, (r, q) in enumerate(zip(st.session_state.quiz_responses, st.session_state.shuffled_questions)):
+            for i, q in enumerate(questions):
                 topic = q["topic"]
-                is_correct = (r == q["shuffled_answer"]) if r is not None else False
+                is_correct = attempt.is_correct(i)
                 if topic not in topic_performance:
                     topic_performance[topic] = {"correct": 0, "total": 0}
                 topic_performance[topic]["total"] += 1
@@ -502,13 +348,13 @@ def main():
     
         # Topic Performance Summary
         topic_stats = {}
-        for r, q in zip(st.session_state.quiz_responses, st.session_state.shuffled_questions):
+        for i, q in enumerate(questions):
             topic = q['topic']
             if topic not in topic_stats:
                 topic_stats[topic] = {'correct': 0, 'total': 0}
             topic_stats[topic]['total'] += 1
             # Only count as correct if answered AND correct (not if skipped/None)
-            if r is not None and r == q['shuffled_answer']:
+            if attempt.is_correct(i):
                 topic_stats[topic]['correct'] += 1
         
         st.markdown("### 📊 Performance by Topic")
@@ -589,8 +435,9 @@ def main():
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("### 📋 Detailed Review with Explanations")
     
-        for i, (r, q) in enumerate(zip(st.session_state.quiz_responses, st.session_state.shuffled_questions), start=1):
-            is_correct = (r == q["shuffled_answer"]) if r is not None else False
+        for i, q in enumerate(questions, start=1):
+            r = attempt.response(i - 1)
+            is_correct = attempt.is_correct(i - 1)
             status_icon = "✅" if is_correct else "❌"
             status_color = "#6B8E23" if is_correct else "#DC3545"
             border_color = "#6B8E23" if is_correct else "#DC3545"
@@ -598,7 +445,7 @@ def main():
             with st.expander(f"{status_icon} Question {i}: {q['topic']}" + (" ✓ Correct" if is_correct else " ✗ Incorrect"), expanded=not is_correct):
                 # Get display values to avoid nested f-string issues
                 user_answer = q['choices'][r] if r is not None else '— (No answer selected)'
-                question_text = q['stem']
+                question_text = q['prompt']
                 
                 st.markdown(f"""
                 <div style="background: #2d2d2d; border-radius: 12px; padding: 20px; border-left: 4px solid {border_color};">
@@ -612,7 +459,7 @@ def main():
                 """, unsafe_allow_html=True)
                 
                 if not is_correct:
-                    correct_answer = q['choices'][q['shuffled_answer']]
+                    correct_answer = q['choices'][q['answer']]
                     st.markdown(f"""
                     <div style="font-size: 14px; margin-bottom: 10px;">
                         <div style="color: #B3B3B3; margin-bottom: 5px;"><b>Correct answer:</b></div>
@@ -651,10 +498,9 @@ def main():
                 st.session_state.quiz_started = False
                 st.session_state.quiz_idx = 0
                 st.session_state.quiz_score = 0
-                st.session_state.quiz_responses = [None] * 18
                 st.session_state.quiz_finished = False
                 st.session_state.quiz_analyzed = False
-                st.session_state.shuffled_questions = None
+                st.session_state.quiz_attempt = None
                 st.session_state.hints_used = [False] * 18
                 st.session_state.skipped_questions = []
                 st.rerun()
@@ -6,176 +6,11 @@ import streamlit as st
 from datetime import datetime
 import time
 from data_manager import DataManager
+from content_store import get_lessons
+from components.fragments import fragment
 
 
-# Lesson content with estimated times and prerequisites
-LESSONS = {
-    "lesson1": {
-        "id": "lesson1",
-        "title": "Introduction to Derivatives",
-        "level": 1,
-        "estimated_time": 15,
-        "prerequisites": [],
-        "topics": ["Definition of Derivatives", "Rate of Change", "Notation"],
-        "content": """
-        ## Introduction to Derivatives
-        
-        ### What is a Derivative?
-        A derivative represents the **rate of change** of a function. Think of it as the slope of a curve at any given point.
-        
-        ### Key Concepts:
-        1. **Instantaneous Rate of Change**: How fast something is changing at a specific moment
-        2. **Slope of Tangent Line**: The derivative gives us the slope of the line that just touches the curve
-        3. **Notation**: We write derivatives as f'(x), dy/dx, or df/dx
-        
-        ### Real-World Example:
-        If s(t) represents your position at time t, then s'(t) is your **velocity** - how fast your position is changing!
-        
-        ### The Limit Definition:
-        ```
-        f'(x) = lim[h→0] (f(x+h) - f(x)) / h
-        ```
-        
-        This formula captures the essence of derivatives!
-        """,
-        "video_file": "assets/Introduction to Derivatives.mp4",
-        "quiz_questions": 3
-    },
-    "lesson2": {
-        "id": "lesson2",
-        "title": "Power Rule",
-        "level": 1,
-        "estimated_time": 20,
-        "prerequisites": ["lesson1"],
-        "topics": ["Power Rule", "Basic Derivatives", "Practice"],
-        "content": """
-        ## The Power Rule
-        
-        ### The Rule:
-        If f(x) = x^n, then f'(x) = n·x^(n-1)
-        
-        ### Examples:
-        1. f(x) = x³ → f'(x) = 3x²
-        2. f(x) = x⁵ → f'(x) = 5x⁴
-        3. f(x) = x → f'(x) = 1
-        4. f(x) = 1 (constant) → f'(x) = 0
-        
-        ### Why Does It Work?
-        The power rule comes directly from the limit definition but provides a quick shortcut!
-        
-        ### Practice Problems:
-        Try finding derivatives of:
-        - f(x) = x⁴
-        - g(x) = x⁷
-        - h(x) = 5
-        """,
-        "video_file": "assets/Power_Rule.mp4",
-        "quiz_questions": 5
-    },
-    "lesson3": {
-        "id": "lesson3",
-        "title": "Product and Quotient Rules",
-        "level": 2,
-        "estimated_time": 25,
-        "prerequisites": ["lesson1", "lesson2"],
-        "topics": ["Product Rule", "Quotient Rule", "Combining Rules"],
-        "content": """
-        ## Product and Quotient Rules
-        
-        ### Product Rule:
-        If f(x) = g(x)·h(x), then:
-        ```
-        f'(x) = g'(x)·h(x) + g(x)·h'(x)
-        ```
-        
-        **Mnemonic**: "First times derivative of second, plus second times derivative of first"
-        
-        ### Quotient Rule:
-        If f(x) = g(x)/h(x), then:
-        ```
-        f'(x) = [g'(x)·h(x) - g(x)·h'(x)] / [h(x)]²
-        ```
-        
-        **Mnemonic**: "Low d-high minus high d-low, over the square of what's below"
-        
-        ### Examples:
-        1. f(x) = x²·sin(x) (product rule needed)
-        2. f(x) = x³/(x+1) (quotient rule needed)
-        """,
-        "video_file": "assets/Product_&_Quotient_Rules.mp4",
-        "quiz_questions": 5
-    },
-    "lesson4": {
-        "id": "lesson4",
-        "title": "Chain Rule",
-        "level": 2,
-        "estimated_time": 30,
-        "prerequisites": ["lesson1", "lesson2"],
-        "topics": ["Chain Rule", "Composition of Functions", "Advanced Derivatives"],
-        "content": """
-        ## The Chain Rule
-        
-        ### The Rule:
-        If f(x) = g(h(x)), then:
-        ```
-        f'(x) = g'(h(x))·h'(x)
-        ```
-        
-        **In words**: Derivative of outer function (evaluated at inner) times derivative of inner function
-        
-        ### Examples:
-        1. f(x) = (x² + 1)³
-           - Outer: g(u) = u³, Inner: h(x) = x² + 1
-           - f'(x) = 3(x² + 1)²·2x = 6x(x² + 1)²
-        
-        2. f(x) = sin(x²)
-           - f'(x) = cos(x²)·2x
-        
-        ### Tips:
-        - Identify the "outer" and "inner" functions
-        - Work from outside to inside
-        - Don't forget to multiply by the inner derivative!
-        """,
-        "video_file": "assets/Chain Rule.mp4",
-        "quiz_questions": 6
-    },
-    "lesson5": {
-        "id": "lesson5",
-        "title": "Applications of Derivatives",
-        "level": 3,
-        "estimated_time": 35,
-        "prerequisites": ["lesson1", "lesson2", "lesson3", "lesson4"],
-        "topics": ["Optimization", "Related Rates", "Real-World Problems"],
-        "content": """
-        ## Applications of Derivatives
-        
-        ### 1. Finding Maximum and Minimum Values
-        - Set f'(x) = 0 to find critical points
-        - Use second derivative test: f''(x) > 0 → minimum, f''(x) < 0 → maximum
-        
-        ### 2. Optimization Problems
-        Example: Find the dimensions of a rectangle with perimeter 100 that maximizes area.
-        
-        ### 3. Related Rates
-        When two quantities are related and both change over time.
-        
-        Example: A balloon is being inflated. If the radius increases at 2 cm/s, how fast is the volume changing?
-        
-        ### 4. Motion Problems
-        - Position: s(t)
-        - Velocity: v(t) = s'(t)
-        - Acceleration: a(t) = v'(t) = s''(t)
-        
-        ### Real-World Applications:
-        - Economics: Marginal cost and revenue
-        - Physics: Velocity and acceleration
-        - Biology: Population growth rates
-        - Engineering: Optimization of designs
-        """,
-        "video_url": "https://www.youtube.com/embed/example5",
-        "quiz_questions": 7
-    }
-}
+# Lesson content lives in content/lessons.json (see content_store.py)
 
 
 def get_unlocked_lessons(username: str) -> list:
@@ -184,7 +19,7 @@ def get_unlocked_lessons(username: str) -> list:
     completed_lessons = [lid for lid, data in progress.get('lessons', {}).items() if data.get('completed')]
     
     unlocked = []
-    for lesson_id, lesson in LESSONS.items():
+    for lesson_id, lesson in get_lessons().items():
         # Check if prerequisites are met
         prerequisites_met = all(prereq in completed_lessons for prereq in lesson.get('prerequisites', []))
         
@@ -205,7 +40,7 @@ def get_recommended_lesson(username: str) -> str:
     # Find uncompleted lessons that match weak topics
     for lesson_id in unlocked:
         if lesson_id not in completed_lessons:
-            lesson = LESSONS[lesson_id]
+            lesson = get_lessons()[lesson_id]
             # Check if lesson covers any weak topics
             if any(topic in str(lesson.get('topics', [])) for topic in weak_topics):
                 return lesson_id
@@ -215,12 +50,12 @@ def get_recommended_lesson(username: str) -> str:
         if lesson_id not in completed_lessons:
             return lesson_id
     
-    return list(LESSONS.keys())[0] if LESSONS else None
+    return next(iter(get_lessons()), None)
 
 
 def render_lesson_card(lesson_id: str, is_unlocked: bool, is_completed: bool):
     """Render a lesson card"""
-    lesson = LESSONS[lesson_id]
+    lesson = get_lessons()[lesson_id]
     
     with st.container(border=True):
         col1, col2, col3 = st.columns([3, 1, 1])
@@ -246,13 +81,63 @@ def render_lesson_card(lesson_id: str, is_unlocked: bool, is_completed: bool):
         else:
             st.warning("🔒 Complete prerequisites to unlock")
             if lesson['prerequisites']:
-                prereq_names = [LESSONS[pid]['title'] for pid in lesson['prerequisites']]
+                prereq_names = [get_lessons()[pid]['title'] for pid in lesson['prerequisites']]
                 st.caption(f"Prerequisites: {', '.join(prereq_names)}")
 
 
+# The lesson view's own controls are fragments: clicking them reruns only the control,
+# so the lesson text, video and the rest of the app aren't rendered and sent again
+
+def set_lesson_progress(lesson_id: str, value: float, message: str):
+    """Record lesson progress from a control fragment"""
+    lesson_progress = st.session_state.setdefault('lesson_progress', {})
+    if lesson_progress.get(lesson_id) == value:
+        st.success(message)
+        return
+    lesson_progress[lesson_id] = value
+    # The progress bar is outside the fragment - rerun the whole view so it shows the change
+    st.toast(message)
+    st.rerun()
+
+
+@fragment
+def render_mark_as_read(lesson_id: str):
+    """Mark as Read button"""
+    # Scroll progress simulation
+    if st.button("Mark as Read", type="primary"):
+        current = st.session_state.get('lesson_progress', {}).get(lesson_id)
+        set_lesson_progress(lesson_id, 0.5 if current is None else current, "Content marked as read! ✓")
+
+
+@fragment
+def render_mark_video_watched(lesson_id: str):
+    """Mark Video as Watched button"""
+    if st.button("Mark Video as Watched"):
+        set_lesson_progress(lesson_id, 0.8, "Video marked as watched! ✓")
+
+
+@fragment
+def render_notes(lesson_id: str):
+    """Notes editor - typing and saving rerun only the notes"""
+    st.markdown("### 📝 Your Notes")
+    notes_key = f"notes_{lesson_id}"
+    current_notes = st.session_state.get(notes_key, "")
+    
+    notes = st.text_area(
+        "Write your notes here...",
+        value=current_notes,
+        height=200,
+        placeholder="Take notes as you learn..."
+    )
+    
+    if st.button("Save Notes"):
+        st.session_state[notes_key] = notes
+        st.success("Notes saved! 📝")
+
+
 def render_lesson_view(lesson_id: str):
     """Render the full lesson view"""
-    lesson = LESSONS[lesson_id]
+    lesson = get_lessons()[lesson_id]
     
     # Back button
     if st.button("← Back to Lessons"):
@@ -273,14 +158,10 @@ def render_lesson_view(lesson_id: str):
     tab1, tab2, tab3 = st.tabs(["📖 Content", "🎥 Video", "✏️ Notes"])
     
     with tab1:
+        # Markdown and LaTeX are typeset in the browser - the server only sends the source text,
+        # so there is no rendered HTML to cache here (see benchmarks/lesson_view.py)
         st.markdown(lesson['content'])
-        
-        # Scroll progress simulation
-        if st.button("Mark as Read", type="primary"):
-            st.success("Content marked as read! ✓")
-            if lesson_id not in st.session_state.get('lesson_progress', {}):
-                st.session_state.lesson_progress = st.session_state.get('lesson_progress', {})
-                st.session_state.lesson_progress[lesson_id] = 0.5
+        render_mark_as_read(lesson_id)
     
     with tab2:
         st.markdown("### 🎥 Video Lesson")
@@ -295,27 +176,10 @@ def render_lesson_view(lesson_id: str):
         else:
             st.info("📹 No video available for this lesson yet")
         
-        if st.button("Mark Video as Watched"):
-            st.success("Video marked as watched! ✓")
-            if lesson_id not in st.session_state.get('lesson_progress', {}):
-                st.session_state.lesson_progress = st.session_state.get('lesson_progress', {})
-            st.session_state.lesson_progress[lesson_id] = 0.8
+        render_mark_video_watched(lesson_id)
     
     with tab3:
-        st.markdown("### 📝 Your Notes")
-        notes_key = f"notes_{lesson_id}"
-        current_notes = st.session_state.get(notes_key, "")
-        
-        notes = st.text_area(
-            "Write your notes here...",
-            value=current_notes,
-            height=200,
-            placeholder="Take notes as you learn..."
-        )
-        
-        if st.button("Save Notes"):
-            st.session_state[notes_key] = notes
-            st.success("Notes saved! 📝")
+        render_notes(lesson_id)
     
     st.markdown("---")
     
@@ -415,7 +279,7 @@ def main():
     unlocked_lessons = get_unlocked_lessons(username)
     
     # Show overall progress
-    total_lessons = len(LESSONS)
+    total_lessons = len(get_lessons())
     completed_count = len(completed_lessons)
     progress_percentage = (completed_count / total_lessons * 100) if total_lessons > 0 else 0
     
@@ -444,7 +308,7 @@ def main():
                 <strong>🤖 ML Analysis:</strong> Based on your quiz performance in weak topics
             </div>
             <div style="font-size: 16px; color: #FFFFFF; font-weight: 600;">
-                ⭐ {LESSONS[recommended]['title']}
+                ⭐ {get_lessons()[recommended]['title']}
             </div>
             <div style="font-size: 13px; color: #E0E0E0; margin-top: 5px;">
                 This lesson targets your identified areas for improvement
@@ -458,7 +322,7 @@ def main():
     # All lessons
     st.subheader("📖 All Lessons")
     
-    for lesson_id, lesson in LESSONS.items():
+    for lesson_id, lesson in get_lessons().items():
         # Skip if this was already shown as recommended
         if showed_recommended and lesson_id == recommended:
             continue
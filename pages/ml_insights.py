@@ -8,11 +8,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from data_manager import DataManager
 from ml_features import (
-    calculate_topic_confidence,
-    get_adaptive_difficulty,
-    calculate_learning_velocity,
-    get_review_schedule,
-    predict_final_score
+    ML_TOPICS,
+    get_features,
+    get_review_schedule
 )
 
 
@@ -41,10 +39,13 @@ def main():
     # Get user progress
     progress = DataManager.get_user_progress(username)
     
+    # Batch-scored features when current, otherwise computed for this render
+    features = get_features(username, progress)
+    
     # Section 1: Learning Velocity & Type
     st.markdown("## 📈 Learning Analytics")
     
-    velocity, learner_type = calculate_learning_velocity(username)
+    velocity, learner_type = features['velocity'], features['learner_type']
     
     # Generate learner type explanation
     if learner_type == "Fast Learner":
@@ -105,13 +106,11 @@ def main():
     st.markdown("## 🎯 Topic Confidence Analysis")
     st.markdown("*ML-calculated confidence based on accuracy, consistency, and time factors*")
     
-    topics = ["Limit Definition", "Basic Rules", "Product Rule", "Chain Rule", "Implicit Diff.", "Applications"]
-    
     col1, col2 = st.columns(2)
     
-    for idx, topic in enumerate(topics):
-        confidence = calculate_topic_confidence(username, topic)
-        difficulty = get_adaptive_difficulty(username, topic)
+    for idx, topic in enumerate(ML_TOPICS):
+        confidence = features['topics'][topic]['confidence']
+        difficulty = features['topics'][topic]['difficulty']
         
         # Get topic-specific data for explanations
         quiz_data = progress.get('initial_quiz', {})
@@ -179,7 +178,7 @@ def main():
     st.markdown("## 🔮 Predictive Analytics")
     st.markdown("*Machine Learning prediction using Linear Regression on your progress data*")
     
-    prediction = predict_final_score(username)
+    prediction = features['prediction']
     
     # Generate prediction explanation
     predicted_score = prediction['predicted_score']
@@ -285,10 +284,10 @@ def main():
     st.markdown("## 🔄 Spaced Repetition Schedule")
     st.markdown("*ML-powered review timing using SM-2 algorithm (similar to Anki)*")
     
-    review_schedule = get_review_schedule(username)
+    review_schedule = get_review_schedule(username, progress)
     
     if review_schedule:
-        st.markdown(f"**{len(review_schedule)} topics** due for review to optimize retention")
+        st.markdown(f"**{len(review_schedule)} problems** due for review to optimize retention")
         
         for review in review_schedule[:5]:  # Show top 5
             days_overdue = review['days_overdue']
@@ -4,12 +4,11 @@ Progress Tracker - Detailed view of user progress across all areas
 
 import streamlit as st
 from data_manager import DataManager
-import pandas as pd
+from progress_engine import ProgressEngine, LESSON_COUNT
 from ml_features import (
     calculate_topic_confidence,
     get_adaptive_difficulty,
-    calculate_learning_velocity,
-    predict_final_score
+    get_features
 )
 
 
@@ -45,8 +44,8 @@ def main():
         st.metric("Initial Quiz", "✅" if quiz_completed else "⏳")
     
     with col2:
-        lessons_completed = len([l for l in progress.get('lessons', {}).values() if l.get('completed')])
-        st.metric("Lessons", f"{lessons_completed}/5")
+        lessons_completed = ProgressEngine.counters(progress)['lessons_completed']
+        st.metric("Lessons", f"{lessons_completed}/{LESSON_COUNT}")
     
     with col3:
         practice_correct = sum(1 for p in progress.get('practice_problems', {}).values() if p.get('correct', 0) > 0)
@@ -57,8 +56,9 @@ def main():
         st.metric("Final Test", "✅" if final_completed else "⏳")
     
     # ML-powered progress analysis
-    velocity, learner_type = calculate_learning_velocity(username)
-    prediction = predict_final_score(username)
+    features = get_features(username, progress)
+    velocity, learner_type = features['velocity'], features['learner_type']
+    prediction = features['prediction']
     
     st.markdown(f"""
     <div style="background: linear-gradient(135deg, rgba(107,142,35,0.2) 0%, rgba(85,107,47,0.2) 100%); 
@@ -119,7 +119,7 @@ def main():
                 weak_topics = quiz_data.get('weak_topics', [])
                 for topic in weak_topics:
                     # Get ML-calculated confidence for this topic (from practice problems)
-                    confidence = calculate_topic_confidence(username, topic)
+                    confidence = calculate_topic_confidence(username, topic, progress)
                     
                     # If no practice yet, show based on quiz results
                     if confidence == 0:
@@ -185,5 +185,5 @@ QUIZ_STYLES = """
 
 def apply_quiz_styles():
     """Apply consistent quiz styling"""
-    import streamlit as st
-    st.markdown(QUIZ_STYLES, unsafe_allow_html=True)
+    from components.styles import apply_styles
+    apply_styles("quiz", QUIZ_STYLES)
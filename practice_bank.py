@@ -0,0 +1,54 @@
+"""
+Practice Problem Bank
+The practice problems by category (see question_bank), plus lookups from problem ID to
+its canonical topic ID (the practice category key) and from quiz topic names to topic IDs
+"""
+
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from question_bank import Question, get_question_bank
+
+# Initial-quiz / ML topic each practice category counts towards
+TOPIC_LABELS = {
+    "basic_derivatives": "Basic Rules",
+    "product_quotient": "Product Rule",
+    "chain_rule": "Chain Rule",
+    "applications": "Applications",
+    "implicit_differentiation": "Implicit Diff.",
+    "trigonometric": "Basic Rules",
+    "exponential_log": "Basic Rules"
+}
+
+# Category view of the current question bank, rebuilt when the bank is reloaded
+_practice_problems = {"bank": None, "problems": {}}
+
+
+def practice_problems() -> Mapping[str, Tuple[Question, ...]]:
+    """Practice problem bank organized by topic (category -> problems)"""
+    bank = get_question_bank()
+    if _practice_problems["bank"] is not bank:
+        _practice_problems["problems"] = {
+            category: bank.questions("practice", category)
+            for category in bank.groups["practice"]
+        }
+        _practice_problems["bank"] = bank
+    return _practice_problems["problems"]
+
+
+def get_problem(problem_id: str) -> Optional[Question]:
+    """Practice problem by ID, or None"""
+    problem = get_question_bank().get(problem_id)
+    return problem if problem is not None and problem["bank"] == "practice" else None
+
+
+def problem_topic(problem_id: str) -> Optional[str]:
+    """Topic ID (category) of a practice problem, or None"""
+    problem = get_problem(problem_id)
+    return problem["group"] if problem is not None else None
+
+
+def topic_ids(topic: str) -> List[str]:
+    """Topic IDs for a topic ID or a quiz topic name (e.g. "Basic Rules" covers three categories)"""
+    if topic in practice_problems():
+        return [topic]
+    return [topic_id for topic_id, label in TOPIC_LABELS.items() if label.lower() == topic.lower()]
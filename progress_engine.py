@@ -0,0 +1,195 @@
+"""
+Progress Aggregation Engine
+Single definition of overall progress (quiz 20%, lessons 60%, practice 20%), kept up to
+date incrementally from counters stored in the progress record under "counters", plus
+the per-topic index of practice attempts under "topic_index" and the spaced repetition
+due-queue under "review_queue"
+"""
+
+from typing import Dict, List, Optional
+
+import spaced_repetition
+from practice_bank import problem_topic
+
+# Sections and their weight in overall progress
+QUIZ_WEIGHT = 20
+LESSON_WEIGHT = 60
+PRACTICE_WEIGHT = 20
+
+# Lessons in content/lessons.json
+LESSON_COUNT = 5
+
+# Distinct practice problems attempted for full practice credit
+PRACTICE_TARGET = 10
+
+
+COUNTER_KEYS = {"quiz_completed", "lessons_completed", "practice_done", "practice_correct"}
+
+# Keys derived from the rest of the record - rebuilt on load where a store has no column for them
+DERIVED_KEYS = ("counters", "topic_index", "review_queue")
+
+
+def _entry_counts(category: str, entry: Optional[Dict]) -> int:
+    """How much one entry of a section contributes to that section's counter"""
+    if entry is None:
+        return 0
+    if category == "lessons":
+        return 1 if entry.get("completed") else 0
+    if category == "practice_problems":
+        return 1
+    return 0
+
+
+def _problem_topic(problem_id: str, entry: Dict) -> Optional[str]:
+    """Topic ID of a practice entry (records not from the problem bank keep their own 'topic')"""
+    return problem_topic(problem_id) or entry.get("topic")
+
+
+def _entry_correct(entry: Optional[Dict]) -> int:
+    """1 if a practice entry has been answered correctly at least once"""
+    return 1 if entry is not None and entry.get("correct", 0) > 0 else 0
+
+
+class ProgressEngine:
+    """Maintains section counters and overall progress as progress changes"""
+
+    @staticmethod
+    def recount(progress: Dict) -> Dict:
+        """Full recompute of the counters from the progress record"""
+        return {
+            "quiz_completed": bool(progress.get("initial_quiz", {}).get("completed", False)),
+            "lessons_completed": sum(_entry_counts("lessons", l) for l in progress.get("lessons", {}).values()),
+            "practice_done": len(progress.get("practice_problems", {})),
+            "practice_correct": sum(_entry_correct(p) for p in progress.get("practice_problems", {}).values()),
+        }
+
+    @staticmethod
+    def counters(progress: Dict) -> Dict:
+        """Counters for a progress record (recounted once for records saved before they existed)"""
+        counters = progress.get("counters")
+        if not isinstance(counters, dict) or set(counters) != COUNTER_KEYS:
+            counters = ProgressEngine.recount(progress)
+            progress["counters"] = counters
+        return counters
+
+    @staticmethod
+    def build_topic_index(practice: Dict) -> Dict:
+        """Topic index for a practice_problems section (full scan)"""
+        topics = {}
+        for problem_id, entry in practice.items():
+            topic_id = _problem_topic(problem_id, entry)
+            if topic_id:
+                topics.setdefault(topic_id, []).append(problem_id)
+        return {"size": len(practice), "topics": topics}
+
+    @staticmethod
+    def topic_index(progress: Dict) -> Dict[str, List[str]]:
+        """
+        topic ID -> attempted problem IDs, in first-attempt order. Rebuilt when the section
+        gained entries the engine did not see (older records)
+        """
+        practice = progress.get("practice_problems", {})
+        index = progress.get("topic_index")
+        if not isinstance(index, dict) or index.get("size") != len(practice):
+            index = ProgressEngine.build_topic_index(practice)
+            progress["topic_index"] = index
+        return index["topics"]
+
+    @staticmethod
+    def build_review_queue(practice: Dict) -> Dict:
+        """Due-queue for a practice_problems section (full scan)"""
+        return {"size": len(practice), "heap": spaced_repetition.build_queue(practice)}
+
+    @staticmethod
+    def review_queue(progress: Dict) -> List[List]:
+        """
+        SM-2 due-queue heap for the practice section (see spaced_repetition). Every reschedule
+        is pushed by merge, so like the topic index it is only rebuilt when the section
+        gained entries the engine did not see (older records)
+        """
+        practice = progress.get("practice_problems", {})
+        queue = progress.get("review_queue")
+        if not isinstance(queue, dict) or queue.get("size") != len(practice) or not isinstance(queue.get("heap"), list):
+            queue = ProgressEngine.build_review_queue(practice)
+            progress["review_queue"] = queue
+        return queue["heap"]
+
+    @staticmethod
+    def overall_progress(progress: Dict) -> int:
+        """Overall progress percentage, O(1) from the counters"""
+        counters = ProgressEngine.counters(progress)
+        overall = QUIZ_WEIGHT if counters["quiz_completed"] else 0
+        overall += min(counters["lessons_completed"] / LESSON_COUNT, 1) * LESSON_WEIGHT
+        overall += min(counters["practice_done"] / PRACTICE_TARGET, 1) * PRACTICE_WEIGHT
+        return int(overall)
+
+    @staticmethod
+    def section_completion(progress: Dict) -> Dict[str, float]:
+        """Completion of each section as a 0-1 fraction"""
+        counters = ProgressEngine.counters(progress)
+        return {
+            "quiz": 1.0 if counters["quiz_completed"] else 0.0,
+            "lessons": min(counters["lessons_completed"] / LESSON_COUNT, 1.0),
+            "practice": min(counters["practice_done"] / PRACTICE_TARGET, 1.0),
+        }
+
+    @staticmethod
+    def merge(progress: Dict, category: str, data: Dict):
+        """Merge entries into a section (like dict.update), adjusting counters by the difference"""
+        section = progress.get(category)
+        if not isinstance(section, dict):
+            ProgressEngine.replace(progress, category, data)
+            return
+
+        counters = ProgressEngine.counters(progress)
+        if category == "practice_problems":
+            topics = ProgressEngine.topic_index(progress)
+            queue = ProgressEngine.review_queue(progress)
+        for key, entry in data.items():
+            delta = _entry_counts(category, entry) - _entry_counts(category, section.get(key))
+            if category == "lessons":
+                counters["lessons_completed"] += delta
+            elif category == "practice_problems":
+                counters["practice_done"] += delta
+                counters["practice_correct"] += _entry_correct(entry) - _entry_correct(section.get(key))
+                if key not in section:
+                    progress["topic_index"]["size"] += 1
+                    progress["review_queue"]["size"] += 1
+                    topic_id = _problem_topic(key, entry)
+                    if topic_id:
+                        topics.setdefault(topic_id, []).append(key)
+                spaced_repetition.push(queue, key, entry)
+            section[key] = entry
+
+        # Rebuild once superseded heap items outnumber the live ones
+        if category == "practice_problems" and len(queue) > 2 * len(section) + 16:
+            progress["review_queue"] = ProgressEngine.build_review_queue(section)
+
+        if category == "initial_quiz":
+            counters["quiz_completed"] = bool(section.get("completed", False))
+        progress["overall_progress"] = ProgressEngine.overall_progress(progress)
+
+    @staticmethod
+    def replace(progress: Dict, category: str, value):
+        """Replace a whole section and recount only that section"""
+        progress[category] = value
+
+        counters = ProgressEngine.counters(progress)
+        fresh = ProgressEngine.recount({category: value}) if category in ("initial_quiz", "lessons", "practice_problems") else {}
+        if category == "initial_quiz":
+            counters["quiz_completed"] = fresh["quiz_completed"]
+        elif category == "lessons":
+            counters["lessons_completed"] = fresh["lessons_completed"]
+        elif category == "practice_problems":
+            counters["practice_done"] = fresh["practice_done"]
+            counters["practice_correct"] = fresh["practice_correct"]
+            progress["topic_index"] = ProgressEngine.build_topic_index(value)
+            progress["review_queue"] = ProgressEngine.build_review_queue(value)
+        progress["overall_progress"] = ProgressEngine.overall_progress(progress)
+
+    @staticmethod
+    def describe(progress: Dict) -> str:
+        """One-line summary for log output"""
+        counters = ProgressEngine.counters(progress)
+        return (f"Quiz={counters['quiz_completed']}, Lessons={counters['lessons_completed']}/{LESSON_COUNT}, "
+                f"Practice={counters['practice_done']}/{PRACTICE_TARGET} → Overall={progress.get('overall_progress', 0)}%")
@@ -0,0 +1,116 @@
+"""
+Question Bank Registry
+Every question (initial quiz, lesson quizzes, practice problems, final test) in one schema,
+loaded from content/question_bank.json through the content store (validated, shared by all
+sessions, reloaded when the file changes). Questions are read-only mappings; lookups by id,
+bank/group, topic and difficulty are indexed.
+
+Question fields:
+  - id: unique string
+  - bank: initial_quiz | lesson_quiz | practice | final_test
+  - group: lesson key or practice category (None for single-group banks)
+  - topic, difficulty (None where a bank has no difficulty levels)
+  - prompt, latex (optional), choices, answer (index into choices), explanation
+"""
+
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from content_store import CONTENT_DIR, ContentError, ContentStore
+
+QUESTION_BANK_FILE = CONTENT_DIR / "question_bank.json"
+
+BANKS = ("initial_quiz", "lesson_quiz", "practice", "final_test")
+DIFFICULTIES = (None, "easy", "medium", "hard")
+
+Question = Mapping[str, object]
+
+
+def _freeze(question: Dict) -> Question:
+    """Read-only view of one question (choices become a tuple)"""
+    question = dict(question)
+    question["choices"] = tuple(question["choices"])
+    return MappingProxyType(question)
+
+
+def _index(questions, key_func) -> Mapping[object, Tuple[Question, ...]]:
+    """Read-only {key: questions in file order}"""
+    index = {}
+    for question in questions:
+        index.setdefault(key_func(question), []).append(question)
+    return MappingProxyType({key: tuple(items) for key, items in index.items()})
+
+
+class QuestionBank:
+    """Immutable, indexed set of questions"""
+
+    def __init__(self, questions):
+        self.all = tuple(_freeze(question) for question in questions)
+        self.by_id = MappingProxyType({question["id"]: question for question in self.all})
+
+        self.by_group = _index(self.all, lambda q: (q["bank"], q.get("group")))
+        self.by_topic = _index(self.all, lambda q: (q["bank"], q["topic"]))
+        self.by_difficulty = _index(self.all, lambda q: (q["bank"], q.get("group"), q.get("difficulty")))
+        self.groups = MappingProxyType({
+            bank: tuple(dict.fromkeys(group for b, group in self.by_group if b == bank))
+            for bank in BANKS
+        })
+
+    def get(self, question_id: str) -> Optional[Question]:
+        """Question by id, or None"""
+        return self.by_id.get(question_id)
+
+    def questions(self, bank: str, group: Optional[str] = None, difficulty: Optional[str] = None) -> Tuple[Question, ...]:
+        """Questions of a bank (and group), optionally of one difficulty, in file order"""
+        if difficulty is not None:
+            return self.by_difficulty.get((bank, group, difficulty), ())
+        return self.by_group.get((bank, group), ())
+
+    def topic(self, bank: str, topic: str) -> Tuple[Question, ...]:
+        """Questions of a bank on one topic"""
+        return self.by_topic.get((bank, topic), ())
+
+
+def validate_question(question: Dict) -> List[str]:
+    """Problems with one question entry (empty if valid)"""
+    name = question.get("id", "?")
+    errors = []
+    for field in ("id", "topic", "prompt", "explanation"):
+        if not isinstance(question.get(field), str):
+            errors.append(f"{name}: '{field}' must be a string")
+    if question.get("bank") not in BANKS:
+        errors.append(f"{name}: unknown bank {question.get('bank')!r}")
+    if question.get("difficulty") not in DIFFICULTIES:
+        errors.append(f"{name}: unknown difficulty {question.get('difficulty')!r}")
+    if not isinstance(question.get("group"), (str, type(None))):
+        errors.append(f"{name}: 'group' must be a string or null")
+
+    choices = question.get("choices")
+    if not isinstance(choices, list) or len(choices) < 2 or not all(isinstance(c, str) for c in choices):
+        errors.append(f"{name}: 'choices' must be a list of at least two strings")
+    elif not isinstance(question.get("answer"), int) or not 0 <= question["answer"] < len(choices):
+        errors.append(f"{name}: 'answer' must index into choices")
+    return errors
+
+
+def compile_question_bank(document: Dict) -> QuestionBank:
+    """Validate a question bank document and build the indexed registry"""
+    questions = document.get("questions")
+    if not isinstance(questions, list):
+        raise ContentError(None, ["'questions' must be a list"])
+
+    errors = []
+    for question in questions:
+        errors.extend(validate_question(question) if isinstance(question, dict) else ["question is not an object"])
+    ids = [question.get("id") for question in questions if isinstance(question, dict)]
+    duplicates = sorted({i for i in ids if ids.count(i) > 1}, key=str)
+    if duplicates:
+        errors.append(f"duplicate ids: {', '.join(map(str, duplicates))}")
+    if errors:
+        raise ContentError(None, errors)
+    return QuestionBank(questions)
+
+
+def get_question_bank() -> QuestionBank:
+    """The current question bank (compiled once per file version)"""
+    return ContentStore.get(QUESTION_BANK_FILE, compile_question_bank)
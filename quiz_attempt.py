@@ -0,0 +1,113 @@
+"""
+Quiz Attempts - Compact per-session state for one quiz or test attempt
+An attempt keeps only question IDs, each question's shuffled choice order packed into one
+int, and the responses in a byte array. Question text, choices and explanations are read
+from the shared, read-only question bank whenever a question is displayed - the bank the
+attempt was started on, so a reload mid-attempt can't change its questions or scoring.
+"""
+
+import random
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from question_bank import Question, QuestionBank, get_question_bank
+
+# Bits per choice index in a packed choice order - 8 choices fit in one 32-bit int
+ORDER_BITS = 4
+MAX_CHOICES = 32 // ORDER_BITS
+
+# Stored in the response array for an unanswered question
+NO_RESPONSE = -1
+
+
+def pack_order(order: Sequence[int]) -> int:
+    """Pack a choice permutation (display position -> original index) into one int"""
+    packed = 0
+    for position, original in enumerate(order):
+        packed |= original << (position * ORDER_BITS)
+    return packed
+
+
+def unpack_order(packed: int, count: int) -> List[int]:
+    """Choice permutation of `count` choices from pack_order()"""
+    mask = (1 << ORDER_BITS) - 1
+    return [(packed >> (position * ORDER_BITS)) & mask for position in range(count)]
+
+
+class QuizAttempt:
+    """Questions, choice orders and responses of one attempt (responses are display positions)"""
+
+    __slots__ = ("question_ids", "orders", "responses", "bank")
+
+    def __init__(self, question_ids: Sequence[str], orders: Sequence[int], responses: Optional[Sequence[int]] = None,
+                 bank: Optional[QuestionBank] = None):
+        # Pinned for the life of the attempt (shared - an old bank stays alive only while attempts use it)
+        self.bank = bank if bank is not None else get_question_bank()
+        missing = [question_id for question_id in question_ids if question_id not in self.bank.by_id]
+        if missing:
+            raise ValueError(f"Questions not in the question bank: {', '.join(missing)}")
+        self.question_ids = tuple(question_ids)
+        self.orders = array('L', orders)
+        self.responses = array('b', responses if responses is not None else [NO_RESPONSE] * len(self.question_ids))
+
+    @staticmethod
+    def start(questions: Sequence[Question], shuffle_choices: bool = True,
+              bank: Optional[QuestionBank] = None) -> "QuizAttempt":
+        """
+        New attempt over the given questions, in that order, with each question's choices shuffled.
+        The questions must be the ones in `bank` (default: the current question bank).
+        """
+        bank = bank if bank is not None else get_question_bank()
+        orders = []
+        for question in questions:
+            if bank.get(question["id"]) != question:
+                raise ValueError(f"{question['id']}: not the question in the question bank")
+            order = list(range(len(question["choices"])))
+            if len(order) > MAX_CHOICES:
+                raise ValueError(f"{question['id']}: more than {MAX_CHOICES} choices")
+            if shuffle_choices:
+                random.shuffle(order)
+            orders.append(pack_order(order))
+        return QuizAttempt([question["id"] for question in questions], orders, bank=bank)
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def question(self, index: int) -> Dict:
+        """Question as displayed in this attempt: choices in shuffled order, 'answer' remapped to match"""
+        question = self.bank.by_id[self.question_ids[index]]
+        order = unpack_order(self.orders[index], len(question["choices"]))
+        view = dict(question)
+        view["choices"] = tuple(question["choices"][original] for original in order)
+        view["answer"] = order.index(question["answer"])
+        return view
+
+    def questions(self) -> Iterator[Dict]:
+        """Every question as displayed, in attempt order"""
+        return (self.question(index) for index in range(len(self)))
+
+    def response(self, index: int) -> Optional[int]:
+        """Chosen display position for a question, or None if unanswered"""
+        choice = self.responses[index]
+        return None if choice == NO_RESPONSE else choice
+
+    def answer(self, index: int, choice: Optional[int]):
+        """Record (or clear, with None) the response to a question"""
+        self.responses[index] = NO_RESPONSE if choice is None else choice
+
+    def is_correct(self, index: int) -> bool:
+        """Whether a question was answered correctly (unanswered counts as wrong)"""
+        choice = self.responses[index]
+        if choice == NO_RESPONSE:
+            return False
+        question = self.bank.by_id[self.question_ids[index]]
+        order = unpack_order(self.orders[index], len(question["choices"]))
+        return order[choice] == question["answer"]
+
+    def answered(self) -> int:
+        """Number of questions answered"""
+        return sum(1 for choice in self.responses if choice != NO_RESPONSE)
+
+    def score(self) -> int:
+        """Number of questions answered correctly"""
+        return sum(1 for index in range(len(self)) if self.is_correct(index))
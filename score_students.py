@@ -0,0 +1,87 @@
+"""
+Batch ML Scoring
+Computes every student's ML features (velocity, learner type, predicted final score,
+per-topic confidence and difficulty) across a process pool and writes them to the
+feature store (data/ml_features.db) that the ML Insights and Progress pages read
+
+Usage:
+    python score_students.py                        # all students, one worker per CPU
+    python score_students.py --workers 4 --chunk-size 1000
+"""
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from data_manager import DataManager
+from database.feature_store import FeatureStore, get_store_path
+from ml_features import compute_features, progress_fingerprint
+
+
+def score_chunk(chunk: Dict[str, Dict]) -> List[Tuple[str, str, str, Dict]]:
+    """Feature store rows for one chunk of students (runs in a worker process)"""
+    scored_at = datetime.now().isoformat()
+    rows = []
+    for username, progress in chunk.items():
+        # Fingerprint first - computing features fills in the derived counters
+        fingerprint = progress_fingerprint(progress)
+        rows.append((username, fingerprint, scored_at, compute_features(username, progress)))
+    return rows
+
+
+def score_all(workers: int, chunk_size: int) -> int:
+    """Score every student, keeping only a few chunks in flight so memory stays bounded"""
+    usernames = DataManager.get_all_students()
+    chunks = DataManager.iter_progress(usernames, chunk_size)
+    scored = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(score_chunk, chunk))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                scored += _store(done)
+        scored += _store(pending)
+
+    return scored
+
+
+def _store(futures) -> int:
+    """Write finished chunks to the feature store"""
+    count = 0
+    for future in futures:
+        rows = future.result()
+        FeatureStore.put_many(rows)
+        count += len(rows)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute ML features for every student")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=500, help="students per batch")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = score_all(args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Scored {count} students in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f} users/sec)")
+    if resource is not None:
+        # ru_maxrss is in KB on Linux
+        peak_mb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                      resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+        print(f"📊 Peak memory (largest process): {peak_mb:.0f} MB")
+    print(f"💾 Features written to {get_store_path()}")
+
+
+if __name__ == "__main__":
+    main()
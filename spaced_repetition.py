@@ -0,0 +1,94 @@
+"""
+Spaced Repetition - SM-2 scheduling for practice problems
+Each practice entry carries its own SM-2 state (easiness, interval, repetitions, due).
+Due entries are served from a min-heap of [due, problem_id] kept in the progress record
+under "review_queue"; superseded heap items are skipped lazily when popped.
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# SM-2 parameters
+DEFAULT_EASINESS = 2.5
+MIN_EASINESS = 1.3
+FIRST_INTERVAL = 1   # days
+SECOND_INTERVAL = 6  # days
+
+# Practice answers are right/wrong, mapped onto SM-2's 0-5 quality scale
+QUALITY_CORRECT = 4
+QUALITY_INCORRECT = 1
+PASSING_QUALITY = 3
+
+
+def sm2_review(entry: Dict, quality: int, reviewed_at: Optional[datetime] = None) -> Dict:
+    """Apply one review of the given quality (0-5) to an entry's SM-2 state, in place"""
+    reviewed_at = reviewed_at or datetime.now()
+    easiness = entry.get("easiness", DEFAULT_EASINESS)
+    repetitions = entry.get("repetitions", 0)
+    interval = entry.get("interval", 0)
+
+    if quality >= PASSING_QUALITY:
+        if repetitions == 0:
+            interval = FIRST_INTERVAL
+        elif repetitions == 1:
+            interval = SECOND_INTERVAL
+        else:
+            interval = round(interval * easiness)
+        repetitions += 1
+    else:
+        # Lapse - start the item over
+        repetitions = 0
+        interval = FIRST_INTERVAL
+
+    easiness += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+
+    entry["easiness"] = round(max(MIN_EASINESS, easiness), 2)
+    entry["repetitions"] = repetitions
+    entry["interval"] = interval
+    entry["last_reviewed"] = reviewed_at.isoformat(timespec="seconds")
+    entry["due"] = (reviewed_at + timedelta(days=interval)).isoformat(timespec="seconds")
+    return entry
+
+
+def review_priority(entry: Dict) -> str:
+    """'high' for lapsed items, 'medium' for hard ones, 'low' otherwise"""
+    if entry.get("repetitions", 0) == 0:
+        return "high"
+    if entry.get("easiness", DEFAULT_EASINESS) < 2.0:
+        return "medium"
+    return "low"
+
+
+def build_queue(practice: Dict) -> List[List]:
+    """Heap of [due, problem_id] for every scheduled entry (full scan)"""
+    queue = [[entry["due"], problem_id] for problem_id, entry in practice.items() if entry.get("due")]
+    heapq.heapify(queue)
+    return queue
+
+
+def push(queue: List[List], problem_id: str, entry: Dict):
+    """Queue an entry at its (new) due date; an older item for it becomes stale"""
+    if entry.get("due"):
+        heapq.heappush(queue, [entry["due"], problem_id])
+
+
+def pop_due(queue: List[List], practice: Dict, now: str, limit: Optional[int] = None) -> List[str]:
+    """
+    Problem IDs due at ISO time `now`, most overdue first - amortized O(k log n) for k due
+    items: stale items are dropped from the heap the first time they come up, the due ones
+    are pushed back.
+    """
+    due = []
+    seen = set()
+    while queue and queue[0][0] <= now and (limit is None or len(due) < limit):
+        item = heapq.heappop(queue)
+        entry = practice.get(item[1])
+        if entry is None or entry.get("due") != item[0] or item[1] in seen:
+            continue  # Superseded by a later review
+        seen.add(item[1])
+        due.append(item)
+
+    for item in due:
+        heapq.heappush(queue, item)
+    return [problem_id for _, problem_id in due]
@@ -0,0 +1,89 @@
+"""
+Shared fixtures - every test gets empty stores under its own tmp_path.
+The backend is fixed to JSON here, before anything imports data_manager.
+"""
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+os.environ["DATA_BACKEND"] = "json"
+os.environ.setdefault("EVENT_LOG", "on")
+
+import data_manager
+from database import event_store
+
+# The Supabase stand-in drives the real client library, so that backend needs it installed
+BACKENDS = ["json", "sqlite"] + (["supabase"] if importlib.util.find_spec("supabase") else [])
+
+
+def reset_attempt_buffer():
+    """Forget buffered attempts and close this process's journals, as if it had just started"""
+    data_manager._pending_attempts.clear()
+    data_manager._replayed_journals.clear()
+    for handle in data_manager._owned_journals.values():
+        handle.close()
+    data_manager._owned_journals.clear()
+
+
+@pytest.fixture
+def json_store(tmp_path, monkeypatch):
+    """DataManager on the JSON backend with its files, journals and event log under tmp_path"""
+    monkeypatch.setattr(data_manager, "USERS_FILE", tmp_path / "users.json")
+    monkeypatch.setattr(data_manager, "PROGRESS_FILE", tmp_path / "progress.json")
+    monkeypatch.setattr(data_manager, "PROGRESS_SHARD_DIR", tmp_path / "progress")
+    monkeypatch.setattr(data_manager, "ATTEMPT_JOURNAL_DIR", tmp_path / "attempts")
+    monkeypatch.setattr(event_store, "EVENTS_DIR", tmp_path / "events")
+
+    # Process-wide caches keyed by username or path would leak between tests
+    data_manager._json_cache.clear()
+    reset_attempt_buffer()
+    event_store._snapshots.clear()
+    yield tmp_path
+    reset_attempt_buffer()
+
+
+
+@pytest.fixture
+def use_backend(json_store, monkeypatch, request):
+    """
+    Returns use(backend): routes DataManager to a fresh, empty store on "json", "sqlite"
+    or "supabase" (the local stand-in). Can be called several times in one test.
+    """
+    def use(backend: str):
+        data_dir = json_store / backend
+        data_dir.mkdir()
+        monkeypatch.setattr(data_manager, "USERS_FILE", data_dir / "users.json")
+        monkeypatch.setattr(data_manager, "PROGRESS_FILE", data_dir / "progress.json")
+        monkeypatch.setattr(data_manager, "PROGRESS_SHARD_DIR", data_dir / "progress")
+        monkeypatch.setattr(data_manager, "ATTEMPT_JOURNAL_DIR", data_dir / "attempts")
+        monkeypatch.setattr(event_store, "EVENTS_DIR", data_dir / "events")
+        data_manager._json_cache.clear()
+        reset_attempt_buffer()
+        event_store._snapshots.clear()
+
+        monkeypatch.setattr(data_manager, "USE_SQLITE", backend == "sqlite")
+        monkeypatch.setattr(data_manager, "USE_SUPABASE", backend == "supabase")
+        if backend == "sqlite":
+            from database.sqlite_manager import SQLiteDataManager
+            monkeypatch.setenv("SQLITE_PATH", str(data_dir / "brainyyack.db"))
+            monkeypatch.setattr(data_manager, "SQLiteDataManager", SQLiteDataManager, raising=False)
+        elif backend == "supabase":
+            from database import supabase_manager
+            from database.supabase_standin import SupabaseStandIn
+
+            server = SupabaseStandIn().start()
+            request.addfinalizer(server.stop)
+            monkeypatch.setenv("SUPABASE_URL", server.url)
+            monkeypatch.setenv("SUPABASE_KEY", server.key)
+            monkeypatch.setattr(supabase_manager, "_client_config", None)
+            supabase_manager.reset_supabase_client()
+            request.addfinalizer(supabase_manager.reset_supabase_client)
+            monkeypatch.setattr(data_manager, "SupabaseDataManager", supabase_manager.SupabaseDataManager, raising=False)
+            return server
+
+    return use
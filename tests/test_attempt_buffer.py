@@ -0,0 +1,138 @@
+"""
+Write-behind practice attempts - the journal outlives any flush the store didn't confirm,
+and only its owner flushes it while the owner is alive
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import data_manager
+import spaced_repetition
+from conftest import APP_DIR, reset_attempt_buffer
+from data_manager import DataManager
+from progress_engine import ProgressEngine
+
+# Another process on the same files as the json_store fixture; the code reports with result()
+OTHER_PROCESS = """
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, {app_dir!r})
+import data_manager
+from data_manager import DataManager
+from database import event_store
+data_dir = Path({data_dir!r})
+data_manager.USERS_FILE = data_dir / "users.json"
+data_manager.PROGRESS_FILE = data_dir / "progress.json"
+data_manager.PROGRESS_SHARD_DIR = data_dir / "progress"
+data_manager.ATTEMPT_JOURNAL_DIR = data_dir / "attempts"
+event_store.EVENTS_DIR = data_dir / "events"
+def result(value):
+    print("result:", value, flush=True)
+{code}
+"""
+
+
+@pytest.fixture
+def kid(json_store, monkeypatch):
+    monkeypatch.setattr(data_manager, "ATTEMPT_FLUSH_EVERY", 100)
+    DataManager.register_user("kid", "pw", "kid@example.com", "Student")
+    for correct in (True, False, True):
+        DataManager.record_attempt("kid", "p1", correct)
+    return "kid"
+
+
+def _stored_attempts(username):
+    return DataManager._load_user_progress(username)["practice_problems"].get("p1", {}).get("attempts", 0)
+
+
+@pytest.mark.parametrize("failure", ["rejected", "raised"])
+def test_failed_flush_keeps_journal_and_buffer(kid, monkeypatch, failure):
+    journal = DataManager._journal_path(kid)
+    original = DataManager.update_progress
+
+    def failing_update(*args, **kwargs):
+        if failure == "raised":
+            raise ConnectionError("store unreachable")
+        return False
+
+    monkeypatch.setattr(DataManager, "update_progress", staticmethod(failing_update))
+    assert DataManager.flush_attempts(kid) == 0
+    assert journal.exists()
+    assert len(journal.read_text().splitlines()) == 3
+    assert len(data_manager._pending_attempts[kid]["events"]) == 3
+    assert _stored_attempts(kid) == 0
+    # Reads still see the buffered attempts
+    assert DataManager.get_user_progress(kid)["practice_problems"]["p1"]["attempts"] == 3
+
+    monkeypatch.setattr(DataManager, "update_progress", staticmethod(original))
+    assert DataManager.flush_attempts(kid) == 3
+    assert not journal.exists()
+    assert _stored_attempts(kid) == 3
+
+
+def test_reads_see_buffered_attempts_in_the_derived_keys(kid):
+    DataManager.flush_attempts(kid)
+    # Reschedules p1 after the stored due-queue was written
+    DataManager.record_attempt(kid, "p1", True)
+
+    progress = DataManager.get_user_progress(kid)
+    practice = progress["practice_problems"]
+    assert practice["p1"]["attempts"] == 4
+    assert ProgressEngine.counters(progress) == ProgressEngine.recount(progress)
+    queue = ProgressEngine.review_queue(progress)
+    assert spaced_repetition.pop_due(queue, practice, practice["p1"]["due"]) == ["p1"]
+
+
+def test_journal_replayed_after_crash(kid, monkeypatch):
+    journal = DataManager._journal_path(kid)
+    # A new process: nothing buffered in memory, only the dead owner's journal on disk
+    reset_attempt_buffer()
+    monkeypatch.setattr(data_manager, "_journal_owner", "next-process")
+
+    assert DataManager.flush_attempts() == 3
+    assert _stored_attempts(kid) == 3
+    assert not journal.exists()
+    assert not list(journal.parent.glob("*.jsonl"))
+
+
+def _run_other_process(json_store, code: str) -> str:
+    script = OTHER_PROCESS.format(app_dir=str(APP_DIR), data_dir=str(json_store), code=code)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60,
+                            env=dict(os.environ, DATA_BACKEND="json"))
+    assert result.returncode == 0, result.stderr
+    return next((line[len("result: "):] for line in result.stdout.splitlines() if line.startswith("result: ")), None)
+
+
+def test_other_process_leaves_a_live_journal_alone(kid, json_store):
+    # Flushing everything, then exiting (atexit), must not write this process's 3 attempts
+    assert _run_other_process(json_store, "result(DataManager.flush_attempts())") == "0"
+    assert _stored_attempts(kid) == 0
+    assert DataManager._journal_path(kid).exists()
+
+    assert DataManager.flush_attempts(kid) == 3
+    assert _stored_attempts(kid) == 3
+
+
+def test_exit_flushes_own_attempts_only(kid, json_store):
+    # The other process buffers 2 attempts of its own and exits with this process's 3 still buffered
+    code = "DataManager.record_attempt('kid', 'p1', True)\nresult(DataManager.record_attempt('kid', 'p1', True)['attempts'])"
+    assert _run_other_process(json_store, code) == "2"
+    assert _stored_attempts(kid) == 2
+
+    assert DataManager.flush_attempts(kid) == 3
+    assert _stored_attempts(kid) == 5
+
+
+def test_journal_of_a_killed_process_is_replayed(json_store, monkeypatch):
+    monkeypatch.setattr(data_manager, "ATTEMPT_FLUSH_EVERY", 100)
+    DataManager.register_user("kid", "pw", "kid@example.com", "Student")
+    # Dies without flushing (os._exit skips atexit)
+    code = "for _ in range(3):\n    DataManager.record_attempt('kid', 'p1', True)\nos._exit(0)"
+    _run_other_process(json_store, code)
+
+    assert _stored_attempts("kid") == 0
+    assert DataManager.flush_attempts() == 3
+    assert _stored_attempts("kid") == 3
@@ -0,0 +1,102 @@
+"""
+ClassSummaryStore - the incrementally maintained summary row must match class_summary() over
+the whole roster after any sequence of progress writes and roster changes (seeded random sequences)
+"""
+import random
+import threading
+
+import pytest
+
+import class_analytics
+import data_manager
+from class_analytics import ClassSummaryStore, build_class_frame, class_summary
+from data_manager import DataManager
+
+SEEDS = range(25)
+STEPS = 20
+
+TEACHER_CODE = "CLASS1"
+TOPICS = ["derivatives", "chain_rule", "gradients", "partial_derivatives", "backpropagation", "optimization"]
+STUDENTS = [f"student{n}" for n in range(8)]
+
+
+@pytest.fixture
+def school(json_store, monkeypatch):
+    monkeypatch.setattr(data_manager, "ATTEMPT_FLUSH_EVERY", 3)
+    monkeypatch.setattr(class_analytics, "_class_summaries", {})
+    monkeypatch.setattr(class_analytics, "_class_locks", {})
+    return json_store
+
+
+def _random_change(rng: random.Random, username: str):
+    op = rng.random()
+    if op < 0.3:
+        DataManager.save_quiz_results(username, "initial", rng.randint(0, 18), 18,
+                                      rng.sample(TOPICS, rng.randint(0, 3)), rng.sample(TOPICS, rng.randint(0, 2)))
+    elif op < 0.6:
+        DataManager.save_lesson_progress(username, f"lesson{rng.randint(1, 5)}", rng.random() < 0.7, rng.randint(1, 40))
+    elif op < 0.9:
+        # Buffered, and flushed every few attempts
+        DataManager.record_attempt(username, f"p{rng.randint(1, 12)}", rng.random() < 0.6)
+    else:
+        DataManager.update_progress(username, "total_time_spent", rng.randint(0, 500))
+
+
+def _check(roster):
+    summary = ClassSummaryStore.get(TEACHER_CODE, roster)
+    expected = class_summary(build_class_frame(DataManager.get_many_progress(roster)))
+
+    assert summary["student_count"] == expected["student_count"]
+    assert summary["avg_quiz"] == pytest.approx(expected["avg_quiz"])
+    assert summary["avg_progress"] == pytest.approx(expected["avg_progress"])
+    for key in ("total_time", "at_risk", "weak_topics", "strong_topics"):
+        assert summary[key] == expected[key], key
+    assert set(summary["students"]) == set(roster)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_incremental_summary_matches_full_recompute(school, seed):
+    rng = random.Random(seed)
+    roster = rng.sample(STUDENTS, rng.randint(1, len(STUDENTS)))
+    _check(roster)
+
+    for _ in range(STEPS):
+        op = rng.random()
+        if op < 0.15:
+            roster = rng.sample(STUDENTS, rng.randint(0, len(STUDENTS)))  # Students join and leave
+        elif op < 0.2:
+            ClassSummaryStore.invalidate(TEACHER_CODE if rng.random() < 0.5 else None)
+        else:
+            for username in rng.sample(STUDENTS, rng.randint(1, 3)):
+                _random_change(rng, username)
+        _check(roster)
+
+
+def test_one_class_refreshing_does_not_block_another(school, monkeypatch):
+    DataManager.save_quiz_results("student0", "initial", 9, 18, [], [])
+    DataManager.save_quiz_results("student1", "initial", 12, 18, [], [])
+
+    loading, release = threading.Event(), threading.Event()
+    get_many_progress = DataManager.get_many_progress
+
+    def slow_get_many_progress(usernames):
+        if "student0" in usernames:
+            loading.set()
+            release.wait(10)
+        return get_many_progress(usernames)
+
+    monkeypatch.setattr(DataManager, "get_many_progress", staticmethod(slow_get_many_progress))
+    summaries = {}
+    slow = threading.Thread(target=ClassSummaryStore.get, args=("SLOW", ["student0"]))
+    fast = threading.Thread(target=lambda: summaries.update(ClassSummaryStore.get(TEACHER_CODE, ["student1"])))
+    slow.start()
+    try:
+        assert loading.wait(10)
+        fast.start()
+        # Served while the other class is still loading
+        fast.join(5)
+        assert summaries.get("student_count") == 1
+    finally:
+        release.set()
+        slow.join()
+        fast.join()
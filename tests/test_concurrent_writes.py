@@ -0,0 +1,87 @@
+"""
+Stress test for the JSON backend - many writers (threads in several processes) on one
+users file and one progress file must not lose updates or leave a torn file behind
+"""
+import json
+import multiprocessing
+import threading
+
+import pytest
+
+import data_manager
+from data_manager import DataManager
+
+PROCESSES = 4
+THREADS = 4
+WRITES = 8
+
+fork = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(),
+                          reason="needs the fork start method")
+
+
+def _writer(tag: str):
+    """One thread's share: register users and award badges to a shared user"""
+    for n in range(WRITES):
+        ok, _ = DataManager.register_user(f"{tag}-user{n}", "pw", f"{tag}{n}@example.com", "Student")
+        assert ok
+        DataManager.award_badge("shared", f"{tag}-badge{n}", "stress")
+        DataManager.update_progress("shared", "lessons", {f"{tag}-lesson{n}": {"completed": True, "time_spent": 1}})
+
+
+def _run_threads(process_tag: str):
+    threads = [threading.Thread(target=_writer, args=(f"{process_tag}t{i}",)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _read_file(path):
+    """Parse a data file straight from disk (no cache) - fails on a truncated write"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def _check_store(tmp_path, writers):
+    users = _read_file(data_manager.USERS_FILE)
+    expected_users = {f"{tag}-user{n}" for tag in writers for n in range(WRITES)}
+    assert expected_users <= set(users)
+
+    shared = DataManager._load_json(DataManager._progress_path("shared")) if data_manager.PROGRESS_LAYOUT == "sharded" \
+        else _read_file(data_manager.PROGRESS_FILE)["shared"]
+    assert {b["name"] for b in shared["badges"]} == {f"{tag}-badge{n}" for tag in writers for n in range(WRITES)}
+    assert set(shared["lessons"]) == {f"{tag}-lesson{n}" for tag in writers for n in range(WRITES)}
+    assert shared["counters"]["lessons_completed"] == len(writers) * WRITES
+
+    # Every temp file was either renamed into place or cleaned up
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+@pytest.mark.parametrize("layout", ["single", "sharded"])
+def test_threads_do_not_lose_updates(json_store, monkeypatch, layout):
+    monkeypatch.setattr(data_manager, "PROGRESS_LAYOUT", layout)
+    DataManager.register_user("shared", "pw", "shared@example.com", "Student")
+
+    _run_threads("p0")
+
+    _check_store(json_store, [f"p0t{i}" for i in range(THREADS)])
+
+
+@fork
+@pytest.mark.parametrize("layout", ["single", "sharded"])
+def test_processes_do_not_lose_updates(json_store, monkeypatch, layout):
+    monkeypatch.setattr(data_manager, "PROGRESS_LAYOUT", layout)
+    DataManager.register_user("shared", "pw", "shared@example.com", "Student")
+
+    # Forked children inherit the patched paths; the file lock is the only thing they share
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_run_threads, args=(f"p{j}",)) for j in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=120)
+        assert process.exitcode == 0
+
+    # The parent's cache predates the children's writes
+    data_manager._json_cache.clear()
+    _check_store(json_store, [f"p{j}t{i}" for j in range(PROCESSES) for i in range(THREADS)])
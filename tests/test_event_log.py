@@ -0,0 +1,64 @@
+"""
+Learning event log - events are recorded only for writes the store took
+"""
+import pytest
+
+from conftest import BACKENDS
+from data_manager import DataManager
+from database.event_store import EventStore
+
+
+def _event_types(username):
+    return [event["type"] for event in EventStore.read_events(username)[0]]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_events_follow_store_writes(use_backend, backend):
+    use_backend(backend)
+    DataManager.register_user("kid", "pw", "kid@example.com", "Student")
+
+    assert DataManager.save_quiz_results("kid", "initial", 12, 18, [], [])
+    assert DataManager.save_lesson_progress("kid", "lesson_1", True, 300)
+    assert DataManager.award_badge("kid", "First Steps", "Completed the initial quiz")
+    assert DataManager.award_badge("kid", "First Steps", "Completed the initial quiz")
+
+    assert _event_types("kid") == ["quiz_submitted", "lesson_completed", "badge_awarded"]
+
+
+@pytest.mark.parametrize("backend", [b for b in BACKENDS if b != "json"])
+def test_rejected_writes_are_not_logged(use_backend, backend):
+    use_backend(backend)
+
+    assert DataManager.save_quiz_results("ghost", "initial", 12, 18, [], []) is False
+    assert DataManager.save_lesson_progress("ghost", "lesson_1", True, 300) is False
+    assert DataManager.award_badge("ghost", "First Steps", "x") is False
+
+    assert _event_types("ghost") == []
+
+
+def test_failed_write_is_not_logged(json_store, monkeypatch):
+    DataManager.register_user("kid", "pw", "kid@example.com", "Student")
+
+    def unwritable(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(DataManager, "_save_json", staticmethod(unwritable))
+    with pytest.raises(OSError):
+        DataManager.save_lesson_progress("kid", "lesson_1", True, 300)
+
+    assert _event_types("kid") == []
+
+
+def test_badge_check_uses_loaded_progress(json_store, monkeypatch):
+    DataManager.register_user("kid", "pw", "kid@example.com", "Student")
+
+    def no_snapshot(username):
+        raise AssertionError("award_badge should not rebuild the event snapshot")
+
+    monkeypatch.setattr(EventStore, "snapshot", staticmethod(no_snapshot))
+    with DataManager.rerun_scope() as counters:
+        DataManager.get_user_progress("kid")
+        DataManager.award_badge("kid", "First Steps", "Completed the initial quiz")
+
+    assert counters["snapshot_hits"] == 1
+    assert _event_types("kid") == ["badge_awarded"]
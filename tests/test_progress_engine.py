@@ -0,0 +1,137 @@
+"""
+ProgressEngine - incrementally maintained counters, topic index and review queue must match
+a full recompute after any sequence of changes (seeded random sequences)
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import spaced_repetition
+from practice_bank import practice_problems
+from progress_engine import LESSON_COUNT, PRACTICE_TARGET, ProgressEngine
+
+SEEDS = range(300)
+STEPS = 40
+
+NOW = datetime(2026, 10, 1, 12, 0)
+
+
+def _problem_ids():
+    """Problem bank IDs plus custom records that carry their own topic"""
+    return [problem["id"] for problems in practice_problems().values() for problem in problems] + \
+        [f"custom_{n}" for n in range(4)]
+
+
+def _practice_entry(rng: random.Random, problem_id: str) -> dict:
+    entry = {"attempts": 0, "correct": 0, "incorrect": 0, "needs_review": False}
+    if problem_id.startswith("custom_"):
+        entry["topic"] = "chain_rule" if problem_id in ("custom_0", "custom_1") else "my_topic"
+    for _ in range(rng.randint(0, 3)):
+        _review(rng, entry)
+    return entry
+
+
+def _review(rng: random.Random, entry: dict):
+    """One answer, as DataManager._apply_attempt records it"""
+    correct = rng.random() < 0.6
+    entry["attempts"] = entry.get("attempts", 0) + 1
+    entry["correct" if correct else "incorrect"] = entry.get("correct" if correct else "incorrect", 0) + 1
+    quality = spaced_repetition.QUALITY_CORRECT if correct else spaced_repetition.QUALITY_INCORRECT
+    spaced_repetition.sm2_review(entry, quality, NOW - timedelta(days=rng.randint(0, 30), hours=rng.randint(0, 23)))
+
+
+def _random_change(rng: random.Random, progress: dict, problem_ids):
+    op = rng.random()
+    if op < 0.25:
+        ProgressEngine.merge(progress, "lessons", {f"lesson_{rng.randint(1, LESSON_COUNT + 2)}":
+                                                   {"completed": rng.random() < 0.6, "time_spent": 60}
+                                                   for _ in range(rng.randint(1, 3))})
+    elif op < 0.7:
+        ProgressEngine.merge(progress, "practice_problems", {problem_id: _practice_entry(rng, problem_id)
+                                                             for problem_id in rng.sample(problem_ids, rng.randint(1, 4))})
+    elif op < 0.8:
+        section = "initial_quiz" if rng.random() < 0.5 else "final_test"
+        change = ProgressEngine.replace if rng.random() < 0.5 else ProgressEngine.merge
+        change(progress, section, {"completed": rng.random() < 0.7, "score": rng.randint(0, 18)})
+    elif op < 0.9:
+        ProgressEngine.replace(progress, "lessons", {f"lesson_{n}": {"completed": rng.random() < 0.8}
+                                                     for n in range(1, rng.randint(1, LESSON_COUNT + 2))})
+    else:
+        ProgressEngine.replace(progress, "practice_problems", {problem_id: _practice_entry(rng, problem_id)
+                                                               for problem_id in rng.sample(problem_ids, rng.randint(0, 6))})
+
+
+def _random_record(rng: random.Random, problem_ids) -> dict:
+    """A stored record, sometimes from before the derived keys existed"""
+    progress = {
+        "initial_quiz": {"completed": rng.random() < 0.5},
+        "lessons": {f"lesson_{n}": {"completed": rng.random() < 0.5} for n in range(1, rng.randint(1, 7))},
+        "practice_problems": {problem_id: _practice_entry(rng, problem_id)
+                              for problem_id in rng.sample(problem_ids, rng.randint(0, 12))},
+    }
+    if rng.random() < 0.5:
+        ProgressEngine.counters(progress)
+        ProgressEngine.topic_index(progress)
+        ProgressEngine.review_queue(progress)
+    return progress
+
+
+def _expected_overall(progress: dict) -> int:
+    counts = ProgressEngine.recount(progress)
+    overall = 20 if counts["quiz_completed"] else 0
+    overall += min(counts["lessons_completed"] / LESSON_COUNT, 1) * 60
+    overall += min(counts["practice_done"] / PRACTICE_TARGET, 1) * 20
+    return int(overall)
+
+
+def _check(progress: dict):
+    practice = progress.get("practice_problems", {})
+    assert ProgressEngine.counters(progress) == ProgressEngine.recount(progress)
+    assert ProgressEngine.overall_progress(progress) == _expected_overall(progress)
+    if "overall_progress" in progress:
+        assert progress["overall_progress"] == _expected_overall(progress)
+
+    topics = ProgressEngine.topic_index(progress)
+    assert topics == ProgressEngine.build_topic_index(practice)["topics"]
+
+    now = NOW.isoformat(timespec="seconds")
+    expected_due = [problem_id for due, problem_id in sorted(
+        (entry["due"], problem_id) for problem_id, entry in practice.items() if entry.get("due") and entry["due"] <= now)]
+    queue = ProgressEngine.review_queue(progress)
+    assert spaced_repetition.pop_due(queue, practice, now) == expected_due
+    # Popping leaves the queue usable for the next read
+    assert spaced_repetition.pop_due(queue, practice, now) == expected_due
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_incremental_matches_full_recount(seed):
+    rng = random.Random(seed)
+    problem_ids = _problem_ids()
+    progress = _random_record(rng, problem_ids)
+    _check(progress)
+
+    for _ in range(STEPS):
+        _random_change(rng, progress, problem_ids)
+        _check(progress)
+
+
+def test_malformed_derived_keys_are_rebuilt():
+    rng = random.Random(0)
+    progress = _random_record(rng, _problem_ids())
+    progress["counters"] = {"lessons_completed": 99}
+    progress["topic_index"] = {"size": -1}
+    progress["review_queue"] = [["not-a-pair"]]  # The list stored before the size stamp
+    _check(progress)
+
+
+def test_review_queue_rebuilt_for_entries_added_behind_the_engine():
+    rng = random.Random(0)
+    progress = _random_record(rng, _problem_ids())
+    ProgressEngine.review_queue(progress)
+    entry = {"attempts": 0, "correct": 0, "incorrect": 0, "needs_review": False, "topic": "my_topic"}
+    _review(rng, entry)
+    progress["practice_problems"]["custom_9"] = entry
+
+    queue = ProgressEngine.review_queue(progress)
+    assert "custom_9" in spaced_repetition.pop_due(queue, progress["practice_problems"], entry["due"])
@@ -0,0 +1,65 @@
+"""
+Quiz attempts - questions and scoring come from the bank the attempt was started on
+"""
+import json
+
+import pytest
+
+import quiz_attempt
+from question_bank import QUESTION_BANK_FILE, compile_question_bank
+from quiz_attempt import QuizAttempt
+
+
+def _bank(edit=None):
+    document = json.loads(QUESTION_BANK_FILE.read_text())
+    for question in document["questions"]:
+        if edit:
+            edit(question)
+    return compile_question_bank(document)
+
+
+def _rewritten(question):
+    """The same IDs with different content - two choices, and the answer moved"""
+    question["choices"] = ["new", "other"]
+    question["answer"] = 1
+
+
+@pytest.fixture
+def reload_bank(monkeypatch):
+    """Returns set(bank): makes `bank` what get_question_bank() returns from now on"""
+    def set_bank(bank):
+        monkeypatch.setattr(quiz_attempt, "get_question_bank", lambda: bank)
+    return set_bank
+
+
+def test_attempt_keeps_its_bank_after_a_reload(reload_bank):
+    original = _bank()
+    reload_bank(original)
+    questions = original.questions("initial_quiz")
+    attempt = QuizAttempt.start(questions)
+    for index in range(len(attempt)):
+        attempt.answer(index, attempt.question(index)["answer"])
+    shown = [attempt.question(index) for index in range(len(attempt))]
+
+    reload_bank(_bank(_rewritten))
+
+    assert [attempt.question(index) for index in range(len(attempt))] == shown
+    assert attempt.score() == len(questions)
+    for view in shown:
+        assert view["choices"][view["answer"]] == original.get(view["id"])["choices"][original.get(view["id"])["answer"]]
+
+
+def test_start_rejects_questions_from_another_bank(reload_bank):
+    stale = _bank().questions("initial_quiz")
+    reload_bank(_bank(_rewritten))
+
+    with pytest.raises(ValueError):
+        QuizAttempt.start(stale)
+    # An unchanged reload is fine
+    reload_bank(_bank())
+    assert len(QuizAttempt.start(stale)) == len(stale)
+
+
+def test_unknown_question_ids_are_rejected():
+    with pytest.raises(ValueError):
+        QuizAttempt(["no-such-question"], [0])
@@ -0,0 +1,28 @@
+"""
+Per-rerun progress snapshots (DataManager.rerun_scope)
+"""
+import data_manager
+from data_manager import DataManager
+
+
+def test_one_load_per_user_per_rerun(json_store, capsys):
+    DataManager.register_user("kid", "pw", "kid@example.com", "Student")
+
+    with DataManager.rerun_scope() as counters:
+        DataManager.get_user_progress("kid")
+        DataManager.get_user_progress("kid")
+        DataManager.save_lesson_progress("kid", "lesson_1", True, 60)
+        assert DataManager.get_user_progress("kid")["lessons"]["lesson_1"]["completed"] is True
+
+    assert counters == {"loads": 2, "snapshot_hits": 1}
+    assert "Rerun progress loads" not in capsys.readouterr().out
+
+
+def test_debug_flag_logs_counts(json_store, monkeypatch, capsys):
+    monkeypatch.setattr(data_manager, "PROGRESS_DEBUG", True)
+    DataManager.register_user("kid", "pw", "kid@example.com", "Student")
+
+    with DataManager.rerun_scope():
+        DataManager.get_user_progress("kid")
+
+    assert "Rerun progress loads: 1 from store, 0 from snapshot" in capsys.readouterr().out
@@ -0,0 +1,102 @@
+"""
+Supabase progress writes - version-guarded patches, conflicts and the no-RPC fallback,
+against database/supabase_standin.py
+"""
+import pytest
+
+pytest.importorskip("supabase")
+
+import data_manager
+from data_manager import DataManager
+from database import supabase_manager
+from database.supabase_manager import MAX_PATCH_RETRIES, ProgressConflictError, SupabaseDataManager
+
+
+@pytest.fixture
+def server(use_backend):
+    server = use_backend("supabase")
+    DataManager.register_user("kid", "pw", "kid@example.com", "Student")
+    return server
+
+
+def _row(server, username="kid"):
+    return next(row for row in server.tables["progress"] if row["username"] == username)
+
+
+def _bump_version_on_every_patch(server, monkeypatch):
+    """Another session writes just before each of our patches lands"""
+    original = server.patch_progress
+
+    def racing_patch(**kwargs):
+        _row(server)["version"] += 1
+        return original(**kwargs)
+
+    monkeypatch.setattr(server, "patch_progress", racing_patch)
+
+
+def test_patch_retries_then_lands(server, monkeypatch):
+    original = server.patch_progress
+    calls = []
+
+    def lose_once(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            _row(server)["version"] += 1
+        return original(**kwargs)
+
+    monkeypatch.setattr(server, "patch_progress", lose_once)
+
+    assert DataManager.save_lesson_progress("kid", "lesson_1", True, 300) is True
+    assert len(calls) == 2
+    assert _row(server)["lessons"]["lesson_1"]["completed"] is True
+
+
+def test_conflict_raises_without_overwriting(server, monkeypatch):
+    _bump_version_on_every_patch(server, monkeypatch)
+
+    with pytest.raises(ProgressConflictError):
+        DataManager.update_progress("kid", "lessons", {"lesson_1": {"completed": True, "time_spent": 1}})
+
+    # Nothing was written over the other session's row, and no JSON copy was made
+    assert _row(server)["lessons"] == {}
+    assert _row(server)["version"] == MAX_PATCH_RETRIES
+    assert not data_manager.PROGRESS_FILE.exists()
+
+
+def test_fallback_full_row_write_is_version_guarded(server, monkeypatch):
+    def no_rpc(*args, **kwargs):
+        raise RuntimeError("Could not find the function public.patch_progress")
+
+    monkeypatch.setattr(SupabaseDataManager, "patch_user_progress", staticmethod(no_rpc))
+    assert DataManager.award_badge("kid", "First Steps", "Completed the initial quiz") is True
+    assert [b["name"] for b in _row(server)["badges"]] == ["First Steps"]
+    assert _row(server)["version"] == 1
+
+    # Another session keeps writing in between - the stale row is never sent
+    original = SupabaseDataManager.get_user_progress
+
+    def read_then_race(username):
+        progress = original(username)
+        _row(server)["version"] += 1
+        return progress
+
+    monkeypatch.setattr(SupabaseDataManager, "get_user_progress", staticmethod(read_then_race))
+    with pytest.raises(ProgressConflictError):
+        DataManager.award_badge("kid", "Quiz Whiz", "Perfect lesson quiz")
+    assert [b["name"] for b in _row(server)["badges"]] == ["First Steps"]
+
+
+def test_unregistered_user_is_not_written(server):
+    assert DataManager.update_progress("ghost", "lessons", {"lesson_1": {"completed": True}}) is False
+    assert DataManager.award_badge("ghost", "First Steps", "x") is False
+    assert [row["username"] for row in server.tables["progress"]] == ["kid"]
+
+
+def test_store_errors_are_raised_not_written_to_json(server, monkeypatch):
+    def unreachable():
+        raise ConnectionError("Supabase unreachable")
+
+    monkeypatch.setattr(supabase_manager, "get_supabase_client", unreachable)
+    with pytest.raises(ConnectionError):
+        DataManager.save_quiz_results("kid", "initial", 12, 18, [], [])
+    assert not data_manager.PROGRESS_FILE.exists()